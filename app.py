@@ -1,21 +1,25 @@
 """Gradio UI - RAG 교육 챗봇 인터페이스"""
 import gradio as gr
 import os
+import uuid
 from dotenv import load_dotenv
-from src.graph import run_rag_education_bot, run_rag_education_bot_stream
+from src.graph import arun_rag_education_bot, arun_rag_education_bot_stream, warmup_graph
+from src.prewarm import start_prewarmer, stop_prewarmer
+from src.utils.metrics import start_metrics_server
 
 # 환경 변수 로드
 load_dotenv()
 
 # ============ UI 함수 ============
 
-def chat_function(message, history):
+async def chat_function(message, history, session_id=None):
     """
-    채팅 인터페이스 함수
+    채팅 인터페이스 함수 (비동기 - LLM 대기 중 워커를 점유하지 않음)
     
     Args:
         message: 사용자 입력 메시지
         history: 채팅 히스토리 [[user_msg, bot_msg], ...]
+        session_id: 대화 세션 ID (이전 턴의 프로필/DomainPack 재사용)
         
     Returns:
         봇 응답
@@ -25,13 +29,87 @@ def chat_function(message, history):
     
     try:
         # RAG 교육 챗봇 실행
-        response = run_rag_education_bot(message)
+        response = await arun_rag_education_bot(message, session_id=session_id)
         return response
         
     except Exception as e:
         return f"오류가 발생했습니다: {str(e)}\n\n환경 변수(.env)를 확인해주세요."
 
 
+# 노드 이름 → 진행 상황 표시 라벨
+NODE_LABELS = {
+    "domain_detect": "🔎 분야 감지",
+    "dynamic_knowledge": "🧠 지식 생성",
+    "domain_bootstrap": "🚀 전문가 부팅",
+    "user_signals": "🔍 신호 추출",
+    "coldstart_probe": "❓ 초기 진단",
+    "infer_level": "📊 숙련도 추정",
+    "adaptive_diagnostic": "📝 진단 퀴즈",
+    "intent_detect": "🎯 의도 분석",
+    "taxonomy_map": "🗺️ 개념 매핑",
+    "plan_answer": "📋 답변 플랜",
+    "tool_advisors": "🛠️ 도구 추천",
+    "gap_mining": "🔎 갭 분석",
+    "compose_answer": "✍️ 답변 구성",
+    "quality_gate": "✅ 품질 검수",
+    "memory_write": "💾 메모리 저장",
+    "deliver": "📤 전달",
+}
+
+
+def _render_partial(progress, body):
+    """진행 상황 줄 + 지금까지 구성된 답변 본문"""
+    status = "⏳ " + " → ".join(progress) + " ..."
+    return f"{status}\n\n{body}" if body else status
+
+
+async def stream_chat_function(message, history, session_id=None):
+    """
+    스트리밍 채팅 인터페이스 함수
+    
+    노드가 끝날 때마다 진행 상황을 즉시 보여주고,
+    compose_answer가 스트림으로 보내는 개요/섹션은 만들어지는 대로 이어 붙여 렌더링한다.
+    
+    Args:
+        message: 사용자 입력 메시지
+        history: 채팅 히스토리
+        session_id: 대화 세션 ID (이전 턴의 프로필/DomainPack 재사용)
+        
+    Yields:
+        지금까지의 부분 응답
+    """
+    if not message.strip():
+        yield "메시지를 입력해주세요."
+        return
+    
+    progress = []
+    body = ""
+    
+    try:
+        async for output in arun_rag_education_bot_stream(message, session_id=session_id):
+            if "error" in output:
+                yield f"오류가 발생했습니다: {output['error']}\n\n환경 변수(.env)를 확인해주세요."
+                return
+            
+            for node_name, update in output.items():
+                if "partial" in update:
+                    # compose_answer가 섹션을 만드는 대로 이어 붙여 렌더링 (개요부터 다시 시작)
+                    body = update["content"] if update["partial"] == "outline" else body + "\n" + update["content"]
+                    yield _render_partial(progress, body)
+                    continue
+                
+                progress.append(NODE_LABELS.get(node_name, node_name))
+                
+                if node_name == "deliver":
+                    # 최종 응답 (신뢰도/주의사항 포함)
+                    yield update["final_response"]
+                else:
+                    yield _render_partial(progress, body)
+        
+    except Exception as e:
+        yield f"오류가 발생했습니다: {str(e)}\n\n환경 변수(.env)를 확인해주세요."
+
+
 def example_questions():
     """예제 질문들 - 다양한 분야"""
     return [
@@ -112,6 +190,9 @@ def create_ui():
                 with gr.Row():
                     submit_btn = gr.Button("전송", variant="primary")
                     clear_btn = gr.Button("대화 초기화")
+                
+                # 브라우저 세션별 대화 ID (초기화하면 새 세션)
+                session_id = gr.State(lambda: uuid.uuid4().hex)
             
             with gr.Column(scale=1):
                 gr.Markdown("### 💡 예제 질문")
@@ -187,30 +268,31 @@ def create_ui():
         )
         
         # 이벤트 핸들러
-        def respond(message, chat_history):
-            """메시지 응답 처리"""
-            bot_response = chat_function(message, chat_history)
-            chat_history.append((message, bot_response))
-            return "", chat_history
+        async def respond(message, chat_history, session_id):
+            """메시지 응답 처리 (노드 진행 상황과 답변 섹션을 스트리밍)"""
+            chat_history = chat_history + [(message, "")]
+            async for partial_response in stream_chat_function(message, chat_history, session_id):
+                chat_history[-1] = (message, partial_response)
+                yield "", chat_history
         
         # 전송 버튼 클릭
         submit_btn.click(
             respond,
-            inputs=[msg_input, chatbot],
+            inputs=[msg_input, chatbot, session_id],
             outputs=[msg_input, chatbot]
         )
         
         # Enter 키로 전송
         msg_input.submit(
             respond,
-            inputs=[msg_input, chatbot],
+            inputs=[msg_input, chatbot, session_id],
             outputs=[msg_input, chatbot]
         )
         
         # 초기화 버튼
         clear_btn.click(
-            lambda: [],
-            outputs=chatbot
+            lambda: ([], uuid.uuid4().hex),
+            outputs=[chatbot, session_id]
         )
     
     return demo
@@ -225,6 +307,19 @@ if __name__ == "__main__":
         print("   .env 파일을 생성하고 API 키를 설정해주세요.")
         print()
     
+    # 그래프 사전 컴파일 (첫 요청의 빌드 비용 제거)
+    warmup_graph()
+    
+    # 자주 묻는 분야의 DomainPack을 백그라운드에서 미리 생성 (이후 PREWARM_INTERVAL초마다)
+    if start_prewarmer() is not None:
+        print("🔥 인기 분야 DomainPack 사전 생성 시작")
+    
+    # Prometheus 메트릭 엔드포인트 (METRICS_PORT를 빈 값으로 두면 비활성화)
+    metrics_port = os.getenv("METRICS_PORT", "9464")
+    if metrics_port:
+        start_metrics_server(int(metrics_port))
+        print(f"📈 메트릭: http://localhost:{metrics_port}/metrics")
+    
     # UI 생성 및 실행
     demo = create_ui()
     
@@ -233,10 +328,13 @@ if __name__ == "__main__":
     print("=" * 50)
     print()
     
-    demo.launch(
-        server_name="0.0.0.0",
-        server_port=7860,
-        share=False,
-        show_error=True
-    )
+    try:
+        demo.launch(
+            server_name="0.0.0.0",
+            server_port=7860,
+            share=False,
+            show_error=True
+        )
+    finally:
+        stop_prewarmer(timeout=5)
 
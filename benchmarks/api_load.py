@@ -0,0 +1,142 @@
+"""API 과부하 벤치마크 - 처리 용량을 넘는 요청률에서도 처리량/지연이 유지되는지 확인
+
+로컬 uvicorn 서버(src.api)에 고정 요청률(open-loop)로 /v1/chat 요청을 보낸다.
+DomainPack을 캐시하지 않고 응답 캐시도 끈 상태에서 가짜 LLM(지연 --llm-latency)을 쓰므로,
+요청마다 팩 생성 경로를 타서 처리 용량이 대략 max_inflight / 요청 처리 시간이 된다.
+요청률별로 성공 처리량, 거절 비율, 성공/거절 응답의 p50·p99 지연을 출력한다.
+
+실행:
+    python -m benchmarks.api_load --rates 20,40,80,160 --duration 5
+    python -m benchmarks.api_load --max-inflight 100000 --max-queue 0   # 제한 없이 비교
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 가짜 LLM 경로를 타도록 키를 채우고, 디스크 캐시는 쓰지 않음
+os.environ["OPENAI_API_KEY"] = "benchmark-fake-key"
+os.environ["DOMAIN_CACHE_DIR"] = ""
+os.environ["MEMORY_DB_PATH"] = ""
+
+import httpx
+import uvicorn
+
+from benchmarks.corpus import CORPUS
+from benchmarks.fake_llm import FakeChatModel
+from benchmarks.stats import percentile
+from src.api import create_app
+from src.utils.domain_cache import DomainPackCache, set_domain_cache
+from src.utils.llm_provider import StaticLLMProvider, set_llm_provider
+from src.utils.response_cache import ResponseCache, set_response_cache
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    """백그라운드 스레드에서 uvicorn 실행 (시작될 때까지 대기)"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error", lifespan="on"))
+    thread = threading.Thread(target=server.run, name="api-server", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def run_rate(base_url: str, rate: float, duration: float) -> Dict[str, float]:
+    """rate 요청/초로 duration초 동안 요청하고 결과 요약"""
+    ok: List[float] = []
+    rejected: List[float] = []
+    failed = 0
+
+    async def one(client: httpx.AsyncClient, question: str) -> None:
+        nonlocal failed
+        start = time.perf_counter()
+        try:
+            response = await client.post("/v1/chat", json={"message": question})
+        except httpx.HTTPError:
+            failed += 1
+            return
+        elapsed = time.perf_counter() - start
+        if response.status_code == 200:
+            ok.append(elapsed)
+        elif response.status_code == 503:
+            rejected.append(elapsed)
+        else:
+            failed += 1
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        tasks = []
+        start = time.perf_counter()
+        sent = 0
+        # 응답을 기다리지 않고 정해진 간격으로 보냄 (open-loop)
+        while time.perf_counter() - start < duration:
+            question = CORPUS[sent % len(CORPUS)]["question"]
+            tasks.append(asyncio.ensure_future(one(client, question)))
+            sent += 1
+            await asyncio.sleep(max(start + sent / rate - time.perf_counter(), 0))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "rate": rate,
+        "sent": sent,
+        "ok_per_s": len(ok) / elapsed,
+        "rejected_pct": len(rejected) / sent * 100 if sent else 0.0,
+        "failed": failed,
+        "ok_p50_ms": percentile(ok, 50) * 1000,
+        "ok_p99_ms": percentile(ok, 99) * 1000,
+        "rejected_p50_ms": percentile(rejected, 50) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API 과부하 벤치마크")
+    parser.add_argument("--rates", default="20,40,80,160", help="요청률 목록(요청/초, 쉼표 구분)")
+    parser.add_argument("--duration", type=float, default=5.0, help="요청률별 측정 시간(초)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="가짜 LLM 호출 1회 지연(초)")
+    parser.add_argument("--max-inflight", type=int, default=16)
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--queue-timeout", type=float, default=1.0)
+    args = parser.parse_args()
+
+    set_llm_provider(StaticLLMProvider(FakeChatModel(latency=args.llm_latency)))
+    # 팩을 남기지 않는 캐시 → 요청마다 생성 경로
+    set_domain_cache(DomainPackCache(cache_dir=None, max_memory_entries=0))
+    set_response_cache(ResponseCache(max_entries=0))
+
+    app = create_app(
+        max_inflight=args.max_inflight,
+        max_queue=args.max_queue,
+        queue_timeout=args.queue_timeout,
+        prewarm=False,
+    )
+    port = _free_port()
+    server = start_server(app, port)
+    print(f"max_inflight={args.max_inflight} max_queue={args.max_queue} "
+          f"queue_timeout={args.queue_timeout}s llm_latency={args.llm_latency}s")
+    print(f"{'rate':>6} {'sent':>6} {'ok/s':>7} {'reject%':>8} {'fail':>5} "
+          f"{'ok p50':>9} {'ok p99':>9} {'rej p50':>9}")
+    try:
+        for rate in (float(value) for value in args.rates.split(",")):
+            result = asyncio.run(run_rate(f"http://127.0.0.1:{port}", rate, args.duration))
+            print(f"{result['rate']:>6.0f} {result['sent']:>6} {result['ok_per_s']:>7.1f} "
+                  f"{result['rejected_pct']:>7.1f}% {result['failed']:>5} "
+                  f"{result['ok_p50_ms']:>7.0f}ms {result['ok_p99_ms']:>7.0f}ms {result['rejected_p50_ms']:>7.1f}ms")
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""벤치마크 질문 코퍼스 - intent_detect의 모든 의도와 domain_detect의 모든 분야를 포함
+
+각 항목의 expected_domain/expected_intent는 코퍼스가 실제로 전체 분기를
+덮는지 확인하는 용도이다 (run_benchmark가 커버리지를 검사).
+"""
+
+CORPUS = [
+    # RAG
+    {"question": "RAG 검색 파이프라인 아키텍처를 설계하려면 어떻게 구성해야 해?", "expected_domain": "RAG", "expected_intent": "design"},
+    {"question": "Hybrid Search와 BM25 벡터 검색의 차이를 비교해줘 vs", "expected_domain": "RAG", "expected_intent": "compare"},
+    {"question": "RAGAS로 RAG 답변 품질을 평가하고 측정하는 방법", "expected_domain": "RAG", "expected_intent": "evaluation"},
+    # Machine Learning
+    {"question": "딥러닝 머신러닝 신경망을 처음 공부하는 학습 순서", "expected_domain": "Machine Learning", "expected_intent": "learn_path"},
+    {"question": "pytorch 모델 훈련 중 loss가 nan 에러가 나서 안돼, 디버그 방법?", "expected_domain": "Machine Learning", "expected_intent": "troubleshoot"},
+    # Backend Development
+    {"question": "FastAPI로 REST API 서버 코드를 구현하고 싶어", "expected_domain": "Backend Development", "expected_intent": "implementation"},
+    {"question": "postgresql 데이터베이스 쿼리 성능 최적화하고 지연 줄이는 법", "expected_domain": "Backend Development", "expected_intent": "optimization"},
+    # Frontend Development
+    {"question": "React component ui css 상태 관리 개념이 뭐야? 설명해줘", "expected_domain": "Frontend Development", "expected_intent": "explain"},
+    {"question": "vue와 angular 중 어느게 나은지 차이 비교", "expected_domain": "Frontend Development", "expected_intent": "compare"},
+    # DevOps
+    {"question": "Kubernetes 배포와 docker CI/CD 파이프라인 구축 코드 작성", "expected_domain": "DevOps", "expected_intent": "implementation"},
+    {"question": "prometheus grafana 모니터링 오류 디버그 fix", "expected_domain": "DevOps", "expected_intent": "troubleshoot"},
+    # Data Science
+    {"question": "pandas numpy 통계 시각화 공부를 시작하려면 뭐부터 해야 해?", "expected_domain": "Data Science", "expected_intent": "learn_path"},
+    {"question": "회귀 분류 군집 통계 모델의 성능을 테스트로 평가하는 법", "expected_domain": "Data Science", "expected_intent": "evaluation"},
+    # Blockchain
+    {"question": "이더리움 스마트 컨트랙트를 solidity로 개발하고 구현하기", "expected_domain": "Blockchain", "expected_intent": "implementation"},
+    {"question": "블록체인 합의 알고리즘이란 무엇인지 설명", "expected_domain": "Blockchain", "expected_intent": "explain"},
+    # Cloud Computing
+    {"question": "aws 람다 serverless 아키텍처 설계와 구조 선택", "expected_domain": "Cloud Computing", "expected_intent": "design"},
+    {"question": "클라우드 ec2 s3 비용 최적화 optimize", "expected_domain": "Cloud Computing", "expected_intent": "optimization"},
+    # Cybersecurity
+    {"question": "웹 서비스 보안 취약점 해킹 방어 설계 architecture", "expected_domain": "Cybersecurity", "expected_intent": "design"},
+    {"question": "ssl tls 암호화 인증서 오류 error 해결", "expected_domain": "Cybersecurity", "expected_intent": "troubleshoot"},
+    # Mobile Development
+    {"question": "flutter와 react native 모바일 앱 차이 compare", "expected_domain": "Mobile Development", "expected_intent": "compare"},
+    {"question": "android kotlin 모바일 앱 개발 tutorial 공부 study", "expected_domain": "Mobile Development", "expected_intent": "learn_path"},
+    # 분야 불명확
+    {"question": "요즘 뜨는 기술 하나 배우고 싶어", "expected_domain": "General Knowledge", "expected_intent": "learn_path"},
+    {"question": "안녕하세요", "expected_domain": "General", "expected_intent": "explain"},
+    {"question": "이것의 정의는 what is?", "expected_domain": "General", "expected_intent": "explain"},
+]
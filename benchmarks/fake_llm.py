@@ -0,0 +1,166 @@
+"""결정적 가짜 LLM - 네트워크 없이 DomainPack 생성 경로를 재현
+
+프롬프트 종류(taxonomy/glossary/질문/레시피)와 분야명만 보고 항상 같은 JSON을
+돌려준다. latency로 실제 API 왕복 시간을 흉내낼 수 있다.
+
+- FakeChatModel: 프로세스 내 모델 대역 (StaticLLMProvider로 주입)
+- start_fake_openai_server: HTTP 경로까지 재현하는 OpenAI 호환 로컬 서버
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import json
+import re
+import threading
+import time
+
+from langchain_core.messages import AIMessage
+
+
+def _domain_of(prompt: str) -> str:
+    match = re.search(r"Domain: (.+)", prompt)
+    return match.group(1).strip() if match else "General"
+
+
+def _slug(domain: str) -> str:
+    return domain.lower().replace(" ", "_")
+
+
+def fake_taxonomy(domain: str) -> list:
+    slug = _slug(domain)
+    concepts = []
+    for i in range(8):
+        concepts.append({
+            "id": f"{slug}_c{i}",
+            "name": f"{domain} 개념 {i}",
+            "level": i % 4,
+            "importance": 10 - i,
+            "prerequisites": [f"{slug}_c{i - 1}"] if i else [],
+            "concepts": [f"{slug}_term{i}", f"{slug}_term{i + 1}", "fundamentals"]
+        })
+    return concepts
+
+
+def fake_glossary(domain: str) -> dict:
+    slug = _slug(domain)
+    glossary = {f"{slug}_term{i}": f"{domain}의 {i}번째 핵심 용어 정의" for i in range(15)}
+    glossary[domain] = f"{domain}에 대한 기본 개념과 원리"
+    return glossary
+
+
+def fake_questions(domain: str) -> list:
+    slug = _slug(domain)
+    return [
+        {
+            "id": f"q{i}",
+            "concept": f"{slug}_c{i}",
+            "difficulty": 1 + i % 3,
+            "question": f"{domain} 개념 {i}에 대한 질문",
+            "options": ["선택지1", "선택지2", "선택지3", "선택지4"],
+            "correct": i % 4
+        }
+        for i in range(5)
+    ]
+
+
+def fake_recipes(domain: str) -> list:
+    slug = _slug(domain)
+    return [
+        {
+            "name": f"{level}_{slug}",
+            "level": level,
+            "components": {"primary_tool": f"{domain} {level} 도구"},
+            "pros": ["장점1", "장점2"],
+            "cons": ["단점1", "단점2"]
+        }
+        for level in ["beginner", "intermediate", "advanced"]
+    ]
+
+
+def fake_response(prompt: str) -> str:
+    """프롬프트 종류에 맞는 JSON 문자열"""
+    domain = _domain_of(prompt)
+    if "learning taxonomy" in prompt:
+        payload = fake_taxonomy(domain)
+    elif "glossary" in prompt:
+        payload = fake_glossary(domain)
+    elif "diagnostic questions" in prompt:
+        payload = fake_questions(domain)
+    elif "tech stack" in prompt:
+        payload = fake_recipes(domain)
+    else:
+        payload = {}
+    return json.dumps(payload, ensure_ascii=False)
+
+
+class FakeChatModel:
+    """invoke/ainvoke만 제공하는 ChatOpenAI 대역"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def invoke(self, prompt, **kwargs) -> AIMessage:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return AIMessage(content=fake_response(str(prompt)))
+
+    async def ainvoke(self, prompt, **kwargs) -> AIMessage:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return AIMessage(content=fake_response(str(prompt)))
+
+
+class _FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """POST /v1/chat/completions만 처리하는 OpenAI 호환 대역"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive 연결 재사용
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        self.server.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        body = json.dumps({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": fake_response(prompt)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_openai_server(port: int = 0, latency: float = 0.0) -> ThreadingHTTPServer:
+    """
+    백그라운드 스레드에서 OpenAI 호환 가짜 서버 시작
+
+    PooledLLMProvider(base_url=f"http://127.0.0.1:{server.server_port}/v1")로
+    실제 HTTP 경로(연결 풀 포함)를 네트워크 없이 측정할 때 쓴다.
+    """
+    handler = type("FakeOpenAIHandler", (_FakeOpenAIHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.calls = 0
+    threading.Thread(target=server.serve_forever, name="fake-openai", daemon=True).start()
+    return server
@@ -0,0 +1,62 @@
+"""그래프 컴파일 마이크로 벤치마크 - 요청마다 빌드 vs 레지스트리 재사용
+
+실행:
+    python -m benchmarks.graph_compile --iterations 50
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.graph import create_graph, get_graph, rebuild_graph
+from src.state import create_initial_state
+
+
+QUESTION = "RAG를 구축하려면 무엇을 해야 해?"
+
+
+def _timed(fn, iterations: int) -> float:
+    """fn을 iterations회 실행한 평균 시간(ms)"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="그래프 컴파일 오버헤드 측정")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    
+    os.environ.pop("OPENAI_API_KEY", None)  # 템플릿 모드로 LLM 지연 제외
+    rebuild_graph()
+    
+    def per_request_build():
+        app = create_graph()
+        app.invoke(create_initial_state(QUESTION))
+    
+    def registry_reuse():
+        app = get_graph()
+        app.invoke(create_initial_state(QUESTION))
+    
+    # 노드의 진행 출력은 측정에서 제외
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_only = _timed(create_graph, args.iterations)
+        lookup_only = _timed(get_graph, args.iterations)
+        before = _timed(per_request_build, args.iterations)
+        after = _timed(registry_reuse, args.iterations)
+    
+    print(f"반복 횟수: {args.iterations}")
+    print(f"create_graph() 1회:          {build_only:8.3f} ms")
+    print(f"get_graph() 1회:             {lookup_only:8.4f} ms")
+    print(f"요청당 전체 (매번 빌드):     {before:8.3f} ms")
+    print(f"요청당 전체 (레지스트리):    {after:8.3f} ms")
+    print(f"요청당 절감:                 {before - after:8.3f} ms ({(1 - after / before):.0%})")
+
+
+if __name__ == "__main__":
+    main()
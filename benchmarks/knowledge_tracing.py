@@ -0,0 +1,73 @@
+"""지식 추적 벤치마크 - 코호트 일괄 갱신/재매핑 vs 사용자별 Python 루프
+
+실행:
+    python -m benchmarks.knowledge_tracing --users 100000 --concepts 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.knowledge_tracing import OBSERVATION_PARAMS, KnowledgeTracer, bkt_update
+
+
+def python_loop(levels_list, observations, params):
+    """개념마다 스칼라로 갱신하는 기준 구현"""
+    lr = (1 - params.slip) / params.guess
+    result = []
+    for levels, observed in zip(levels_list, observations):
+        updated = dict(levels)
+        for concept_id in observed:
+            p = min(max(updated[concept_id], 1e-6), 1 - 1e-6)
+            odds = p / (1 - p) * lr
+            posterior = odds / (1 + odds)
+            updated[concept_id] = posterior + (1 - posterior) * params.learn
+        result.append(updated)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BKT 코호트 갱신 측정")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--concepts", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    concept_ids = [f"c{i}" for i in range(args.concepts)]
+    tracer = KnowledgeTracer(concept_ids)
+    params = OBSERVATION_PARAMS["quiz"]
+
+    matrix = rng.uniform(0.2, 0.8, size=(args.users, args.concepts))
+    counts = (rng.random((args.users, args.concepts)) < 0.3).astype(np.float64)
+
+    levels_list = tracer.to_levels_batch(matrix)
+    observations = [[concept_ids[j] for j in np.flatnonzero(row)] for row in counts]
+
+    start = time.perf_counter()
+    expected = python_loop(levels_list, observations, params)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    updated = bkt_update(matrix, counts, params)
+    vector_time = time.perf_counter() - start
+
+    assert np.allclose(tracer.from_levels_batch(expected, 0.0), updated)
+
+    # taxonomy 변경: 개념 절반 교체 후 코호트 전체 재매핑
+    new_tracer = KnowledgeTracer(concept_ids[: args.concepts // 2] + [f"n{i}" for i in range(args.concepts // 2)])
+    start = time.perf_counter()
+    remapped = tracer.remap(updated, new_tracer, prior=0.4)
+    remap_time = time.perf_counter() - start
+
+    print(f"사용자 {args.users:,}명 × 개념 {args.concepts}개")
+    print(f"관찰 1회 갱신 - Python 루프: {loop_time * 1000:9.1f} ms")
+    print(f"관찰 1회 갱신 - NumPy 일괄: {vector_time * 1000:9.1f} ms ({loop_time / vector_time:.0f}배)")
+    print(f"taxonomy 재매핑 (NumPy):    {remap_time * 1000:9.1f} ms → {remapped.shape}")
+
+
+if __name__ == "__main__":
+    main()
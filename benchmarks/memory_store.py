@@ -0,0 +1,89 @@
+"""메모리 저장소 벤치마크 - 사용자 N명 규모에서 턴당 load/save 오버헤드
+
+턴 하나는 create_initial_state의 load + 모델 검증, memory_write의 모델 직렬화 + save다.
+
+실행:
+    python -m benchmarks.memory_store --users 100000 --turns 2000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import percentile
+from src.state import Mastery, Memory
+from src.utils.memory_store import MemoryStore
+
+
+BATCH_SIZE = 5000
+
+
+def sample_record(user_index: int) -> dict:
+    """몇 번 대화한 사용자 수준의 레코드"""
+    memory = Memory(
+        seen_terms=[f"term_{user_index % 97}_{i}" for i in range(30)],
+        history=[
+            {
+                "user_message": "RAG 파이프라인을 설계하려면 어떻게 해야 해?",
+                "intent": "design",
+                "concepts_covered": ["임베딩", "벡터 DB", "청킹"],
+                "confidence": 0.8
+            }
+            for _ in range(20)
+        ],
+    )
+    mastery = Mastery(levels={f"concept_{i}": 0.4 for i in range(10)})
+    return {"memory": memory.model_dump(mode="json"), "mastery": mastery.model_dump(mode="json")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메모리 저장소 턴당 오버헤드 측정")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--db", help="DB 경로 (기본: 임시 디렉터리)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(args.db or os.path.join(tmp, "memory.db"))
+
+        start = time.perf_counter()
+        for offset in range(0, args.users, BATCH_SIZE):
+            store.save_many(
+                (f"user-{i}", sample_record(i))
+                for i in range(offset, min(offset + BATCH_SIZE, args.users))
+            )
+        fill = time.perf_counter() - start
+
+        rng = random.Random(0)
+        loads, saves = [], []
+        for _ in range(args.turns):
+            user_id = f"user-{rng.randrange(args.users)}"
+
+            t0 = time.perf_counter()
+            record = store.load(user_id)
+            memory = Memory.model_validate(record["memory"])
+            mastery = Mastery.model_validate(record["mastery"])
+            t1 = time.perf_counter()
+
+            memory.history.append({"user_message": "다음 질문", "intent": "explain",
+                                   "concepts_covered": [], "confidence": 0.5})
+            store.save(user_id, {"memory": memory.model_dump(mode="json"), "mastery": mastery.model_dump(mode="json")})
+            t2 = time.perf_counter()
+
+            loads.append(t1 - t0)
+            saves.append(t2 - t1)
+
+        turns = [load + save for load, save in zip(loads, saves)]
+        print(f"사용자 {store.count():,}명 적재: {fill:.1f}s ({args.users / fill:,.0f} rows/s, 배치 {BATCH_SIZE})")
+        print(f"{'':12s} {'p50':>8s} {'p95':>8s} {'p99':>8s}  (ms, {args.turns}턴)")
+        for name, samples in (("load", loads), ("save", saves), ("턴 합계", turns)):
+            print(f"{name:12s} " + " ".join(f"{percentile(samples, p) * 1000:8.3f}" for p in (50, 95, 99)))
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
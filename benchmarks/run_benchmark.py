@@ -0,0 +1,273 @@
+"""오프라인 엔드투엔드 벤치마크 - 코퍼스 전체를 컴파일된 그래프로 실행
+
+네트워크 없이 결정적 가짜 LLM(benchmarks.fake_llm)으로 DomainPack 생성 경로까지
+실행하고, 처리량 / 노드별·요청별 p50/p95/p99 지연 / 최대 메모리를 측정해
+JSON으로 저장한다. 저장된 결과끼리 비교할 수 있다.
+
+실행:
+    python -m benchmarks.run_benchmark --rounds 5
+    python -m benchmarks.run_benchmark --cache cold --llm-latency 0.05
+    python -m benchmarks.run_benchmark --compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# 가짜 LLM 경로를 타도록 키를 채우고, 디스크 캐시는 쓰지 않음 (메모리 전용)
+os.environ["OPENAI_API_KEY"] = "benchmark-fake-key"
+os.environ["DOMAIN_CACHE_DIR"] = ""
+
+from benchmarks.corpus import CORPUS
+from benchmarks.fake_llm import FakeChatModel, start_fake_openai_server
+from benchmarks.stats import percentile
+from src.graph import get_graph
+from src.state import create_initial_state
+from src.utils.domain_cache import get_domain_cache
+from src.utils.llm_provider import PooledLLMProvider, StaticLLMProvider, set_llm_provider
+
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+PERCENTILES = (50, 95, 99)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """ms 단위 요약 통계"""
+    summary = {"count": len(samples)}
+    if samples:
+        summary["mean_ms"] = sum(samples) / len(samples) * 1000
+        summary["max_ms"] = max(samples) * 1000
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = percentile(samples, pct) * 1000
+    return summary
+
+
+def _git_sha() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_request(app, question: str, node_samples: Dict[str, List[float]]) -> Dict[str, Any]:
+    """
+    한 질문 실행 - stream 갱신 사이의 시간을 해당 노드의 지연으로 기록
+
+    Returns:
+        {"elapsed": 요청 전체(초), "domain": ..., "intent": ...}
+    """
+    state: Dict[str, Any] = {}
+    start = last = time.perf_counter()
+    for update in app.stream(create_initial_state(question)):
+        now = time.perf_counter()
+        for node, output in update.items():
+            node_samples.setdefault(node, []).append(now - last)
+            if output:
+                state.update(output)
+        last = now
+    intent = state.get("intent")
+    return {
+        "elapsed": time.perf_counter() - start,
+        "domain": state.get("detected_domain"),
+        "intent": intent.type if intent is not None else None,
+    }
+
+
+def check_coverage(observed: List[Dict[str, Any]]) -> List[str]:
+    """코퍼스 기대값과 실제 분류 결과가 다른 항목"""
+    mismatches = []
+    for item, result in zip(CORPUS, observed):
+        if (result["domain"], result["intent"]) != (item["expected_domain"], item["expected_intent"]):
+            mismatches.append(
+                f"{item['question']!r}: {result['domain']}/{result['intent']} "
+                f"(기대 {item['expected_domain']}/{item['expected_intent']})"
+            )
+    return mismatches
+
+
+def run_benchmark(
+    rounds: int,
+    warmup: int,
+    cache: str,
+    llm_latency: float,
+    llm_server: bool = False,
+) -> Dict[str, Any]:
+    """
+    코퍼스를 rounds회 실행하고 결과 dict 반환
+
+    Args:
+        rounds: 코퍼스 반복 횟수
+        warmup: 측정 전 버리는 코퍼스 반복 횟수
+        cache: "warm"이면 DomainPack 캐시 유지, "cold"면 요청마다 비움
+        llm_latency: 가짜 LLM 호출 1회의 지연(초)
+        llm_server: True면 프로세스 내 가짜 모델 대신 로컬 OpenAI 호환 서버에 HTTP로 호출
+    """
+    fake_llm = FakeChatModel(latency=llm_latency)
+    server = None
+    if llm_server:
+        server = start_fake_openai_server(latency=llm_latency)
+        set_llm_provider(PooledLLMProvider(
+            base_url=f"http://127.0.0.1:{server.server_port}/v1", api_key="benchmark"
+        ))
+    else:
+        set_llm_provider(StaticLLMProvider(fake_llm))
+    app = get_graph()
+    domain_cache = get_domain_cache()
+
+    def run_corpus(node_samples, request_samples):
+        observed = []
+        for item in CORPUS:
+            if cache == "cold":
+                domain_cache.clear()
+            result = run_request(app, item["question"], node_samples)
+            request_samples.append(result["elapsed"])
+            observed.append(result)
+        return observed
+
+    try:
+        for _ in range(warmup):
+            run_corpus({}, [])
+
+        node_samples: Dict[str, List[float]] = {}
+        request_samples: List[float] = []
+        def llm_call_count():
+            return server.calls if server is not None else fake_llm.calls
+
+        llm_calls_before = llm_call_count()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            observed = run_corpus(node_samples, request_samples)
+        wall = time.perf_counter() - start
+        llm_calls = llm_call_count() - llm_calls_before
+
+        # 최대 메모리는 별도 1회 실행으로 측정 (tracemalloc이 지연을 부풀리므로)
+        domain_cache.clear()
+        tracemalloc.start()
+        run_corpus({}, [])
+        _, peak_traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        set_llm_provider(None)
+        if server is not None:
+            server.shutdown()
+
+    # ru_maxrss: Linux는 KB, macOS는 byte
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        max_rss *= 1024
+
+    return {
+        "metadata": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "git_sha": _git_sha(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus_size": len(CORPUS),
+            "rounds": rounds,
+            "warmup": warmup,
+            "cache": cache,
+            "llm_latency_s": llm_latency,
+            "llm_backend": "server" if llm_server else "in-process",
+        },
+        "throughput_rps": len(request_samples) / wall if wall else 0.0,
+        "wall_s": wall,
+        "llm_calls": llm_calls,
+        "request": summarize(request_samples),
+        "nodes": {node: summarize(samples) for node, samples in sorted(node_samples.items())},
+        "memory": {
+            "peak_traced_mb": peak_traced / 1024 / 1024,
+            "max_rss_mb": max_rss / 1024 / 1024,
+        },
+        "coverage_mismatches": check_coverage(observed),
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    meta = result["metadata"]
+    print(f"커밋: {meta['git_sha']}  코퍼스: {meta['corpus_size']}개 × {meta['rounds']}회  "
+          f"캐시: {meta['cache']}  LLM 지연: {meta['llm_latency_s']}s")
+    print(f"처리량: {result['throughput_rps']:.1f} req/s  (LLM: {meta['llm_backend']}, 호출 {result['llm_calls']}회)")
+    print(f"메모리: tracemalloc 최대 {result['memory']['peak_traced_mb']:.1f} MB, "
+          f"RSS 최대 {result['memory']['max_rss_mb']:.1f} MB")
+    print()
+    print(f"{'':28s} {'p50':>9s} {'p95':>9s} {'p99':>9s}  (ms)")
+    rows = [("요청 전체", result["request"])] + list(result["nodes"].items())
+    for name, stats in rows:
+        print(f"{name:28s} {stats['p50_ms']:9.3f} {stats['p95_ms']:9.3f} {stats['p99_ms']:9.3f}")
+    if result["coverage_mismatches"]:
+        print("\n⚠️ 코퍼스 기대값과 다른 분류:")
+        for line in result["coverage_mismatches"]:
+            print(f"  - {line}")
+
+
+def compare(base_path: str, new_path: str) -> None:
+    """두 결과 파일의 p50/p95와 처리량 비교"""
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+
+    def change(old: float, cur: float) -> str:
+        return f"{(cur - old) / old:+.1%}" if old else "n/a"
+
+    print(f"기준: {base['metadata']['git_sha']}  비교: {new['metadata']['git_sha']}")
+    print(f"처리량: {base['throughput_rps']:.1f} → {new['throughput_rps']:.1f} req/s "
+          f"({change(base['throughput_rps'], new['throughput_rps'])})")
+    print()
+    print(f"{'':28s} {'p50 기준':>10s} {'p50 비교':>10s} {'변화':>8s} {'p95 기준':>10s} {'p95 비교':>10s} {'변화':>8s}")
+    rows = [("요청 전체", base["request"], new["request"])]
+    for node in sorted(set(base["nodes"]) | set(new["nodes"])):
+        rows.append((node, base["nodes"].get(node), new["nodes"].get(node)))
+    for name, old, cur in rows:
+        if old is None or cur is None:
+            print(f"{name:28s} {'(한쪽에만 존재)':>10s}")
+            continue
+        print(f"{name:28s} {old['p50_ms']:10.3f} {cur['p50_ms']:10.3f} {change(old['p50_ms'], cur['p50_ms']):>8s} "
+              f"{old['p95_ms']:10.3f} {cur['p95_ms']:10.3f} {change(old['p95_ms'], cur['p95_ms']):>8s}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 엔드투엔드 그래프 벤치마크")
+    parser.add_argument("--rounds", type=int, default=5, help="코퍼스 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=1, help="측정 전 워밍업 반복 횟수")
+    parser.add_argument("--cache", choices=["warm", "cold"], default="warm",
+                        help="cold면 요청마다 DomainPack 캐시를 비워 생성 경로까지 측정")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="가짜 LLM 호출 지연(초)")
+    parser.add_argument("--llm-server", action="store_true",
+                        help="로컬 OpenAI 호환 가짜 서버로 HTTP 호출 (연결 풀 경로 포함)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/<sha>-<시각>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="두 결과 파일 비교")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    result = run_benchmark(args.rounds, args.warmup, args.cache, args.llm_latency, args.llm_server)
+    print_report(result)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{result['metadata']['git_sha'] or 'nogit'}-{stamp}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
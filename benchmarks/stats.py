@@ -0,0 +1,13 @@
+"""벤치마크 공용 통계"""
+from typing import List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """선형 보간 백분위수"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
@@ -0,0 +1,410 @@
+"""HTTP JSON API - 백엔드 간 호출용 ASGI 앱 (Gradio UI 없이 컴파일된 그래프 실행)
+
+엔드포인트:
+- POST /v1/chat          {"message", "user_id"?, "session_id"?} → {"response", "seconds"}
+- POST /v1/chat/stream   같은 입력, 노드 진행을 NDJSON(한 줄에 JSON 하나)으로 스트리밍
+- GET  /healthz          프로세스 생존 확인
+- GET  /readyz           그래프 컴파일 여부 + 캐시 예열 상태 (준비 전이면 503)
+- GET  /metrics          Prometheus 텍스트 포맷
+
+과부하 제어:
+동시에 실행하는 요청은 API_MAX_INFLIGHT개로 제한하고, 초과분은 최대 API_MAX_QUEUE개까지
+API_QUEUE_TIMEOUT초 동안 대기시킨다. 대기열이 가득 찼거나 대기 시간이 지나면 그래프를 실행하지 않고
+바로 503 + Retry-After로 거절하므로, 부하가 몰려도 처리 중인 요청의 지연과 처리량이 유지된다.
+클라이언트가 연결을 끊으면 실행 중인 요청을 취소해 슬롯을 돌려준다.
+
+실행:
+    python -m src.api --port 8000
+    uvicorn src.api:app --port 8000
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import time
+
+from .graph import arun_rag_education_bot, arun_rag_education_bot_stream, compiled_graphs, warmup_graph
+from .nodes.dynamic_knowledge import current_pack_fingerprint
+from .prewarm import start_prewarmer, stop_prewarmer
+from .state import DEFAULT_USER_ID
+from .utils.domain_cache import get_domain_cache
+from .utils.domain_usage import get_domain_usage
+from .utils.log import get_logger
+from .utils.metrics import CONTENT_TYPE, REGISTRY
+from .utils.response_cache import get_response_cache
+
+logger = get_logger(__name__)
+
+
+API_MAX_INFLIGHT = int(os.getenv("API_MAX_INFLIGHT", "32"))
+API_MAX_QUEUE = int(os.getenv("API_MAX_QUEUE", "64"))
+API_QUEUE_TIMEOUT = float(os.getenv("API_QUEUE_TIMEOUT", "5"))
+API_MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", str(64 * 1024)))
+# user_id/session_id 최대 길이 (메모리 저장소/세션 체크포인터 키로 쓰임)
+API_MAX_ID_LENGTH = int(os.getenv("API_MAX_ID_LENGTH", "128"))
+# readyz에 예열 상태를 보고할 상위 분야 수
+READY_DOMAINS = 5
+
+API_REQUESTS = REGISTRY.counter("rag_edu_api_requests_total", "API 요청 수", ["route", "status"])
+API_LATENCY = REGISTRY.histogram("rag_edu_api_request_seconds", "API 요청 처리 시간(초, 대기 포함)", ["route"])
+API_REJECTIONS = REGISTRY.counter("rag_edu_api_rejections_total", "과부하로 거절한 요청 수", ["reason"])
+API_QUEUE_WAIT = REGISTRY.histogram("rag_edu_api_queue_wait_seconds", "실행 슬롯을 기다린 시간(초)")
+API_INFLIGHT = REGISTRY.gauge("rag_edu_api_inflight", "실행 중인 API 요청 수")
+API_QUEUED = REGISTRY.gauge("rag_edu_api_queued", "실행 슬롯을 기다리는 API 요청 수")
+
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class Overloaded(Exception):
+    """실행 슬롯을 얻지 못함 (reason: "queue_full" | "queue_timeout")"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionGate:
+    """
+    동시 실행 수 제한 + 제한된 대기열
+
+    Args:
+        max_inflight: 동시에 실행할 최대 요청 수
+        max_queue: 슬롯을 기다릴 수 있는 최대 요청 수 (넘으면 즉시 거절)
+        queue_timeout: 대기 최대 시간(초)
+    """
+
+    def __init__(self, max_inflight: int, max_queue: int, queue_timeout: float):
+        self.max_inflight = max(max_inflight, 1)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.inflight = 0
+        self.queued = 0
+        self._slots = asyncio.Semaphore(self.max_inflight)
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """
+        실행 슬롯 (with 블록 동안 점유)
+
+        Raises:
+            Overloaded: 대기열이 가득 찼거나 queue_timeout 안에 슬롯이 나지 않음
+        """
+        if self._slots.locked():
+            if self.queued >= self.max_queue:
+                raise Overloaded("queue_full")
+            self.queued += 1
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise Overloaded("queue_timeout") from None
+            finally:
+                self.queued -= 1
+                API_QUEUE_WAIT.observe(time.perf_counter() - start)
+        else:
+            await self._slots.acquire()
+            API_QUEUE_WAIT.observe(0.0)
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+            self._slots.release()
+
+
+# ============ ASGI 헬퍼 ============
+
+async def _send_response(send: Send, status: int, body: bytes, content_type: str,
+                         headers: Sequence[Tuple[bytes, bytes]] = ()) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send: Send, status: int, payload: Any,
+                     headers: Sequence[Tuple[bytes, bytes]] = ()) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    await _send_response(send, status, body, "application/json; charset=utf-8", headers)
+
+
+class _BadRequest(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_json(receive: Receive) -> Dict[str, Any]:
+    """요청 본문 JSON (API_MAX_BODY_BYTES 초과 시 413, 형식/필드 오류 시 400)"""
+    chunks: List[bytes] = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise asyncio.CancelledError()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > API_MAX_BODY_BYTES:
+            raise _BadRequest(413, f"본문은 {API_MAX_BODY_BYTES}바이트 이하여야 합니다")
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            break
+    try:
+        payload = json.loads(b"".join(chunks) or b"null")
+    except ValueError:
+        raise _BadRequest(400, "본문이 JSON이 아닙니다") from None
+    if not isinstance(payload, dict):
+        raise _BadRequest(400, "본문은 JSON 객체여야 합니다")
+    message = payload.get("message")
+    if not isinstance(message, str) or not message.strip():
+        raise _BadRequest(400, "message 필드가 비어 있습니다")
+    for field in ("user_id", "session_id"):
+        value = payload.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str) or not value.strip() or len(value) > API_MAX_ID_LENGTH:
+            raise _BadRequest(400, f"{field} 필드는 {API_MAX_ID_LENGTH}자 이하의 비어 있지 않은 문자열이어야 합니다")
+    return payload
+
+
+async def _cancel_on_disconnect(receive: Receive, task: asyncio.Task) -> None:
+    """클라이언트가 연결을 끊으면 실행 중인 작업 취소 (본문을 다 읽은 뒤에 사용)"""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            task.cancel()
+            return
+
+
+def _stream_events(output: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """그래프 스트림 갱신 하나 → NDJSON 이벤트 (app.py의 스트리밍 UI와 같은 단위)"""
+    events = []
+    for node_name, update in output.items():
+        if "partial" in update:
+            # compose_answer가 개요/섹션을 만드는 대로 보낸 부분 출력
+            events.append({"node": node_name, "content": update["content"]})
+        elif node_name == "compose_answer":
+            # 내용은 부분 출력으로 이미 보냄
+            continue
+        elif node_name == "deliver":
+            events.append({"node": node_name, "response": update["final_response"]})
+        else:
+            events.append({"node": node_name})
+    return events
+
+
+# ============ 앱 ============
+
+class ChatAPI:
+    """
+    챗봇 ASGI 앱
+
+    Args:
+        max_inflight / max_queue / queue_timeout: 과부하 제어 설정 (AdmissionGate)
+        prewarm: 시작 시 DomainPack 사전 생성기를 함께 띄울지
+    """
+
+    def __init__(
+        self,
+        max_inflight: int = API_MAX_INFLIGHT,
+        max_queue: int = API_MAX_QUEUE,
+        queue_timeout: float = API_QUEUE_TIMEOUT,
+        prewarm: bool = True,
+    ):
+        self.gate = AdmissionGate(max_inflight, max_queue, queue_timeout)
+        self.prewarm = prewarm
+        self.started = False
+        API_INFLIGHT.set_function(lambda: self.gate.inflight)
+        API_QUEUED.set_function(lambda: self.gate.queued)
+        self._routes = {
+            ("POST", "/v1/chat"): self._chat,
+            ("POST", "/v1/chat/stream"): self._chat_stream,
+            ("GET", "/healthz"): self._healthz,
+            ("GET", "/readyz"): self._readyz,
+            ("GET", "/metrics"): self._metrics,
+        }
+
+    async def __call__(self, scope: Dict[str, Any], receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        path = scope["path"]
+        handler = self._routes.get((scope["method"], path))
+        start = time.perf_counter()
+        if handler is None:
+            known = any(route_path == path for _, route_path in self._routes)
+            status = 405 if known else 404
+            await _send_json(send, status, {"error": "허용되지 않는 메서드" if known else "없는 경로"})
+            API_REQUESTS.inc(route="other", status=str(status))
+            return
+        try:
+            status = await handler(receive, send)
+        except _BadRequest as e:
+            status = e.status
+            await _send_json(send, status, {"error": str(e)})
+        except Overloaded as e:
+            status = 503
+            API_REJECTIONS.inc(reason=e.reason)
+            await _send_json(send, status, {"error": "요청이 많아 처리할 수 없습니다", "reason": e.reason},
+                             [(b"retry-after", b"1")])
+        except asyncio.CancelledError:
+            # 클라이언트가 연결을 끊음 (응답을 보낼 곳이 없음)
+            status = 499
+        except Exception as e:
+            # 그래프 실행 실패 (스트리밍은 응답을 시작한 뒤라 자체적으로 오류 이벤트를 보냄)
+            logger.exception("❌ 요청 처리 실패: %s", path)
+            status = 500
+            await _send_json(send, status, {"error": "응답을 생성하지 못했습니다", "detail": str(e)})
+        API_REQUESTS.inc(route=path, status=str(status))
+        API_LATENCY.observe(time.perf_counter() - start, route=path)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    logger.exception("❌ API 시작 실패")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def startup(self) -> None:
+        """그래프 사전 컴파일 (+ 사전 생성기 시작) 후 준비 완료로 표시"""
+        await asyncio.to_thread(warmup_graph)
+        if self.prewarm:
+            start_prewarmer()
+        self.started = True
+
+    async def shutdown(self) -> None:
+        self.started = False
+        if self.prewarm:
+            await asyncio.to_thread(stop_prewarmer, 5)
+
+    # ============ 라우트 ============
+
+    async def _run(self, receive: Receive, run: Callable[[], Awaitable[Any]]) -> Any:
+        """슬롯을 잡은 뒤 run() 실행 (연결이 끊기면 취소)"""
+        async with self.gate.slot():
+            task = asyncio.ensure_future(run())
+            watcher = asyncio.ensure_future(_cancel_on_disconnect(receive, task))
+            try:
+                return await task
+            finally:
+                watcher.cancel()
+
+    async def _chat(self, receive: Receive, send: Send) -> int:
+        payload = await _read_json(receive)
+        start = time.perf_counter()
+        response = await self._run(receive, lambda: arun_rag_education_bot(
+            payload["message"],
+            user_id=payload.get("user_id") or DEFAULT_USER_ID,
+            session_id=payload.get("session_id"),
+            raise_errors=True,
+        ))
+        await _send_json(send, 200, {"response": response, "seconds": round(time.perf_counter() - start, 6)})
+        return 200
+
+    async def _chat_stream(self, receive: Receive, send: Send) -> int:
+        payload = await _read_json(receive)
+
+        async def send_event(event: Dict[str, Any]) -> None:
+            line = json.dumps(event, ensure_ascii=False) + "\n"
+            await send({"type": "http.response.body", "body": line.encode("utf-8"), "more_body": True})
+
+        async def stream() -> None:
+            # 슬롯을 얻은 뒤에 응답을 시작 (거절은 503 상태 코드로 전달)
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson; charset=utf-8")],
+            })
+            try:
+                async for output in arun_rag_education_bot_stream(
+                    payload["message"],
+                    user_id=payload.get("user_id") or DEFAULT_USER_ID,
+                    session_id=payload.get("session_id"),
+                    raise_errors=True,
+                ):
+                    for event in _stream_events(output):
+                        await send_event(event)
+            except Exception as e:
+                # 상태 코드는 이미 보냈으므로 마지막 이벤트로 실패를 알림
+                logger.exception("❌ 스트리밍 중 오류")
+                await send_event({"error": "응답을 생성하지 못했습니다", "detail": str(e)})
+            await send({"type": "http.response.body", "body": b""})
+
+        await self._run(receive, stream)
+        return 200
+
+    async def _healthz(self, receive: Receive, send: Send) -> int:
+        await _send_json(send, 200, {"status": "ok"})
+        return 200
+
+    def readiness(self) -> Dict[str, Any]:
+        """준비 여부와 캐시 예열 상태"""
+        graphs = compiled_graphs()
+        top_domains = [domain for domain, _ in get_domain_usage().top(READY_DOMAINS)]
+        return {
+            "ready": self.started and all(graphs.values()),
+            "graphs": graphs,
+            "warm_domains": {domain: current_pack_fingerprint(domain) is not None for domain in top_domains},
+            "domain_cache": get_domain_cache().stats(),
+            "response_cache": get_response_cache().stats(),
+            "inflight": self.gate.inflight,
+            "queued": self.gate.queued,
+        }
+
+    async def _readyz(self, receive: Receive, send: Send) -> int:
+        readiness = self.readiness()
+        status = 200 if readiness["ready"] else 503
+        await _send_json(send, status, readiness)
+        return status
+
+    async def _metrics(self, receive: Receive, send: Send) -> int:
+        await _send_response(send, 200, REGISTRY.render().encode("utf-8"), CONTENT_TYPE)
+        return 200
+
+
+def create_app(**kwargs) -> ChatAPI:
+    """ASGI 앱 생성 (인자는 ChatAPI와 같음)"""
+    return ChatAPI(**kwargs)
+
+
+# uvicorn src.api:app
+app = create_app()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="챗봇 HTTP JSON API 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8000")))
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("uvicorn이 필요합니다: pip install uvicorn") from None
+    print(f"🚀 챗봇 API 서버: http://{args.host}:{args.port} (동시 실행 {API_MAX_INFLIGHT}, 대기열 {API_MAX_QUEUE})")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""질문 일괄 처리 - JSONL 질문 세트를 프로세스 풀로 돌려 JSONL 응답으로 저장
+
+커리큘럼 질문 세트나 문의 덤프처럼 대량의 질문을 오프라인으로 처리할 때 쓴다.
+
+흐름:
+1. 입력 JSONL을 한 줄씩 읽어 batch_size개씩 묶고, 배치를 user_id 기준으로 나눠 워커 프로세스에 보냄
+   (같은 사용자의 줄은 항상 같은 워커가 입력 순서대로 처리 - 사용자 메모리의 load → 갱신 → 저장이
+   여러 프로세스에서 겹쳐 앞선 갱신을 덮어쓰지 않게 함, user_id가 없는 줄은 워커에 고르게 분산)
+2. 워커는 시작 시 그래프를 컴파일해 두고, 프로세스 수명 동안 DomainPack/응답 캐시를 재사용
+3. 결과는 입력 순서대로 출력 JSONL에 이어 쓰고, 배치마다 체크포인트(<출력>.ckpt) 갱신
+4. 중단된 뒤 다시 실행하면 체크포인트 이후 줄부터 이어서 처리, 끝나면 체크포인트 삭제
+
+입력 한 줄은 {"question": "...", "id": ..., "user_id": "..."} (message 키나 JSON 문자열도 허용).
+출력 한 줄은 {"line": 입력 줄 번호, "id", "question", "response", "seconds"} (실패 시 "error").
+
+실행:
+    python -m src.batch questions.jsonl -o answers.jsonl --workers 4
+"""
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import json
+import os
+import time
+import zlib
+
+from .graph import run_rag_education_bot, warmup_graph
+from .state import DEFAULT_USER_ID
+from .utils.llm_scheduler import llm_priority
+from .utils.log import get_logger
+from .utils.memory_store import get_memory_writer
+from .utils.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+
+# 워커 작업 하나에 보내는 질문 수
+BATCH_QUESTIONS = int(os.getenv("BATCH_QUESTIONS", "16"))
+CHECKPOINT_SUFFIX = ".ckpt"
+
+BATCH_RESULTS = REGISTRY.counter("rag_edu_batch_questions_total", "일괄 처리한 질문 수", ["result"])
+
+
+@dataclass
+class BatchReport:
+    """일괄 처리 결과"""
+    questions: int = 0        # 이번 실행에서 처리한 질문
+    errors: int = 0           # 그중 실패 (입력 형식 오류 포함)
+    resumed: int = 0          # 체크포인트로 건너뛴 입력 줄
+    seconds: float = 0.0
+    answer_seconds: float = 0.0  # 질문별 처리 시간 합 (워커 기준)
+
+    @property
+    def questions_per_second(self) -> float:
+        return self.questions / self.seconds if self.seconds else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.answer_seconds / self.questions if self.questions else 0.0
+
+    def summary(self) -> str:
+        resumed = f", 이어서 처리 ({self.resumed:,}줄 건너뜀)" if self.resumed else ""
+        return (
+            f"질문 {self.questions:,}개 (실패 {self.errors:,}개){resumed}, {self.seconds:.2f}s "
+            f"({self.questions_per_second:,.1f} questions/s, 질문당 평균 {self.mean_latency * 1000:,.1f}ms)"
+        )
+
+
+# ============ 워커 ============
+
+def _init_worker() -> None:
+    """(워커 프로세스) 그래프를 미리 컴파일 - 이후 배치는 컴파일된 그래프와 캐시를 재사용"""
+    warmup_graph()
+
+
+def parse_question(line: str) -> Dict[str, Any]:
+    """
+    입력 JSONL 한 줄 → {"question", "id", "user_id"}
+
+    Raises:
+        ValueError: JSON이 아니거나 질문이 비어 있음
+    """
+    item = json.loads(line)
+    if isinstance(item, str):
+        item = {"question": item}
+    if not isinstance(item, dict):
+        raise ValueError("질문 줄은 JSON 객체나 문자열이어야 합니다")
+    question = item.get("question", item.get("message"))
+    if not isinstance(question, str) or not question.strip():
+        raise ValueError("question 필드가 비어 있습니다")
+    return {"question": question, "id": item.get("id"), "user_id": item.get("user_id") or DEFAULT_USER_ID}
+
+
+def _answer_batch(items: List[Tuple[int, str]]) -> List[Dict[str, Any]]:
+    """(워커 프로세스) (줄 번호, 원문) 배치를 처리해 출력 레코드 목록으로"""
+    results = []
+    remembers = False
+    for line_no, line in items:
+        result: Dict[str, Any] = {"line": line_no}
+        start = time.perf_counter()
+        try:
+            item = parse_question(line)
+            result.update(id=item["id"], question=item["question"])
+            # 배치 LLM 호출은 사용자 요청(interactive) 뒤에 나감
+            with llm_priority("batch"):
+                # 그래프 실패도 오류 문구 응답이 아니라 error 레코드로 남김
+                result["response"] = run_rag_education_bot(
+                    item["question"], user_id=item["user_id"], raise_errors=True
+                )
+            remembers = remembers or item["user_id"] != DEFAULT_USER_ID
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = round(time.perf_counter() - start, 6)
+        results.append(result)
+    # 체크포인트가 앞서 나가지 않도록 이 배치의 사용자 메모리 저장을 끝내고 반환
+    writer = get_memory_writer() if remembers else None
+    if writer is not None:
+        writer.flush()
+    return results
+
+
+def _shard(line_no: int, line: str, shards: int) -> int:
+    """입력 줄을 맡을 워커 번호 (같은 user_id는 같은 워커, 익명/형식 오류 줄은 줄 번호로 분산)"""
+    try:
+        user_id = parse_question(line)["user_id"]
+    except ValueError:
+        user_id = DEFAULT_USER_ID
+    if user_id == DEFAULT_USER_ID:
+        return line_no % shards
+    return zlib.crc32(str(user_id).encode("utf-8")) % shards
+
+
+# ============ 체크포인트 ============
+
+def _read_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        return {"lines": int(checkpoint["lines"]), "offset": int(checkpoint["offset"])}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning("⚠️ 체크포인트를 읽지 못해 처음부터 처리 (%s): %s", path, e)
+        return None
+
+
+def _write_checkpoint(path: str, lines: int, offset: int) -> None:
+    """처리한 입력 줄 수와 출력 파일 길이 기록 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"lines": lines, "offset": offset}, f)
+    os.replace(tmp_path, path)
+
+
+# ============ 실행 ============
+
+class BatchRunner:
+    """
+    JSONL 질문 일괄 처리기
+
+    Args:
+        workers: 워커 프로세스 수 (None이면 CPU 수, 0이면 현재 프로세스에서 처리)
+        batch_size: 한 번에 읽어 워커들에 나눠 보내는 질문 수
+    """
+
+    def __init__(self, workers: Optional[int] = None, batch_size: int = BATCH_QUESTIONS):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = max(batch_size, 1)
+
+    def _batches(self, input_path: str, skip: int) -> Iterator[Tuple[int, List[Tuple[int, str]]]]:
+        """(이 배치까지 읽은 입력 줄 수, [(줄 번호, 원문), ...]) - 빈 줄은 건너뜀"""
+        batch: List[Tuple[int, str]] = []
+        line_no = 0
+        with open(input_path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if line_no <= skip or not line.strip():
+                    continue
+                batch.append((line_no, line))
+                if len(batch) >= self.batch_size:
+                    yield line_no, batch
+                    batch = []
+        if batch or line_no > skip:
+            yield line_no, batch
+
+    def run(self, input_path: str, output_path: str, restart: bool = False) -> BatchReport:
+        """
+        입력 JSONL의 질문을 처리해 출력 JSONL에 저장
+
+        Args:
+            restart: True면 체크포인트를 무시하고 처음부터 (출력 파일을 덮어씀)
+        """
+        report = BatchReport()
+        start = time.perf_counter()
+        checkpoint_path = output_path + CHECKPOINT_SUFFIX
+        checkpoint = None if restart else _read_checkpoint(checkpoint_path)
+        if checkpoint is not None and os.path.exists(output_path):
+            report.resumed = checkpoint["lines"]
+            out = open(output_path, "r+b")
+            # 체크포인트 뒤에 쓰다 만 결과는 버림
+            out.truncate(checkpoint["offset"])
+            out.seek(checkpoint["offset"])
+            logger.info("↩️ 체크포인트에서 이어서 처리: %s줄 이후", report.resumed)
+        else:
+            out = open(output_path, "wb")
+
+        def collect(lines_read: int, futures: List[Future]) -> None:
+            # 워커별로 나눠 처리한 결과를 입력 순서로 다시 합침
+            results = sorted((result for future in futures for result in future.result()), key=lambda r: r["line"])
+            for result in results:
+                out.write((json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"))
+                report.answer_seconds += result["seconds"]
+                failed = "error" in result
+                report.errors += failed
+                BATCH_RESULTS.inc(result="error" if failed else "ok")
+            report.questions += len(results)
+            # 출력이 디스크에 닿은 뒤에 체크포인트를 옮김 (중단돼도 체크포인트 ≤ 출력)
+            out.flush()
+            os.fsync(out.fileno())
+            _write_checkpoint(checkpoint_path, lines_read, out.tell())
+
+        # 워커마다 프로세스 1개짜리 풀 - 같은 워커에 보낸 작업은 보낸 순서대로 실행됨
+        pools = [ProcessPoolExecutor(1, initializer=_init_worker) for _ in range(self.workers)]
+        if not pools:
+            _init_worker()
+        # 진행 중인 배치 수 제한 (입력이 커도 메모리가 늘지 않게, 결과는 입력 순서대로 씀)
+        pending = deque()
+        try:
+            for lines_read, batch in self._batches(input_path, report.resumed):
+                if not pools:
+                    future = Future()
+                    future.set_result(_answer_batch(batch))
+                    futures = [future]
+                else:
+                    shards: List[List[Tuple[int, str]]] = [[] for _ in pools]
+                    for line_no, line in batch:
+                        shards[_shard(line_no, line, len(pools))].append((line_no, line))
+                    futures = [pool.submit(_answer_batch, items) for pool, items in zip(pools, shards) if items]
+                pending.append((lines_read, futures))
+                if len(pending) > max(self.workers, 1) * 2:
+                    collect(*pending.popleft())
+            while pending:
+                collect(*pending.popleft())
+        finally:
+            for pool in pools:
+                pool.shutdown(cancel_futures=True)
+            out.close()
+
+        # 끝까지 처리했으면 다음 실행은 처음부터
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        report.seconds = time.perf_counter() - start
+        logger.info("📦 일괄 처리 (%s → %s): %s", input_path, output_path, report.summary())
+        return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> BatchReport:
+    parser = argparse.ArgumentParser(description="JSONL 질문 세트 일괄 처리")
+    parser.add_argument("input", help="질문 JSONL 경로")
+    parser.add_argument("-o", "--output", required=True, help="응답 JSONL 경로 (체크포인트는 <출력>.ckpt)")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (0: 단일 프로세스)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_QUESTIONS, help="워커 작업당 질문 수")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 처리")
+    args = parser.parse_args(argv)
+
+    report = BatchRunner(args.workers, args.batch_size).run(args.input, args.output, restart=args.restart)
+    print(report.summary())
+    return report
+
+
+if __name__ == "__main__":
+    main()
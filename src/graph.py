@@ -1,30 +1,115 @@
 """LangGraph 그래프 구성 - 동적 분야 학습을 위한 워크플로우"""
 from langgraph.graph import StateGraph, END
-from typing import Literal
+from typing import Any, Callable, Dict, Literal, Optional
+import asyncio
+import functools
+import os
+import threading
+import time
 
-from .state import GraphState, create_initial_state
-from .nodes.domain_detect import domain_detect_node
-from .nodes.dynamic_knowledge import generate_domain_knowledge_node
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from .state import DEFAULT_USER_ID, GraphState, create_initial_state, create_turn_input
+from .nodes.domain_detect import detect_domain, domain_detect_node
+from .nodes.dynamic_knowledge import generate_domain_knowledge_node, agenerate_domain_knowledge_node, current_pack_fingerprint
 from .nodes.domain_bootstrap import domain_bootstrap_node
 from .nodes.user_signals import user_signals_node
-from .nodes.coldstart_probe import coldstart_probe_node
+from .nodes.coldstart_probe import coldstart_probe_node, probe_profile
 from .nodes.infer_level import infer_level_node
 from .nodes.adaptive_diagnostic import adaptive_diagnostic_node
-from .nodes.intent_detect import intent_detect_node
+from .nodes.intent_detect import intent_detect_node, aintent_detect_node
 from .nodes.taxonomy_map import taxonomy_map_node
 from .nodes.plan_answer import plan_answer_node
 from .nodes.tool_advisors import tool_advisors_node
 from .nodes.gap_mining import gap_mining_node
 from .nodes.compose_answer import compose_answer_node
 from .nodes.quality_gate import quality_gate_node
-from .nodes.memory_write import memory_write_node
+from .nodes.memory_write import memory_write_node, amemory_write_node
 from .nodes.deliver import deliver_node
+from .retrieval.hybrid import index_version
+from .utils.domain_usage import get_domain_usage
+from .utils.log import get_logger
+from .utils.metrics import REGISTRY
+from .utils.response_cache import get_response_cache
+from .utils.session_store import create_session_saver
+
+logger = get_logger(__name__)
+
+
+# ============ 메트릭 ============
+
+NODE_LATENCY = REGISTRY.histogram(
+    "rag_edu_node_latency_seconds", "노드 실행 시간(초)", ["node"]
+)
+NODE_CALLS = REGISTRY.counter(
+    "rag_edu_node_calls_total", "노드 호출 수", ["node"]
+)
+NODE_ERRORS = REGISTRY.counter(
+    "rag_edu_node_errors_total", "예외로 끝난 노드 호출 수", ["node"]
+)
+BRANCH_DECISIONS = REGISTRY.counter(
+    "rag_edu_branch_decisions_total", "조건부 엣지 분기 결정 수", ["branch", "decision"]
+)
+
+
+def _instrument_node(name: str, func: Callable) -> Callable:
+    """노드 호출 수/지연/에러 기록"""
+    @functools.wraps(func)
+    def wrapper(state):
+        start = time.perf_counter()
+        try:
+            return func(state)
+        except Exception:
+            NODE_ERRORS.inc(node=name)
+            raise
+        finally:
+            NODE_CALLS.inc(node=name)
+            NODE_LATENCY.observe(time.perf_counter() - start, node=name)
+    return wrapper
+
+
+def _instrument_async_node(name: str, afunc: Callable) -> Callable:
+    """비동기 노드 호출 수/지연/에러 기록"""
+    @functools.wraps(afunc)
+    async def wrapper(state):
+        start = time.perf_counter()
+        try:
+            return await afunc(state)
+        except Exception:
+            NODE_ERRORS.inc(node=name)
+            raise
+        finally:
+            NODE_CALLS.inc(node=name)
+            NODE_LATENCY.observe(time.perf_counter() - start, node=name)
+    return wrapper
+
+
+def _instrument_branch(branch: Callable) -> Callable:
+    """조건부 엣지의 분기 결정 기록"""
+    @functools.wraps(branch)
+    def wrapper(state):
+        decision = branch(state)
+        BRANCH_DECISIONS.inc(branch=branch.__name__, decision=decision)
+        return decision
+    return wrapper
 
 
 # ============ 조건부 엣지 함수들 ============
 
-def should_coldstart(state: GraphState) -> Literal["coldstart_probe", "infer_level"]:
-    """UserSignals 후 콜드스타트가 필요한지 판단"""
+# 세션에서 숙련도 프로필을 재사용하는 기간(초)
+SESSION_PROFILE_TTL = float(os.getenv("SESSION_PROFILE_TTL", "1800"))
+
+
+def _profile_is_fresh(state: GraphState) -> bool:
+    """세션의 이전 턴에서 같은 DomainPack으로 만든 프로필이 아직 유효한지"""
+    profiled_at = state.get("profiled_at", 0.0)
+    return profiled_at > 0 and time.time() - profiled_at < SESSION_PROFILE_TTL
+
+
+def should_coldstart(state: GraphState) -> Literal["coldstart_probe", "infer_level", "intent_detect"]:
+    """UserSignals 후 콜드스타트가 필요한지 판단 (프로필이 유효하면 진단 단계 전체 생략)"""
+    if _profile_is_fresh(state):
+        return "intent_detect"
     if state["needs_coldstart"]:
         return "coldstart_probe"
     return "infer_level"
@@ -50,29 +135,70 @@ def should_use_tool_advisors(state: GraphState) -> Literal["tool_advisors", "gap
 
 # ============ 그래프 빌드 ============
 
-def create_graph():
-    """동적 분야 학습 챗봇 그래프 생성"""
+class _DualNode(Runnable):
+    """
+    동기/비동기 구현을 함께 가진 노드
+    
+    StateGraph가 일반 함수를 감쌀 때처럼 콜백(트레이싱) 없이 바로 호출한다.
+    (RunnableLambda는 호출마다 콜백 매니저를 만들어 노드 실행 비용이 늘어남)
+    """
+    
+    def __init__(self, name: str, func: Callable, afunc: Callable):
+        self.name = name
+        self.func = func
+        self.afunc = afunc
+    
+    def invoke(self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any) -> Dict[str, Any]:
+        return self.func(input)
+    
+    async def ainvoke(self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any) -> Dict[str, Any]:
+        return await self.afunc(input)
+
+
+def _add_node(workflow: StateGraph, name: str, func: Callable, afunc: Optional[Callable] = None) -> None:
+    """
+    동기/비동기 구현을 함께 가진 노드 등록
+    
+    invoke/stream에서는 func, ainvoke/astream에서는 afunc가 실행된다.
+    afunc가 없는 노드는 스레드 전환 없이 이벤트 루프에서 바로 실행하므로
+    파일/DB/네트워크를 기다릴 수 있는 노드는 asyncio.to_thread 등으로 afunc를 함께 등록해야 한다.
+    """
+    if afunc is None:
+        # 일반 함수는 StateGraph가 콜백 없이(trace=False) 감싸고, 비동기 실행에서도 스레드 없이 바로 호출함
+        workflow.add_node(name, _instrument_node(name, func))
+        return
+    
+    workflow.add_node(name, _DualNode(name, _instrument_node(name, func), _instrument_async_node(name, afunc)))
+
+
+def create_graph(checkpointer=None):
+    """
+    동적 분야 학습 챗봇 그래프 생성
+    
+    Args:
+        checkpointer: 세션 체크포인터 (None이면 턴마다 독립 실행)
+    """
     
     # StateGraph 초기화
     workflow = StateGraph(GraphState)
     
     # 노드 추가 (NEW: 분야 감지 및 동적 지식 생성)
-    workflow.add_node("domain_detect", domain_detect_node)
-    workflow.add_node("dynamic_knowledge", generate_domain_knowledge_node)
-    workflow.add_node("domain_bootstrap", domain_bootstrap_node)
-    workflow.add_node("user_signals", user_signals_node)
-    workflow.add_node("coldstart_probe", coldstart_probe_node)
-    workflow.add_node("infer_level", infer_level_node)
-    workflow.add_node("adaptive_diagnostic", adaptive_diagnostic_node)
-    workflow.add_node("intent_detect", intent_detect_node)
-    workflow.add_node("taxonomy_map", taxonomy_map_node)
-    workflow.add_node("plan_answer", plan_answer_node)
-    workflow.add_node("tool_advisors", tool_advisors_node)
-    workflow.add_node("gap_mining", gap_mining_node)
-    workflow.add_node("compose_answer", compose_answer_node)
-    workflow.add_node("quality_gate", quality_gate_node)
-    workflow.add_node("memory_write", memory_write_node)
-    workflow.add_node("deliver", deliver_node)
+    _add_node(workflow, "domain_detect", domain_detect_node)
+    _add_node(workflow, "dynamic_knowledge", generate_domain_knowledge_node, agenerate_domain_knowledge_node)
+    _add_node(workflow, "domain_bootstrap", domain_bootstrap_node)
+    _add_node(workflow, "user_signals", user_signals_node)
+    _add_node(workflow, "coldstart_probe", coldstart_probe_node)
+    _add_node(workflow, "infer_level", infer_level_node)
+    _add_node(workflow, "adaptive_diagnostic", adaptive_diagnostic_node)
+    _add_node(workflow, "intent_detect", intent_detect_node, aintent_detect_node)
+    _add_node(workflow, "taxonomy_map", taxonomy_map_node)
+    _add_node(workflow, "plan_answer", plan_answer_node)
+    _add_node(workflow, "tool_advisors", tool_advisors_node)
+    _add_node(workflow, "gap_mining", gap_mining_node)
+    _add_node(workflow, "compose_answer", compose_answer_node)
+    _add_node(workflow, "quality_gate", quality_gate_node)
+    _add_node(workflow, "memory_write", memory_write_node, amemory_write_node)
+    _add_node(workflow, "deliver", deliver_node)
     
     # 시작점 설정 (NEW: 분야 감지부터 시작)
     workflow.set_entry_point("domain_detect")
@@ -90,10 +216,11 @@ def create_graph():
     # 3. UserSignals → ColdstartProbe or InferLevel (조건부)
     workflow.add_conditional_edges(
         "user_signals",
-        should_coldstart,
+        _instrument_branch(should_coldstart),
         {
             "coldstart_probe": "coldstart_probe",
-            "infer_level": "infer_level"
+            "infer_level": "infer_level",
+            "intent_detect": "intent_detect"
         }
     )
     
@@ -103,7 +230,7 @@ def create_graph():
     # 5. InferLevel → AdaptiveDiagnostic or IntentDetect (조건부)
     workflow.add_conditional_edges(
         "infer_level",
-        should_diagnostic,
+        _instrument_branch(should_diagnostic),
         {
             "adaptive_diagnostic": "adaptive_diagnostic",
             "intent_detect": "intent_detect"
@@ -122,7 +249,7 @@ def create_graph():
     # 9. PlanAnswer → ToolAdvisors or GapMining (조건부)
     workflow.add_conditional_edges(
         "plan_answer",
-        should_use_tool_advisors,
+        _instrument_branch(should_use_tool_advisors),
         {
             "tool_advisors": "tool_advisors",
             "gap_mining": "gap_mining"
@@ -148,76 +275,408 @@ def create_graph():
     workflow.add_edge("deliver", END)
     
     # 그래프 컴파일
-    app = workflow.compile()
+    app = workflow.compile(checkpointer=checkpointer)
     
     return app
 
 
+def create_session_graph():
+    """멀티턴 세션 그래프 (thread_id별로 이전 턴의 상태를 이어받음)"""
+    return create_graph(checkpointer=create_session_saver())
+
+
+# ============ 컴파일된 그래프 레지스트리 ============
+
+# 프로세스 전역 레지스트리: 그래프 이름 → 빌더 / 컴파일 결과
+# 컴파일된 그래프는 상태를 갖지 않으므로 여러 요청이 동시에 공유해도 안전하다
+_GRAPH_BUILDERS: Dict[str, Callable[[], object]] = {
+    "default": create_graph,
+    "session": create_session_graph,
+}
+_COMPILED_GRAPHS: Dict[str, object] = {}
+_GRAPH_LOCK = threading.Lock()
+
+
+def register_graph(name: str, builder: Callable[[], object]) -> None:
+    """그래프 빌더 등록 (같은 이름이면 교체하고 기존 컴파일 결과는 폐기)"""
+    with _GRAPH_LOCK:
+        _GRAPH_BUILDERS[name] = builder
+        _COMPILED_GRAPHS.pop(name, None)
+
+
+def get_graph(name: str = "default"):
+    """
+    컴파일된 그래프 반환 (최초 호출 시 한 번만 빌드)
+    
+    Args:
+        name: 레지스트리에 등록된 그래프 이름
+        
+    Returns:
+        컴파일된 LangGraph 앱
+    """
+    app = _COMPILED_GRAPHS.get(name)
+    if app is not None:
+        return app
+    
+    with _GRAPH_LOCK:
+        # 다른 스레드가 먼저 빌드했을 수 있으므로 락 안에서 다시 확인
+        app = _COMPILED_GRAPHS.get(name)
+        if app is None:
+            app = _GRAPH_BUILDERS[name]()
+            _COMPILED_GRAPHS[name] = app
+    return app
+
+
+def rebuild_graph(name: Optional[str] = None) -> None:
+    """
+    노드 구성이 바뀌었을 때 그래프 재빌드
+    
+    Args:
+        name: 재빌드할 그래프 이름 (None이면 등록된 전체)
+    """
+    with _GRAPH_LOCK:
+        names = [name] if name else list(_GRAPH_BUILDERS)
+        for graph_name in names:
+            _COMPILED_GRAPHS[graph_name] = _GRAPH_BUILDERS[graph_name]()
+
+
+def warmup_graph() -> None:
+    """서버 시작 시 등록된 그래프를 미리 컴파일"""
+    for graph_name in list(_GRAPH_BUILDERS):
+        get_graph(graph_name)
+
+
+def compiled_graphs() -> Dict[str, bool]:
+    """등록된 그래프별 컴파일 여부 (readiness 확인용)"""
+    with _GRAPH_LOCK:
+        return {graph_name: graph_name in _COMPILED_GRAPHS for graph_name in _GRAPH_BUILDERS}
+
+
 # ============ 실행 함수 ============
 
-def run_rag_education_bot(user_message: str) -> str:
+# 스트리밍 실행 모드: 노드별 갱신 + 노드 안에서 get_stream_writer()로 보낸 부분 출력
+STREAM_MODES = ["updates", "custom"]
+
+
+def _log_banner(mode: str = "") -> None:
+    """실행 시작 배너 (INFO 레벨)"""
+    logger.info("\n" + "=" * 50)
+    logger.info("🤖 동적 분야 학습 챗봇 시작%s", f" {mode}" if mode else "")
+    logger.info("=" * 50 + "\n")
+
+
+def _prepare_run(user_message: str, user_id: str, session_id: Optional[str]):
+    """
+    실행할 그래프, 입력 상태, 실행 옵션 준비
+    
+    session_id가 있으면 세션 그래프에서 thread_id로 이어서 실행한다.
+    세션의 첫 턴은 전체 초기 상태, 이후 턴은 턴 단위 필드만 넘긴다.
+    세션은 실행이 끝날 때까지 LRU 제거에서 제외되므로 실행 후 _finish_run을 불러야 한다.
+    """
+    if session_id is None:
+        return get_graph(), create_initial_state(user_message, user_id), {}
+    
+    app = get_graph("session")
+    try:
+        if app.checkpointer.pin(session_id):
+            graph_input = create_turn_input(user_message)
+        else:
+            graph_input = create_initial_state(user_message, user_id)
+    except BaseException:
+        app.checkpointer.unpin(session_id)
+        raise
+    
+    # 중간 체크포인트 없이 턴이 끝날 때만 저장
+    run_options = {"config": {"configurable": {"thread_id": session_id}}, "durability": "exit"}
+    return app, graph_input, run_options
+
+
+async def _aprepare_run(user_message: str, user_id: str, session_id: Optional[str]):
+    """
+    _prepare_run을 스레드에서 실행 (저장된 사용자 메모리 로드(SQLite)가 이벤트 루프를 막지 않게)
+    
+    기다리는 중에 호출한 쪽이 취소돼도 스레드는 멈추지 않고 세션을 고정하므로,
+    취소된 준비 결과는 스레드 쪽이든 취소한 쪽이든 나중에 끝나는 쪽에서 고정을 푼다.
+    """
+    lock = threading.Lock()
+    status = {"prepared": False, "abandoned": False}
+    
+    def prepare():
+        prepared = _prepare_run(user_message, user_id, session_id)
+        with lock:
+            status["prepared"] = True
+            abandoned = status["abandoned"]
+        if abandoned:
+            _finish_run(session_id)
+        return prepared
+    
+    try:
+        return await asyncio.to_thread(prepare)
+    except asyncio.CancelledError:
+        with lock:
+            status["abandoned"] = True
+            prepared = status["prepared"]
+        if prepared:
+            _finish_run(session_id)
+        raise
+
+
+def _finish_run(session_id: Optional[str]) -> None:
+    """_prepare_run에서 고정한 세션 해제"""
+    if session_id is not None:
+        get_graph("session").checkpointer.unpin(session_id)
+
+
+def _response_cache_context(user_message: str, user_id: str, session_id: Optional[str]) -> Optional[tuple]:
+    """
+    응답 캐시 컨텍스트 (캐시 대상이 아니면 None)
+    
+    익명 사용자의 단발 요청과 세션의 첫 턴만 캐시한다. 이어지는 세션 턴이나 저장된 사용자는
+    이전 턴/숙련도가 응답을 바꾸고, 그래프를 건너뛰면 메모리 기록도 빠지기 때문.
+    컨텍스트는 그래프 노드와 같은 함수로 메시지에서 계산한 (분야, 선호, 제약, 문서 색인 버전).
+    """
+    if user_id != DEFAULT_USER_ID or not get_response_cache().enabled:
+        return None
+    if session_id is not None and get_graph("session").checkpointer.has_session(session_id):
+        return None
+    message = user_message.lower()
+    domain, _ = detect_domain(message)
+    prefs, constraints = probe_profile(message)
+    return domain, tuple(sorted(prefs.items())), tuple(sorted(constraints)), index_version()
+
+
+def _cached_response(user_message: str, context: Optional[tuple]) -> Optional[str]:
+    """캐시된 응답 (이번 실행에서 분야 팩을 새로 만들거나 불러와야 하면 조회하지 않음)"""
+    if context is None:
+        return None
+    fingerprint = current_pack_fingerprint(context[0])
+    if fingerprint is None:
+        return None
+    response = get_response_cache().get(user_message, context, fingerprint)
+    if response is not None:
+        logger.info("⚡ 응답 캐시 히트 - 그래프 실행 생략 (%s)", context[0])
+        # 그래프를 건너뛰어도 분야 수요로 집계 (domain_detect 노드 대신)
+        get_domain_usage().record(context[0])
+    return response
+
+
+def _seed_session(user_message: str, session_id: Optional[str], response: str) -> None:
+    """
+    캐시 히트로 끝난 세션 첫 턴을 체크포인트로 남김
+    
+    다음 턴이 턴 단위 입력만으로 이어지도록 초기 상태에 이번 질문/응답을 기록한다.
+    그 사이 다른 턴이 세션을 만들었으면 그대로 둔다.
+    """
+    if session_id is None:
+        return
+    app = get_graph("session")
+    try:
+        if app.checkpointer.pin(session_id):
+            return
+        values = dict(
+            create_initial_state(user_message),
+            final_response=response,
+            current_step="deliver",
+            chat_history=[
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": response},
+            ],
+        )
+        app.update_state({"configurable": {"thread_id": session_id}}, values, as_node="deliver")
+    finally:
+        app.checkpointer.unpin(session_id)
+
+
+def _store_response(user_message: str, context: Optional[tuple], result: Dict[str, Any]) -> None:
+    """실행 결과 응답을 캐시 (캐시에 남지 않는 팩으로 만든 응답은 제외)"""
+    if context is None or not result.get("final_response"):
+        return
+    fingerprint = current_pack_fingerprint(context[0])
+    if fingerprint is not None:
+        get_response_cache().put(user_message, context, fingerprint, result["final_response"])
+
+
+def run_rag_education_bot(
+    user_message: str,
+    user_id: str = DEFAULT_USER_ID,
+    session_id: Optional[str] = None,
+    raise_errors: bool = False
+) -> str:
     """
     동적 분야 학습 챗봇 실행
     
     Args:
         user_message: 사용자 입력 메시지
+        user_id: 메모리를 불러오고 저장할 사용자 ID
+        session_id: 대화 세션 ID (주면 이전 턴의 프로필/DomainPack을 이어받음)
+        raise_errors: 그래프 실행 오류를 오류 문구 대신 예외로 전달 (API/일괄 처리용)
         
     Returns:
         최종 응답 문자열
     """
-    # 그래프 생성
-    app = create_graph()
+    # 비슷한 질문의 캐시된 응답이 있으면 그래프 실행 생략
+    cache_context = _response_cache_context(user_message, user_id, session_id)
+    cached = _cached_response(user_message, cache_context)
+    if cached is not None:
+        _seed_session(user_message, session_id, cached)
+        return cached
     
-    # 초기 상태 생성
-    initial_state = create_initial_state(user_message)
+    # 컴파일된 그래프 재사용 + 초기 상태 생성
+    app, initial_state, run_options = _prepare_run(user_message, user_id, session_id)
     
     # 그래프 실행
-    print("\n" + "=" * 50)
-    print("🤖 동적 분야 학습 챗봇 시작")
-    print("=" * 50 + "\n")
+    _log_banner()
     
     try:
         # invoke로 전체 그래프 실행
-        result = app.invoke(initial_state)
+        result = app.invoke(initial_state, **run_options)
+        _store_response(user_message, cache_context, result)
         
         # 최종 응답 반환
         return result.get("final_response", "응답을 생성할 수 없습니다.")
         
     except Exception as e:
-        print(f"❌ 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ 오류 발생: %s", e)
+        if raise_errors:
+            raise
         return f"오류가 발생했습니다: {str(e)}"
+    finally:
+        _finish_run(session_id)
 
 
-def run_rag_education_bot_stream(user_message: str):
+def run_rag_education_bot_stream(
+    user_message: str,
+    user_id: str = DEFAULT_USER_ID,
+    session_id: Optional[str] = None,
+    raise_errors: bool = False
+):
     """
     동적 분야 학습 챗봇 스트리밍 실행 (각 노드의 출력을 실시간으로 확인)
     
     Args:
         user_message: 사용자 입력 메시지
+        user_id: 메모리를 불러오고 저장할 사용자 ID
+        session_id: 대화 세션 ID (주면 이전 턴의 프로필/DomainPack을 이어받음)
+        raise_errors: 그래프 실행 오류를 오류 문구 대신 예외로 전달 (API/일괄 처리용)
         
     Yields:
-        각 노드의 출력
+        각 노드의 출력 (캐시 히트면 deliver 출력 하나)
+        compose_answer는 완성된 출력 전에 개요/섹션마다 {"compose_answer": {"partial": ...}}를 먼저 낸다.
     """
-    # 그래프 생성
-    app = create_graph()
+    cache_context = _response_cache_context(user_message, user_id, session_id)
+    cached = _cached_response(user_message, cache_context)
+    if cached is not None:
+        _seed_session(user_message, session_id, cached)
+        yield {"deliver": {"final_response": cached}}
+        return
     
-    # 초기 상태 생성
-    initial_state = create_initial_state(user_message)
+    # 컴파일된 그래프 재사용 + 초기 상태 생성
+    app, initial_state, run_options = _prepare_run(user_message, user_id, session_id)
     
-    print("\n" + "=" * 50)
-    print("🤖 동적 분야 학습 챗봇 시작 (스트리밍 모드)")
-    print("=" * 50 + "\n")
+    _log_banner("(스트리밍 모드)")
     
     try:
-        # stream으로 각 노드의 출력 확인
-        for output in app.stream(initial_state):
+        # stream으로 각 노드의 출력 확인 (custom: compose_answer의 섹션별 부분 출력)
+        for mode, output in app.stream(initial_state, stream_mode=STREAM_MODES, **run_options):
+            if mode == "updates" and "deliver" in output:
+                _store_response(user_message, cache_context, output["deliver"])
             yield output
             
     except Exception as e:
-        print(f"❌ 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ 오류 발생: %s", e)
+        if raise_errors:
+            raise
         yield {"error": str(e)}
+    finally:
+        _finish_run(session_id)
+
 
+
+async def arun_rag_education_bot(
+    user_message: str,
+    user_id: str = DEFAULT_USER_ID,
+    session_id: Optional[str] = None,
+    raise_errors: bool = False
+) -> str:
+    """
+    동적 분야 학습 챗봇 비동기 실행 (ainvoke)
+    
+    LLM 호출을 기다리는 동안 이벤트 루프를 양보하므로
+    하나의 프로세스가 여러 대화 세션을 스레드 없이 동시에 처리할 수 있다.
+    
+    Args:
+        user_message: 사용자 입력 메시지
+        user_id: 메모리를 불러오고 저장할 사용자 ID
+        session_id: 대화 세션 ID (주면 이전 턴의 프로필/DomainPack을 이어받음)
+        raise_errors: 그래프 실행 오류를 오류 문구 대신 예외로 전달 (API/일괄 처리용)
+        
+    Returns:
+        최종 응답 문자열
+    """
+    cache_context = _response_cache_context(user_message, user_id, session_id)
+    cached = _cached_response(user_message, cache_context)
+    if cached is not None:
+        _seed_session(user_message, session_id, cached)
+        return cached
+    
+    app, initial_state, run_options = await _aprepare_run(user_message, user_id, session_id)
+    
+    _log_banner("(비동기 모드)")
+    
+    try:
+        result = await app.ainvoke(initial_state, **run_options)
+        _store_response(user_message, cache_context, result)
+        return result.get("final_response", "응답을 생성할 수 없습니다.")
+        
+    except Exception as e:
+        logger.exception("❌ 오류 발생: %s", e)
+        if raise_errors:
+            raise
+        return f"오류가 발생했습니다: {str(e)}"
+    finally:
+        _finish_run(session_id)
+
+
+async def arun_rag_education_bot_stream(
+    user_message: str,
+    user_id: str = DEFAULT_USER_ID,
+    session_id: Optional[str] = None,
+    raise_errors: bool = False
+):
+    """
+    동적 분야 학습 챗봇 비동기 스트리밍 실행 (astream)
+    
+    Args:
+        user_message: 사용자 입력 메시지
+        user_id: 메모리를 불러오고 저장할 사용자 ID
+        session_id: 대화 세션 ID (주면 이전 턴의 프로필/DomainPack을 이어받음)
+        raise_errors: 그래프 실행 오류를 오류 문구 대신 예외로 전달 (API/일괄 처리용)
+        
+    Yields:
+        각 노드의 출력 (캐시 히트면 deliver 출력 하나)
+        compose_answer는 완성된 출력 전에 개요/섹션마다 {"compose_answer": {"partial": ...}}를 먼저 낸다.
+    """
+    cache_context = _response_cache_context(user_message, user_id, session_id)
+    cached = _cached_response(user_message, cache_context)
+    if cached is not None:
+        _seed_session(user_message, session_id, cached)
+        yield {"deliver": {"final_response": cached}}
+        return
+    
+    app, initial_state, run_options = await _aprepare_run(user_message, user_id, session_id)
+    
+    _log_banner("(비동기 스트리밍 모드)")
+    
+    try:
+        async for mode, output in app.astream(initial_state, stream_mode=STREAM_MODES, **run_options):
+            if mode == "updates" and "deliver" in output:
+                _store_response(user_message, cache_context, output["deliver"])
+            yield output
+            
+    except Exception as e:
+        logger.exception("❌ 오류 발생: %s", e)
+        if raise_errors:
+            raise
+        yield {"error": str(e)}
+    finally:
+        _finish_run(session_id)
@@ -2,6 +2,9 @@
 from typing import Dict, Any, List
 import random
 from ..state import GraphState
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 def adaptive_diagnostic_node(state: GraphState) -> Dict[str, Any]:
@@ -14,7 +17,7 @@ def adaptive_diagnostic_node(state: GraphState) -> Dict[str, Any]:
     Note: 실제 구현에서는 사용자 응답을 받아야 하지만,
     데모에서는 자동으로 처리
     """
-    print("📝 [AdaptiveDiagnostic] 진단 퀴즈 생성 중...")
+    logger.info("📝 [AdaptiveDiagnostic] 진단 퀴즈 생성 중...")
     
     mastery = state["mastery"]
     domain_pack = state["domain_pack"]
@@ -49,17 +52,20 @@ def adaptive_diagnostic_node(state: GraphState) -> Dict[str, Any]:
             "concept": q["concept"],
             "correct": is_correct
         })
-        
-        # mastery 업데이트
-        if q["concept"] in mastery.levels:
-            if is_correct:
-                mastery.levels[q["concept"]] = min(1.0, mastery.levels[q["concept"]] + 0.15)
-            else:
-                mastery.levels[q["concept"]] = max(0.0, mastery.levels[q["concept"]] - 0.1)
     
-    memory.quiz_records.extend(quiz_records)
+    # mastery 업데이트 - 정답/오답 관찰을 각각 한 번의 BKT 벡터 연산으로 반영
+    if quiz_records:
+        tracer = domain_pack.index.tracer
+        tracked = [cid for cid in tracer.concept_ids if cid in mastery.levels]
+        p = tracer.from_levels(mastery.levels, 0.0)
+        p = tracer.observe(p, [r["concept"] for r in quiz_records if r["correct"]], "quiz", correct=True)
+        p = tracer.observe(p, [r["concept"] for r in quiz_records if not r["correct"]], "quiz", correct=False)
+        updated = tracer.to_levels(p)
+        mastery.levels.update({cid: updated[cid] for cid in tracked})
+    
+    memory.record_quiz(quiz_records)
     
-    print(f"✅ [AdaptiveDiagnostic] 진단 완료: {len(selected_questions)}개 문항")
+    logger.info("✅ [AdaptiveDiagnostic] 진단 완료: %s개 문항", len(selected_questions))
     
     return {
         "mastery": mastery,
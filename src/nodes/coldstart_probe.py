@@ -1,70 +1,73 @@
 """3. ColdstartProbe 노드 - 초기 진단 및 선호 수집"""
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from ..state import GraphState
+from ..utils.keyword_matcher import scan_message
+from ..utils.log import get_logger
 
+logger = get_logger(__name__)
 
-def coldstart_probe_node(state: GraphState) -> Dict[str, Any]:
+
+def probe_profile(user_message: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
-    최소 질문으로 제약/선호/경험 수집
+    메시지(소문자)에서 추론한 (prefs, constraints)
     
-    입력: 없음 (내부 질문)
-    출력: user.prefs, user.constraints 갱신
+    그래프 밖에서도 같은 결과가 필요할 때(응답 캐시 키 등) 쓰도록 노드와 분리
     """
-    print("❓ [ColdstartProbe] 초기 진단 시작...")
-    
-    # 실제로는 사용자에게 질문을 하고 응답을 받아야 하지만,
-    # 데모에서는 user_message에서 추론
-    user_message = state["user_message"].lower()
-    user = state["user"]
+    hits = scan_message(user_message)
     
     # 경험 수준 추론
-    beginner_keywords = ["처음", "시작", "입문", "초보", "모르", "배우"]
-    intermediate_keywords = ["경험", "해봤", "알고", "구현"]
-    advanced_keywords = ["최적화", "프로덕션", "배포", "성능", "고급"]
-    
     experience_level = 1  # 기본값
-    if any(kw in user_message for kw in advanced_keywords):
+    if hits.has("experience_level", "advanced"):
         experience_level = 3
-    elif any(kw in user_message for kw in intermediate_keywords):
+    elif hits.has("experience_level", "intermediate"):
         experience_level = 2
-    elif any(kw in user_message for kw in beginner_keywords):
+    elif hits.has("experience_level", "beginner"):
         experience_level = 0
     
     # 언어 선호 추론
     code_lang = "python"  # 기본값
-    if "golang" in user_message or "go" in user_message:
+    if hits.has("code_lang", "go"):
         code_lang = "go"
     
-    # 배포 환경 추론
-    deploy_env = "local"
-    if "k8s" in user_message or "kubernetes" in user_message:
-        deploy_env = "kubernetes"
-    elif "서버리스" in user_message or "serverless" in user_message:
-        deploy_env = "serverless"
-    elif "프로덕션" in user_message or "production" in user_message:
-        deploy_env = "production"
+    # 배포 환경 추론 (테이블 정의 순서가 우선순위)
+    deploy_env = next(iter(hits.labels("deploy_env")), "local")
     
     # 제약사항 추론
-    constraints = {}
-    if "빠른" in user_message or "지연" in user_message or "latency" in user_message:
-        constraints["latency_priority"] = "high"
-    if "비용" in user_message or "cost" in user_message or "저렴" in user_message:
-        constraints["cost_priority"] = "high"
-    if "정확" in user_message or "품질" in user_message or "accuracy" in user_message:
-        constraints["quality_priority"] = "high"
+    constraints = {
+        constraint: "high"
+        for constraint in hits.labels("constraint")
+    }
     
-    # 사용자 정보 업데이트
-    user.prefs = {
+    prefs = {
         "experience_level": experience_level,
         "code_lang": code_lang,
         "deploy_env": deploy_env
     }
-    user.constraints = constraints
+    return prefs, constraints
+
+
+def coldstart_probe_node(state: GraphState) -> Dict[str, Any]:
+    """
+    최소 질문으로 제약/선호/경험 수집
+    
+    입력: 없음 (내부 질문)
+    출력: user.prefs, user.constraints 갱신
+    """
+    logger.info("❓ [ColdstartProbe] 초기 진단 시작...")
     
-    print(f"✅ [ColdstartProbe] 프로필 설정: 경험={experience_level}, 언어={code_lang}, 환경={deploy_env}")
+    # 실제로는 사용자에게 질문을 하고 응답을 받아야 하지만,
+    # 데모에서는 user_message에서 추론
+    user = state["user"]
+    
+    # 사용자 정보 업데이트
+    user.prefs, user.constraints = probe_profile(state["user_message"].lower())
+    
+    logger.info(
+        "✅ [ColdstartProbe] 프로필 설정: 경험=%s, 언어=%s, 환경=%s",
+        user.prefs["experience_level"], user.prefs["code_lang"], user.prefs["deploy_env"]
+    )
     
     return {
         "user": user,
         "current_step": "coldstart_probe"
     }
-
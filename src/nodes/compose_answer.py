@@ -1,6 +1,36 @@
 """11. ComposeAnswer 노드 - 최종 응답 구성"""
-from typing import Dict, Any
-from ..state import GraphState, Answer, Evaluation
+from typing import Dict, Any, List
+import os
+from langgraph.config import get_stream_writer
+from ..state import GraphState, Answer, DomainPack, Evaluation, Gaps, Task
+from ..utils.bm25 import Passage
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# 질문으로 검색해 답변에 붙일 근거 문단 수
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "3"))
+# 참고 자료 섹션의 최대 항목 수 (문서 청크 + 질문 검색 결과 + 학습 갭 근거)
+MAX_REFERENCES = 5
+
+
+def collect_references(domain_pack: DomainPack, task: Task, gaps: Gaps) -> List[Passage]:
+    """검색 색인의 문서 청크, 질문 검색 결과, 상위 학습 갭의 근거 문단 (중복 제거, 앞쪽 우선)"""
+    references = [
+        Passage(f"doc:{doc['chunk_id']}", "document", doc["title"] or doc["doc_id"], doc["snippet"])
+        for doc in task.context_docs_meta
+    ]
+    if not domain_pack:
+        return references[:MAX_REFERENCES]
+    index = domain_pack.index
+    references += [passage for passage, _ in index.search(task.question, RETRIEVAL_TOP_K)]
+    for term in gaps.unknown_terms_ranked[:5]:
+        for passage_id in term.get("passages", []):
+            passage = index.passage(passage_id)
+            if passage is not None:
+                references.append(passage)
+    unique = list({passage.id: passage for passage in references}.values())
+    return unique[:MAX_REFERENCES]
 
 
 def compose_answer_node(state: GraphState) -> Dict[str, Any]:
@@ -9,8 +39,11 @@ def compose_answer_node(state: GraphState) -> Dict[str, Any]:
     
     입력: plan, tool_advice, gaps
     출력: answer (구조화된 섹션), eval (자신감/리스크/다음 행동)
+    
+    stream_mode에 "custom"을 넣어 실행하면 개요와 섹션을 만드는 대로
+    {"compose_answer": {"partial": "outline" | "block", ...}} 부분 출력으로 먼저 내보낸다.
     """
-    print("✍️ [ComposeAnswer] 최종 답변 구성 중...")
+    logger.info("✍️ [ComposeAnswer] 최종 답변 구성 중...")
     
     user = state["user"]
     intent = state["intent"]
@@ -29,6 +62,25 @@ def compose_answer_node(state: GraphState) -> Dict[str, Any]:
     else:
         constraints_summary += "없음"
     
+    # 답변 개요 (섹션보다 먼저 스트리밍)
+    outline = f"""
+# {intent.type.upper()} 답변
+
+**질문:** {task.question}
+
+**경험 수준:** {experience_level} ({['초보', '입문', '중급', '고급'][experience_level]})
+{constraints_summary}
+"""
+    emit = get_stream_writer()
+    emit({"compose_answer": {"partial": "outline", "content": outline}})
+    
+    content_blocks = []
+    
+    def add_block(title: str, content: str) -> None:
+        block = {"title": title, "content": content}
+        content_blocks.append(block)
+        emit({"compose_answer": {"partial": "block", **block}})
+    
     # (2) 권장 아키텍처
     architecture_section = "## 권장 아키텍처\n\n"
     if plan.options:
@@ -39,11 +91,13 @@ def compose_answer_node(state: GraphState) -> Dict[str, Any]:
             architecture_section += f"- {comp_name}: {comp_value}\n"
         architecture_section += "\n**장점:** " + ", ".join(recommended_option['pros']) + "\n"
         architecture_section += "**단점:** " + ", ".join(recommended_option['cons']) + "\n"
+    add_block("권장 아키텍처", architecture_section)
     
     # (3) 단계별 체크리스트
     checklist_section = "\n## 단계별 체크리스트\n\n"
     for step in plan.steps:
         checklist_section += f"- [ ] {step}\n"
+    add_block("체크리스트", checklist_section)
     
     # (4) 도구 추천
     tools_section = "\n## 추천 도구 및 설정\n\n"
@@ -57,6 +111,7 @@ def compose_answer_node(state: GraphState) -> Dict[str, Any]:
             if 'when_to_use' in tool:
                 tools_section += f"- **사용 시기:** {tool['when_to_use']}\n"
             tools_section += "\n"
+    add_block("도구 추천", tools_section)
     
     # (5) 트레이드오프
     tradeoffs_section = "\n## 주요 트레이드오프\n\n"
@@ -65,6 +120,7 @@ def compose_answer_node(state: GraphState) -> Dict[str, Any]:
             tradeoffs_section += f"**{tradeoff['dimension']}**\n"
             tradeoffs_section += f"- {tradeoff['description']}\n"
             tradeoffs_section += f"- 권장: {tradeoff['recommendation']}\n\n"
+    add_block("트레이드오프", tradeoffs_section)
     
     # (6) 모르는 용어 Top-5
     gaps_section = "\n## 📚 알아두면 좋은 개념\n\n"
@@ -80,6 +136,7 @@ def compose_answer_node(state: GraphState) -> Dict[str, Any]:
         gaps_section += "\n**선수지식 추천:**\n"
         for prereq in gaps.prereq_recos:
             gaps_section += f"- {prereq}\n"
+    add_block("학습 갭", gaps_section)
     
     # (7) 다음 액션
     next_actions_section = "\n## 🎯 다음 단계\n\n"
@@ -106,25 +163,15 @@ def compose_answer_node(state: GraphState) -> Dict[str, Any]:
     
     for action in next_actions:
         next_actions_section += f"1. {action}\n"
+    add_block("다음 액션", next_actions_section)
     
-    # 전체 답변 조합
-    outline = f"""
-# {intent.type.upper()} 답변
-
-**질문:** {task.question}
-
-**경험 수준:** {experience_level} ({['초보', '입문', '중급', '고급'][experience_level]})
-{constraints_summary}
-"""
-    
-    content_blocks = [
-        {"title": "권장 아키텍처", "content": architecture_section},
-        {"title": "체크리스트", "content": checklist_section},
-        {"title": "도구 추천", "content": tools_section},
-        {"title": "트레이드오프", "content": tradeoffs_section},
-        {"title": "학습 갭", "content": gaps_section},
-        {"title": "다음 액션", "content": next_actions_section}
-    ]
+    # (8) 참고 자료 - 검색 색인 문서와 DomainPack에서 찾은 근거 문단
+    references = collect_references(state["domain_pack"], task, gaps)
+    references_section = "\n## 📖 참고 자료\n\n"
+    for i, passage in enumerate(references, 1):
+        references_section += f"{i}. **{passage.title}** - {passage.text}\n"
+    if references:
+        add_block("참고 자료", references_section)
     
     # 전체 텍스트 생성
     full_response = outline
@@ -134,8 +181,8 @@ def compose_answer_node(state: GraphState) -> Dict[str, Any]:
     answer = Answer(
         outline=outline,
         content_blocks=content_blocks,
-        snippets=[],
-        citations=[]
+        snippets=[passage.text for passage in references],
+        citations=[passage.id for passage in references]
     )
     
     # 평가 정보
@@ -153,7 +200,7 @@ def compose_answer_node(state: GraphState) -> Dict[str, Any]:
     if len(gaps.unknown_terms_ranked) > 5:
         eval_obj.risks.append("많은 개념 갭 존재 - 단계적 학습 필요")
     
-    print(f"✅ [ComposeAnswer] 답변 생성 완료: {len(content_blocks)}개 섹션")
+    logger.info("✅ [ComposeAnswer] 답변 생성 완료: %s개 섹션", len(content_blocks))
     
     return {
         "answer": answer,
@@ -1,6 +1,9 @@
 """14. Deliver 노드 - 응답 출력"""
 from typing import Dict, Any
 from ..state import GraphState
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 def deliver_node(state: GraphState) -> Dict[str, Any]:
@@ -10,7 +13,7 @@ def deliver_node(state: GraphState) -> Dict[str, Any]:
     입력: answer, eval
     출력: 메시지 (섹션/체크리스트/다음 액션)
     """
-    print("📤 [Deliver] 최종 응답 전달 중...")
+    logger.info("📤 [Deliver] 최종 응답 전달 중...")
     
     final_response = state["final_response"]
     eval_obj = state["eval"]
@@ -40,8 +43,8 @@ def deliver_node(state: GraphState) -> Dict[str, Any]:
         {"role": "assistant", "content": complete_response}
     ]
     
-    print("✅ [Deliver] 전달 완료!")
-    print("=" * 50)
+    logger.info("✅ [Deliver] 전달 완료!")
+    logger.info("=" * 50)
     
     return {
         "final_response": complete_response,
@@ -1,6 +1,10 @@
 """1. DomainBootstrap 노드 - 전문가 부팅 및 도메인 자료 로딩 (동적)"""
 from typing import Dict, Any
+import logging
 from ..state import GraphState, DomainPack
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 def domain_bootstrap_node(state: GraphState) -> Dict[str, Any]:
@@ -10,7 +14,7 @@ def domain_bootstrap_node(state: GraphState) -> Dict[str, Any]:
     입력: detected_domain, domain_pack (이미 생성됨)
     출력: 전문가 페르소나 활성화
     """
-    print("🚀 [DomainBootstrap] 전문가 부팅 중...")
+    logger.info("🚀 [DomainBootstrap] 전문가 부팅 중...")
     
     detected_domain = state.get("detected_domain", "General")
     domain_pack_data = state.get("domain_pack")
@@ -18,10 +22,10 @@ def domain_bootstrap_node(state: GraphState) -> Dict[str, Any]:
     if domain_pack_data:
         # 이미 동적으로 생성된 domain_pack 사용
         domain_pack = domain_pack_data
-        print(f"✅ [DomainBootstrap] {detected_domain} 전문가 부팅 완료")
+        logger.info("✅ [DomainBootstrap] %s 전문가 부팅 완료", detected_domain)
     else:
         # fallback: 기본 도메인 팩 생성
-        print(f"⚠️ [DomainBootstrap] domain_pack이 없어 기본 팩 생성")
+        logger.warning("⚠️ [DomainBootstrap] domain_pack이 없어 기본 팩 생성")
         from ..utils.domain_data import get_domain_pack
         domain_data = get_domain_pack()
         domain_pack = DomainPack(
@@ -32,8 +36,9 @@ def domain_bootstrap_node(state: GraphState) -> Dict[str, Any]:
             version=domain_data["version"]
         )
     
-    # 분야별 전문가 페르소나 메시지
-    expert_persona = f"""
+    # 분야별 전문가 페르소나 메시지 (디버그 로그에서만 사용하므로 필요할 때만 구성)
+    if logger.isEnabledFor(logging.DEBUG):
+        expert_persona = f"""
 당신은 이제 {detected_domain} 분야의 최고 전문가입니다.
 
 역할:
@@ -49,8 +54,7 @@ def domain_bootstrap_node(state: GraphState) -> Dict[str, Any]:
 
 목표: 사용자가 {detected_domain}를 효과적으로 학습하고 실전에 적용할 수 있도록 돕기
 """
-    
-    print(expert_persona)
+        logger.debug(expert_persona)
     
     eval_obj = state["eval"]
     eval_obj.confidence = 0.9
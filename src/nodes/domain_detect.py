@@ -1,76 +1,29 @@
 """0. DomainDetect 노드 - 사용자 질문에서 분야 자동 감지"""
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+from ..utils.domain_embedding import SEMANTIC_DOMAIN_THRESHOLD, get_domain_embeddings
+from ..utils.domain_usage import get_domain_usage
+from ..utils.keyword_matcher import scan_message
+from ..utils.keyword_patterns import DOMAIN_PATTERNS
+from ..utils.log import get_logger
 
+logger = get_logger(__name__)
 
-def domain_detect_node(state: Dict[str, Any]) -> Dict[str, Any]:
+
+def detect_domain(user_message: str) -> Tuple[str, float]:
     """
-    사용자 질문을 분석하여 어떤 분야인지 자동 감지
+    메시지(소문자)의 분야와 신뢰도 (키워드 점수 → 의미 기반 추정 순)
     
-    입력: user_message
-    출력: detected_domain (분야명)
+    그래프 밖에서도 같은 결과가 필요할 때(응답 캐시 키 등) 쓰도록 노드와 분리
     """
-    print("🔎 [DomainDetect] 분야 감지 중...")
-    
-    user_message = state["user_message"].lower()
+    # 모든 패턴 테이블을 한 번에 스캔 (공유 Aho-Corasick 매처)
+    hits = scan_message(user_message)
     
-    # 분야별 키워드 패턴 (확장 가능)
-    domain_patterns = {
-        "RAG": [
-            "rag", "retrieval", "augmented", "generation", 
-            "벡터", "임베딩", "검색", "생성", "llm", "랭체인",
-            "pinecone", "weaviate", "chroma", "qdrant"
-        ],
-        "Machine Learning": [
-            "머신러닝", "딥러닝", "학습", "모델", "훈련", "추론",
-            "tensorflow", "pytorch", "keras", "scikit", "신경망",
-            "cnn", "rnn", "transformer", "accuracy", "loss"
-        ],
-        "Backend Development": [
-            "백엔드", "서버", "api", "rest", "graphql", "데이터베이스",
-            "django", "flask", "fastapi", "express", "spring",
-            "postgresql", "mongodb", "redis", "kafka"
-        ],
-        "Frontend Development": [
-            "프론트엔드", "웹", "react", "vue", "angular", "ui", "ux",
-            "javascript", "typescript", "css", "html", "component",
-            "next.js", "nuxt", "svelte"
-        ],
-        "DevOps": [
-            "데브옵스", "배포", "ci/cd", "docker", "kubernetes", "k8s",
-            "jenkins", "github actions", "terraform", "ansible",
-            "모니터링", "로깅", "prometheus", "grafana"
-        ],
-        "Data Science": [
-            "데이터 과학", "분석", "시각화", "통계", "pandas", "numpy",
-            "matplotlib", "seaborn", "jupyter", "분포", "상관관계",
-            "회귀", "분류", "군집"
-        ],
-        "Blockchain": [
-            "블록체인", "암호화폐", "스마트 컨트랙트", "이더리움",
-            "solidity", "web3", "nft", "defi", "dapp", "합의"
-        ],
-        "Cloud Computing": [
-            "클라우드", "aws", "azure", "gcp", "람다", "s3", "ec2",
-            "serverless", "cloud", "iaas", "paas", "saas"
-        ],
-        "Cybersecurity": [
-            "보안", "해킹", "취약점", "암호화", "인증", "방화벽",
-            "penetration", "vulnerability", "encryption", "ssl", "tls"
-        ],
-        "Mobile Development": [
-            "모바일", "앱", "android", "ios", "swift", "kotlin",
-            "react native", "flutter", "xamarin", "cross-platform"
-        ]
+    # 점수 기반 분야 감지 (라벨 정의 순서 유지 → 동점 시 먼저 정의된 분야)
+    domain_scores = {
+        domain: len(keywords)
+        for domain, keywords in hits.labels("domain").items()
     }
     
-    # 점수 기반 분야 감지
-    domain_scores = {}
-    
-    for domain, keywords in domain_patterns.items():
-        score = sum(1 for kw in keywords if kw in user_message)
-        if score > 0:
-            domain_scores[domain] = score
-    
     # 가장 높은 점수의 분야 선택
     detected_domain = "General"  # 기본값
     confidence = 0.0
@@ -78,21 +31,43 @@ def domain_detect_node(state: Dict[str, Any]) -> Dict[str, Any]:
     if domain_scores:
         detected_domain = max(domain_scores, key=domain_scores.get)
         max_score = domain_scores[detected_domain]
-        total_keywords = len(domain_patterns[detected_domain])
+        total_keywords = len(DOMAIN_PATTERNS[detected_domain])
         confidence = min(0.95, max_score / total_keywords * 2)  # 정규화
     
     # 일반 학습 키워드 체크
-    general_keywords = ["배우", "학습", "공부", "시작", "입문", "알려줘", "설명"]
-    if any(kw in user_message for kw in general_keywords) and confidence < 0.3:
+    if hits.has("general_learning") and confidence < 0.3:
         # 일반적인 질문이지만 분야가 명확하지 않음
         # 첫 명사/주요 개념을 분야로 추출 시도
         detected_domain = "General Knowledge"
     
-    print(f"✅ [DomainDetect] 감지된 분야: {detected_domain} (신뢰도: {confidence:.2f})")
+    # 키워드로 분야를 정하지 못했으면 n-gram 임베딩으로 가장 가까운 기존 분야에 연결
+    # (막연한 분야명으로 새 DomainPack을 생성하는 대신 캐시된 팩 재사용)
+    if detected_domain in ("General", "General Knowledge"):
+        match = get_domain_embeddings().nearest(user_message, SEMANTIC_DOMAIN_THRESHOLD)
+        if match is not None:
+            detected_domain, confidence = match
+            logger.info("  🧭 키워드 불일치 - 의미 기반 분야 추정: %s (%.2f)", detected_domain, confidence)
+    
+    return detected_domain, confidence
+
+
+def domain_detect_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    사용자 질문을 분석하여 어떤 분야인지 자동 감지
+    
+    입력: user_message
+    출력: detected_domain (분야명)
+    """
+    logger.info("🔎 [DomainDetect] 분야 감지 중...")
+    
+    detected_domain, confidence = detect_domain(state["user_message"].lower())
+    # 인기 분야 팩을 미리 만들어 두기 위한 요청 빈도
+    get_domain_usage().record(detected_domain)
+    
+    logger.info("✅ [DomainDetect] 감지된 분야: %s (신뢰도: %.2f)", detected_domain, confidence)
     
     return {
         "detected_domain": detected_domain,
         "domain_confidence": confidence,
         "current_step": "domain_detect"
     }
-
@@ -1,49 +1,46 @@
 """동적 도메인 지식 생성 - LLM을 통해 분야별 전문 지식 자동 생성"""
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+import asyncio
+import functools
+import json
 import os
+import threading
+import time
+from langchain_core.prompts import PromptTemplate
 from ..state import DomainPack
+from ..utils.domain_cache import DomainPackCache, get_domain_cache
+from ..utils.llm_provider import get_llm_provider
+from ..utils.llm_scheduler import PriorityTicket, current_priority, get_llm_scheduler
+from ..utils.log import get_logger
+from ..utils.singleflight import SingleFlight
 
+logger = get_logger(__name__)
 
-def generate_domain_knowledge_node(state: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    감지된 분야에 대해 LLM을 활용하여 동적으로 전문 지식 생성
-    
-    입력: detected_domain
-    출력: domain_pack (taxonomy, glossary, question_bank 등)
-    """
-    print("🧠 [DynamicKnowledge] 동적 지식 생성 중...")
-    
-    detected_domain = state.get("detected_domain", "General")
-    
-    # OpenAI API 사용 가능 여부 확인
-    has_openai = os.getenv("OPENAI_API_KEY") is not None
-    
-    if has_openai:
-        # LLM을 통한 동적 지식 생성
-        domain_pack = generate_knowledge_with_llm(detected_domain)
-    else:
-        # API 키 없을 때 기본 템플릿 사용
-        domain_pack = generate_knowledge_template(detected_domain)
-    
-    print(f"✅ [DynamicKnowledge] {detected_domain} 지식 생성 완료")
-    
-    return {
-        "domain_pack": domain_pack,
-        "current_step": "dynamic_knowledge"
-    }
 
+# 캐시 키 구성 요소 - 프롬프트나 모델을 바꾸면 PROMPT_VERSION/LLM_MODEL도 함께 갱신
+PROMPT_VERSION = "1"
+LLM_MODEL = "gpt-4o-mini"
+LLM_TEMPERATURE = 0.7
+DYNAMIC_PACK_VERSION = "1.0-dynamic"
+PARTIAL_PACK_VERSION = "1.0-dynamic-partial"  # 일부 섹션이 템플릿으로 대체됨 (캐시하지 않음)
 
-def generate_knowledge_with_llm(domain: str) -> DomainPack:
-    """LLM을 사용하여 도메인 지식 생성"""
-    try:
-        from langchain_openai import ChatOpenAI
-        from langchain.prompts import PromptTemplate
-        import json
-        
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
-        
-        # Taxonomy 생성 프롬프트
-        taxonomy_prompt = PromptTemplate.from_template("""
+# LLM 호출별 타임아웃(초)과 섹션 생성 동시 실행 상한 (프로세스 전체 공유)
+LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "30"))
+_GENERATION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+    thread_name_prefix="domain-llm"
+)
+# 같은 분야 팩 생성은 프로세스 안에서 한 번만 진행 (동시 요청/prewarm은 결과를 공유)
+_PACK_FLIGHTS = SingleFlight("domain_pack")
+# 진행 중인 생성별 LLM 호출 우선순위 (더 높은 우선순위의 요청이 합류하면 올림)
+_FLIGHT_TICKETS: Dict[str, PriorityTicket] = {}
+_FLIGHT_TICKETS_LOCK = threading.Lock()
+
+
+# ============ 프롬프트 ============
+
+TAXONOMY_PROMPT = """
 You are an expert in {domain}. Create a comprehensive learning taxonomy.
 
 Generate a JSON array of 8-10 core concepts with this structure:
@@ -60,10 +57,9 @@ Generate a JSON array of 8-10 core concepts with this structure:
 
 Domain: {domain}
 Return ONLY valid JSON array, no explanation.
-""")
-        
-        # Glossary 생성 프롬프트
-        glossary_prompt = PromptTemplate.from_template("""
+"""
+
+GLOSSARY_PROMPT = """
 You are an expert in {domain}. Create a glossary of key terms.
 
 Generate a JSON object with 15-20 essential terms and their definitions in Korean:
@@ -75,43 +71,9 @@ Generate a JSON object with 15-20 essential terms and their definitions in Korea
 
 Domain: {domain}
 Return ONLY valid JSON object, no explanation.
-""")
-        
-        print(f"  📝 {domain} Taxonomy 생성 중...")
-        taxonomy_response = llm.invoke(taxonomy_prompt.format(domain=domain))
-        taxonomy = json.loads(taxonomy_response.content)
-        
-        print(f"  📚 {domain} Glossary 생성 중...")
-        glossary_response = llm.invoke(glossary_prompt.format(domain=domain))
-        glossary = json.loads(glossary_response.content)
-        
-        # Question Bank 생성
-        questions = generate_questions_for_domain(domain, llm)
-        
-        # Tool Recipes 생성
-        recipes = generate_tool_recipes(domain, llm)
-        
-        return DomainPack(
-            taxonomy=taxonomy,
-            glossary=glossary,
-            question_bank=questions,
-            tool_recipes=recipes,
-            version="1.0-dynamic"
-        )
-        
-    except Exception as e:
-        print(f"  ⚠️ LLM 생성 실패: {e}")
-        print(f"  → 템플릿 모드로 전환")
-        return generate_knowledge_template(domain)
+"""
 
-
-def generate_questions_for_domain(domain: str, llm) -> List[Dict]:
-    """도메인별 진단 문항 생성"""
-    from langchain.prompts import PromptTemplate
-    import json
-    
-    try:
-        question_prompt = PromptTemplate.from_template("""
+QUESTION_PROMPT = """
 Create 5 diagnostic questions for {domain} skill assessment.
 
 JSON format:
@@ -128,21 +90,9 @@ JSON format:
 
 Domain: {domain}
 Return ONLY valid JSON array.
-""")
-        
-        response = llm.invoke(question_prompt.format(domain=domain))
-        return json.loads(response.content)
-    except:
-        return []
-
+"""
 
-def generate_tool_recipes(domain: str, llm) -> List[Dict]:
-    """도메인별 도구 추천 레시피 생성"""
-    from langchain.prompts import PromptTemplate
-    import json
-    
-    try:
-        recipe_prompt = PromptTemplate.from_template("""
+RECIPE_PROMPT = """
 Create 3 tech stack recommendations for {domain} (beginner, intermediate, advanced).
 
 JSON format:
@@ -158,13 +108,401 @@ JSON format:
 
 Domain: {domain}
 Return ONLY valid JSON array.
-""")
-        
-        response = llm.invoke(recipe_prompt.format(
-            domain=domain,
-            domain_short=domain.lower().replace(" ", "_")
-        ))
+"""
+
+# DomainPack 필드명 → 프롬프트
+SECTION_PROMPTS = {
+    "taxonomy": TAXONOMY_PROMPT,
+    "glossary": GLOSSARY_PROMPT,
+    "question_bank": QUESTION_PROMPT,
+    "tool_recipes": RECIPE_PROMPT,
+}
+
+
+# 모듈 로드 시 한 번 파싱한 템플릿
+SECTION_TEMPLATES = {
+    section: PromptTemplate.from_template(template)
+    for section, template in SECTION_PROMPTS.items()
+}
+
+
+def format_section_prompt(section: str, domain: str) -> str:
+    """섹션 프롬프트에 분야명 채우기"""
+    return SECTION_TEMPLATES[section].format(
+        domain=domain,
+        domain_short=domain.lower().replace(" ", "_")
+    )
+
+
+# ============ 노드 ============
+
+def generate_domain_knowledge_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    감지된 분야에 대해 LLM을 활용하여 동적으로 전문 지식 생성
+    
+    입력: detected_domain
+    출력: domain_pack (taxonomy, glossary, question_bank 등)
+    """
+    logger.info("🧠 [DynamicKnowledge] 동적 지식 생성 중...")
+    
+    detected_domain = state.get("detected_domain", "General")
+    
+    # 세션의 이전 턴과 같은 분야면 보관된 팩을 그대로 사용
+    previous_pack = _reusable_pack(state, detected_domain)
+    if previous_pack is not None:
+        logger.info("✅ [DynamicKnowledge] %s 세션 팩 재사용", detected_domain)
+        return {"domain_pack": previous_pack, "current_step": "dynamic_knowledge"}
+    
+    # OpenAI API 사용 가능 여부 확인
+    has_openai = os.getenv("OPENAI_API_KEY") is not None
+    
+    if has_openai:
+        # 캐시 우선 조회 후 미스일 때만 LLM으로 생성
+        domain_pack = _get_cached_pack(detected_domain)
+        if domain_pack is None:
+            domain_pack = _generate_pack_once(detected_domain)
+    else:
+        # API 키 없을 때 기본 템플릿 사용
+        domain_pack = generate_knowledge_template(detected_domain)
+    
+    logger.info("✅ [DynamicKnowledge] %s 지식 생성 완료", detected_domain)
+    
+    # 새 팩이 들어왔으므로 (세션의) 이전 팩 기준 숙련도 프로필은 무효
+    return {
+        "domain_pack": domain_pack,
+        "profiled_at": 0.0,
+        "current_step": "dynamic_knowledge"
+    }
+
+
+async def agenerate_domain_knowledge_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """generate_domain_knowledge_node의 비동기 버전 (LLM 호출 동안 이벤트 루프를 막지 않음)"""
+    logger.info("🧠 [DynamicKnowledge] 동적 지식 생성 중...")
+    
+    detected_domain = state.get("detected_domain", "General")
+    
+    previous_pack = _reusable_pack(state, detected_domain)
+    if previous_pack is not None:
+        logger.info("✅ [DynamicKnowledge] %s 세션 팩 재사용", detected_domain)
+        return {"domain_pack": previous_pack, "current_step": "dynamic_knowledge"}
+    
+    has_openai = os.getenv("OPENAI_API_KEY") is not None
+    
+    if has_openai:
+        # 디스크 캐시 조회/저장은 파일 I/O이므로 스레드로 넘김
+        domain_pack = await asyncio.to_thread(_get_cached_pack, detected_domain)
+        if domain_pack is None:
+            domain_pack = await _agenerate_pack_once(detected_domain)
+    else:
+        domain_pack = generate_knowledge_template(detected_domain)
+    
+    logger.info("✅ [DynamicKnowledge] %s 지식 생성 완료", detected_domain)
+    
+    # 새 팩이 들어왔으므로 (세션의) 이전 팩 기준 숙련도 프로필은 무효
+    return {
+        "domain_pack": domain_pack,
+        "profiled_at": 0.0,
+        "current_step": "dynamic_knowledge"
+    }
+
+
+def _reusable_pack(state: Dict[str, Any], domain: str) -> Optional[DomainPack]:
+    """이전 턴에서 같은 분야로 생성된 팩 (일부 섹션이 대체된 팩은 다시 생성 시도)"""
+    domain_pack = state.get("domain_pack")
+    if domain_pack is not None and domain_pack.domain == domain and domain_pack.version != PARTIAL_PACK_VERSION:
+        return domain_pack
+    return None
+
+
+def _get_cached_pack(domain: str) -> Optional[DomainPack]:
+    """캐시된 DomainPack 조회"""
+    domain_pack = get_domain_cache().get(domain, PROMPT_VERSION, LLM_MODEL)
+    if domain_pack is not None:
+        logger.info("  ⚡ %s 캐시 히트", domain)
+    return domain_pack
+
+
+def current_pack_fingerprint(domain: str) -> Optional[str]:
+    """
+    세션 없는 요청이 지금 이 분야에 쓰게 될 팩의 fingerprint (생성/디스크 로드가 필요하면 None)
+    
+    API 키가 없으면 결정적인 템플릿 팩, 있으면 메모리 캐시의 팩 (히트 통계에 포함하지 않음)
+    """
+    if os.getenv("OPENAI_API_KEY") is None:
+        return _template_fingerprint(domain)
+    domain_pack = get_domain_cache().peek(domain, PROMPT_VERSION, LLM_MODEL)
+    return domain_pack.fingerprint if domain_pack is not None else None
+
+
+@functools.lru_cache(maxsize=256)
+def _template_fingerprint(domain: str) -> str:
+    return generate_knowledge_template(domain).fingerprint
+
+
+def refresh_domain_pack(domain: str, max_age: float = 0.0) -> str:
+    """
+    분야 팩을 캐시에 준비 (백그라운드 prewarm용)
+    
+    Args:
+        max_age: 캐시된 팩이 이보다 오래됐으면 다시 생성 (0이면 있으면 그대로 사용)
+    
+    Returns:
+        "fresh"(캐시 팩 사용) / "generated"(새로 생성) / "refreshed"(오래된 팩 교체) / "failed"(완전한 팩 생성 실패)
+    """
+    cache = get_domain_cache()
+    cached = cache.get(domain, PROMPT_VERSION, LLM_MODEL)  # 디스크 티어에 있으면 메모리로 올림
+    if cached is not None and not (max_age > 0 and (cache.age(domain, PROMPT_VERSION, LLM_MODEL) or 0.0) > max_age):
+        return "fresh"
+    # 같은 분야를 생성 중인 요청이 있으면 그 결과를 공유 (오래된 팩 교체 시에는 캐시를 다시 보지 않음)
+    domain_pack = _generate_pack_once(domain, reuse_cached=cached is None)
+    if domain_pack.version != DYNAMIC_PACK_VERSION:
+        return "failed"
+    return "refreshed" if cached is not None else "generated"
+
+
+def _flight_key(domain: str) -> str:
+    """캐시 키와 같은 기준(분야명 정규화, 프롬프트 버전, 모델)의 single-flight 키"""
+    return DomainPackCache.make_key(domain, PROMPT_VERSION, LLM_MODEL)
+
+
+def _open_ticket(key: str) -> PriorityTicket:
+    """생성을 맡은 리더가 현재 우선순위로 티켓을 만들어 등록 (끝나면 _release_ticket)"""
+    ticket = PriorityTicket(current_priority())
+    with _FLIGHT_TICKETS_LOCK:
+        _FLIGHT_TICKETS[key] = ticket
+    return ticket
+
+
+def _raise_ticket(key: str) -> None:
+    """
+    진행 중인 생성이 있으면 그 티켓을 현재 우선순위로 올림 (없으면 아무것도 하지 않음)
+    
+    백그라운드 prewarm 생성에 사용자 요청이 합류하면 남은 LLM 호출을 사용자 우선순위로 올린다.
+    리더가 티켓을 등록하기 직전에 합류한 요청의 우선순위는 반영되지 않는다.
+    """
+    with _FLIGHT_TICKETS_LOCK:
+        ticket = _FLIGHT_TICKETS.get(key)
+    if ticket is not None:
+        ticket.raise_to(current_priority())
+
+
+def _release_ticket(key: str, ticket: PriorityTicket) -> None:
+    with _FLIGHT_TICKETS_LOCK:
+        if _FLIGHT_TICKETS.get(key) is ticket:
+            del _FLIGHT_TICKETS[key]
+
+
+def _generate_pack_once(domain: str, reuse_cached: bool = True) -> DomainPack:
+    """
+    분야 팩 생성 + 캐시 저장 (동시에 같은 분야를 요청한 호출은 한 번의 생성 결과를 공유)
+    
+    생성이 예외로 끝나면 기다리던 호출 모두 각자 템플릿 팩으로 대체한다.
+    """
+    key = _flight_key(domain)
+    _raise_ticket(key)
+    
+    def generate() -> DomainPack:
+        ticket = _open_ticket(key)
+        try:
+            # 앞선 생성이 방금 끝나 저장했으면 다시 만들지 않음 (메모리 티어만, 통계 제외)
+            cached = get_domain_cache().peek(domain, PROMPT_VERSION, LLM_MODEL) if reuse_cached else None
+            if cached is not None:
+                return cached
+            domain_pack = generate_knowledge_with_llm(domain, ticket)
+            _store_pack(domain, domain_pack)
+            return domain_pack
+        finally:
+            _release_ticket(key, ticket)
+    
+    try:
+        return _PACK_FLIGHTS.do(key, generate)
+    except Exception as e:
+        logger.warning("  ⚠️ %s 지식 생성 실패: %s → 템플릿 모드로 전환", domain, e)
+        return generate_knowledge_template(domain)
+
+
+async def _agenerate_pack_once(domain: str) -> DomainPack:
+    """_generate_pack_once의 비동기 버전 (동기 호출과도 같은 생성에 합류)"""
+    key = _flight_key(domain)
+    _raise_ticket(key)
+    
+    async def agenerate() -> DomainPack:
+        ticket = _open_ticket(key)
+        try:
+            cached = get_domain_cache().peek(domain, PROMPT_VERSION, LLM_MODEL)
+            if cached is not None:
+                return cached
+            domain_pack = await agenerate_knowledge_with_llm(domain, ticket)
+            await asyncio.to_thread(_store_pack, domain, domain_pack)
+            return domain_pack
+        finally:
+            _release_ticket(key, ticket)
+    
+    try:
+        return await _PACK_FLIGHTS.ado(key, agenerate)
+    except Exception as e:
+        logger.warning("  ⚠️ %s 지식 생성 실패: %s → 템플릿 모드로 전환", domain, e)
+        return generate_knowledge_template(domain)
+
+
+def _store_pack(domain: str, domain_pack: DomainPack) -> None:
+    """완전히 생성된 DomainPack만 캐시에 저장"""
+    # 템플릿 fallback은 캐시하지 않아 다음 요청에서 다시 생성을 시도
+    if domain_pack.version == DYNAMIC_PACK_VERSION:
+        get_domain_cache().put(domain, PROMPT_VERSION, LLM_MODEL, domain_pack)
+
+
+# ============ LLM 생성 ============
+
+def _create_llm():
+    """공유 제공자에서 채팅 클라이언트 조회 (연결 풀 재사용)"""
+    return get_llm_provider().get(LLM_MODEL, LLM_TEMPERATURE)
+
+
+def generate_knowledge_with_llm(domain: str, ticket: Optional[PriorityTicket] = None) -> DomainPack:
+    """
+    LLM을 사용하여 도메인 지식 생성
+    
+    taxonomy/glossary/question_bank/tool_recipes 4개 프롬프트는 서로 독립적이므로
+    동시에 호출하여 미스 지연을 가장 느린 호출 1회 수준으로 줄인다.
+    실패하거나 시간 초과된 섹션만 템플릿으로 대체한다.
+    호출은 LLM 스케줄러의 한도를 따르며, 한도 대기도 LLM_CALL_TIMEOUT에 포함된다.
+    
+    Args:
+        ticket: 섹션 호출들이 공유할 우선순위 (None이면 현재 컨텍스트의 우선순위)
+    """
+    try:
+        llm = _create_llm()
+    except Exception as e:
+        logger.warning("  ⚠️ LLM 초기화 실패: %s", e)
+        logger.warning("  → 템플릿 모드로 전환")
+        return generate_knowledge_template(domain)
+    
+    logger.info("  📝 %s 지식 섹션 %s개 동시 생성 중...", domain, len(SECTION_PROMPTS))
+    # 실행 스레드로 contextvar가 넘어가지 않으므로 우선순위는 여기서 확정해 전달
+    ticket = ticket or PriorityTicket()
+    # 모든 섹션이 동시에 출발하므로 공통 마감 시각이 곧 호출별 타임아웃
+    deadline = time.monotonic() + LLM_CALL_TIMEOUT
+    futures = {
+        section: _GENERATION_EXECUTOR.submit(_generate_section, llm, section, domain, ticket, deadline)
+        for section in SECTION_PROMPTS
+    }
+    
+    results = {}
+    for section, future in futures.items():
+        try:
+            results[section] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FuturesTimeoutError as e:
+            future.cancel()
+            results[section] = e
+        except Exception as e:
+            results[section] = e
+    
+    return _assemble_domain_pack(domain, results)
+
+
+async def agenerate_knowledge_with_llm(domain: str, ticket: Optional[PriorityTicket] = None) -> DomainPack:
+    """generate_knowledge_with_llm의 비동기 버전 (ainvoke + asyncio.gather)"""
+    try:
+        llm = _create_llm()
+    except Exception as e:
+        logger.warning("  ⚠️ LLM 초기화 실패: %s", e)
+        logger.warning("  → 템플릿 모드로 전환")
+        return generate_knowledge_template(domain)
+    
+    logger.info("  📝 %s 지식 섹션 %s개 동시 생성 중...", domain, len(SECTION_PROMPTS))
+    
+    ticket = ticket or PriorityTicket()
+    scheduler = get_llm_scheduler()
+    
+    async def generate(section: str):
+        prompt = format_section_prompt(section, domain)
+        response = await asyncio.wait_for(
+            scheduler.acall(lambda: llm.ainvoke(prompt), prompt, ticket),
+            timeout=LLM_CALL_TIMEOUT
+        )
         return json.loads(response.content)
+    
+    values = await asyncio.gather(
+        *(generate(section) for section in SECTION_PROMPTS),
+        return_exceptions=True
+    )
+    return _assemble_domain_pack(domain, dict(zip(SECTION_PROMPTS, values)))
+
+
+def _generate_section(
+    llm,
+    section: str,
+    domain: str,
+    ticket: Optional[PriorityTicket] = None,
+    deadline: Optional[float] = None,
+):
+    """섹션 하나를 동기 호출로 생성하여 JSON 파싱 (LLM 스케줄러 슬롯을 받은 뒤 호출)"""
+    prompt = format_section_prompt(section, domain)
+    response = get_llm_scheduler().call(lambda: llm.invoke(prompt), prompt, ticket, deadline)
+    return json.loads(response.content)
+
+
+def _assemble_domain_pack(domain: str, results: Dict[str, Any]) -> DomainPack:
+    """
+    섹션별 생성 결과로 DomainPack 구성
+    
+    예외이거나 비어 있는 섹션은 템플릿의 같은 섹션으로 대체한다.
+    """
+    template = generate_knowledge_template(domain)
+    sections = {}
+    failed = []
+    
+    for section, value in results.items():
+        if isinstance(value, (FuturesTimeoutError, asyncio.TimeoutError)):
+            logger.warning("  ⚠️ %s 생성 시간 초과 (%.0f초)", section, LLM_CALL_TIMEOUT)
+            value = None
+        elif isinstance(value, BaseException):
+            logger.warning("  ⚠️ %s 생성 실패: %s", section, value)
+            value = None
+        
+        if not value:
+            # 섹션 단위 fallback
+            failed.append(section)
+            value = getattr(template, section)
+        sections[section] = value
+    
+    if len(failed) == len(results):
+        logger.warning("  → 템플릿 모드로 전환")
+        return template
+    
+    if failed:
+        logger.warning("  → 템플릿으로 대체된 섹션: %s", ', '.join(failed))
+    
+    return DomainPack(
+        **sections,
+        version=DYNAMIC_PACK_VERSION if not failed else PARTIAL_PACK_VERSION,
+        domain=domain
+    )
+
+
+def generate_taxonomy_for_domain(domain: str, llm) -> List[Dict]:
+    """도메인별 학습 taxonomy 생성"""
+    return _generate_section(llm, "taxonomy", domain)
+
+
+def generate_glossary_for_domain(domain: str, llm) -> Dict[str, str]:
+    """도메인별 용어 사전 생성"""
+    return _generate_section(llm, "glossary", domain)
+
+
+def generate_questions_for_domain(domain: str, llm) -> List[Dict]:
+    """도메인별 진단 문항 생성"""
+    try:
+        return _generate_section(llm, "question_bank", domain)
+    except:
+        return []
+
+
+def generate_tool_recipes(domain: str, llm) -> List[Dict]:
+    """도메인별 도구 추천 레시피 생성"""
+    try:
+        return _generate_section(llm, "tool_recipes", domain)
     except:
         return []
 
@@ -233,6 +571,7 @@ def generate_knowledge_template(domain: str) -> DomainPack:
                 "cons": ["제한적 기능", "확장성 부족"]
             }
         ],
-        version="1.0-template"
+        version="1.0-template",
+        domain=domain
     )
 
@@ -1,6 +1,13 @@
 """10. GapMining 노드 - 지식 갭/모르는 용어 추천"""
 from typing import Dict, Any, List
+import os
 from ..state import GraphState, Gaps
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# 미지 개념마다 붙일 근거 문단 수
+GAP_PASSAGES_TOP_K = int(os.getenv("GAP_PASSAGES_TOP_K", "2"))
 
 
 def gap_mining_node(state: GraphState) -> Dict[str, Any]:
@@ -10,7 +17,7 @@ def gap_mining_node(state: GraphState) -> Dict[str, Any]:
     입력: signals, mastery, taxonomy_map
     출력: gaps.unknown_terms_ranked, gaps.prereq_recos
     """
-    print("🔎 [GapMining] 지식 갭 분석 중...")
+    logger.info("🔎 [GapMining] 지식 갭 분석 중...")
     
     signals = state["signals"]
     mastery = state["mastery"]
@@ -25,6 +32,7 @@ def gap_mining_node(state: GraphState) -> Dict[str, Any]:
     unknown_terms = []
     
     core_concepts = taxonomy_map.get("core_concepts", [])
+    index = domain_pack.index
     
     for concept_data in core_concepts:
         concept_id = concept_data["concept_id"]
@@ -41,23 +49,27 @@ def gap_mining_node(state: GraphState) -> Dict[str, Any]:
         unknown_score = frequency * (importance / 10) * (1 - mastery_score) * novelty
         
         # 개념 정보 가져오기
-        taxonomy = domain_pack.taxonomy if hasattr(domain_pack, 'taxonomy') else []
-        concept_info = next(
-            (c for c in taxonomy if c["id"] == concept_id),
-            None
-        )
+        concept_info = index.concept(concept_id)
         
         if concept_info and unknown_score > 0.1:
-            # 관련 용어 정의
+            # 관련 용어 정의 (대소문자/구분자 차이 무시)
             related_terms = []
-            glossary = domain_pack.glossary if hasattr(domain_pack, 'glossary') else {}
             for concept_name in concept_info["concepts"]:
-                if concept_name in glossary:
+                glossary_term = index.glossary_term(concept_name)
+                if glossary_term:
                     related_terms.append({
-                        "term": concept_name,
-                        "definition": glossary[concept_name][:100] + "..."
+                        "term": glossary_term,
+                        "definition": domain_pack.glossary[glossary_term][:100] + "..."
                     })
             
+            # 개념 자체 항목을 뺀 근거 문단 (용어 정의/관련 문제)
+            query = " ".join([concept_info["name"], *concept_info["concepts"]])
+            passages = [
+                passage.id
+                for passage, _ in index.search(query, GAP_PASSAGES_TOP_K + 1)
+                if passage.id != f"concept:{concept_id}"
+            ]
+            
             unknown_terms.append({
                 "concept_id": concept_id,
                 "name": concept_info["name"],
@@ -65,7 +77,8 @@ def gap_mining_node(state: GraphState) -> Dict[str, Any]:
                 "mastery_score": mastery_score,
                 "importance": importance,
                 "related_terms": related_terms[:3],  # 상위 3개만
-                "prerequisites": concept_info["prerequisites"]
+                "prerequisites": concept_info["prerequisites"],
+                "passages": passages[:GAP_PASSAGES_TOP_K]
             })
     
     # Unknown Score로 정렬
@@ -79,10 +92,7 @@ def gap_mining_node(state: GraphState) -> Dict[str, Any]:
     for term in top_unknown:
         if term["mastery_score"] < 0.4 and term["prerequisites"]:
             for prereq_id in term["prerequisites"]:
-                prereq_concept = next(
-                    (c for c in taxonomy if c["id"] == prereq_id),
-                    None
-                )
+                prereq_concept = index.concept(prereq_id)
                 if prereq_concept:
                     prereq_recos.append(
                         f"{prereq_concept['name']} (→ {term['name']}을 위한 선수지식)"
@@ -93,7 +103,7 @@ def gap_mining_node(state: GraphState) -> Dict[str, Any]:
         prereq_recos=list(set(prereq_recos))[:3]  # 중복 제거, 상위 3개
     )
     
-    print(f"✅ [GapMining] 갭 분석 완료: {len(top_unknown)}개 미지 용어, {len(prereq_recos)}개 선수지식 추천")
+    logger.info("✅ [GapMining] 갭 분석 완료: %s개 미지 용어, %s개 선수지식 추천", len(top_unknown), len(prereq_recos))
     
     return {
         "gaps": gaps,
@@ -1,6 +1,11 @@
 """4. InferLevel 노드 - 숙련도 추정"""
 from typing import Dict, Any
+import time
 from ..state import GraphState, Mastery
+from ..utils.knowledge_tracing import experience_prior
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 def infer_level_node(state: GraphState) -> Dict[str, Any]:
@@ -10,7 +15,7 @@ def infer_level_node(state: GraphState) -> Dict[str, Any]:
     입력: signals, user.prefs, 콜드스타트 응답
     출력: mastery 초기 분포, memory.seen_terms 갱신
     """
-    print("📊 [InferLevel] 숙련도 추정 중...")
+    logger.info("📊 [InferLevel] 숙련도 추정 중...")
     
     signals = state["signals"]
     user = state["user"]
@@ -18,52 +23,40 @@ def infer_level_node(state: GraphState) -> Dict[str, Any]:
     mastery = state["mastery"]
     memory = state["memory"]
     
-    # 경험 수준에 따른 기본 mastery
-    experience_level = user.prefs.get("experience_level", 1)
-    base_mastery = {
-        0: 0.2,  # 초보
-        1: 0.4,  # 입문
-        2: 0.6,  # 중급
-        3: 0.8   # 고급
-    }.get(experience_level, 0.4)
+    # 경험 수준에 따른 사전 숙련 확률 (이전 턴에 추적한 개념은 그 값에서 이어감)
+    prior = experience_prior(user.prefs.get("experience_level", 1))
     
-    # taxonomy의 모든 개념에 대해 초기 mastery 설정
     levels = {}
     if domain_pack:
-        taxonomy = domain_pack.taxonomy if hasattr(domain_pack, 'taxonomy') else []
-        for concept in taxonomy:
-            concept_id = concept["id"]
-            
-            # 신호 기반 보정
-            boost = 0.0
-            for term in signals.terms:
-                if term.lower() in concept["concepts"]:
-                    boost += 0.15
-            
-            for skill in signals.skills:
-                if skill in concept["concepts"]:
-                    boost += 0.1
-            
-            # mastery 계산 (0.0 ~ 1.0 범위)
-            mastery_value = min(1.0, base_mastery + boost)
-            levels[concept_id] = mastery_value
-    
-    mastery.levels = levels
+        index = domain_pack.index
+        tracer = index.tracer
+        
+        # 신호가 가리키는 개념을 역색인으로 모아 관찰 종류별로 한 번씩 갱신
+        term_concepts = [cid for term in signals.terms for cid in index.concepts_for_term(term)]
+        skill_concepts = [cid for skill in signals.skills for cid in index.concepts_for_term(skill)]
+        
+        p = tracer.from_levels(mastery.levels, prior)
+        p = tracer.observe(p, term_concepts, "term")
+        p = tracer.observe(p, skill_concepts, "skill")
+        levels = tracer.to_levels(p)
+    
+    # 다른 분야에서 추적한 개념은 유지
+    mastery.levels = {**mastery.levels, **levels}
     
     # 약한 영역 식별
     weak_concepts = [cid for cid, score in levels.items() if score < 0.5]
     needs_diagnostic = len(weak_concepts) >= 3
     
     # 본 용어 기록
-    memory.seen_terms.extend(signals.terms)
-    memory.seen_terms = list(set(memory.seen_terms))  # 중복 제거
+    memory.seen_terms.update(signals.terms)
     
-    print(f"✅ [InferLevel] 추정 완료: 평균 숙련도 {sum(levels.values())/len(levels):.2f}, 약한 영역 {len(weak_concepts)}개")
+    logger.info("✅ [InferLevel] 추정 완료: 평균 숙련도 %.2f, 약한 영역 %s개", sum(levels.values()) / max(len(levels), 1), len(weak_concepts))
     
     return {
         "mastery": mastery,
         "memory": memory,
         "needs_diagnostic": needs_diagnostic,
+        "profiled_at": time.time(),
         "current_step": "infer_level"
     }
 
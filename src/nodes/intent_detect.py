@@ -1,36 +1,26 @@
 """6. IntentDetect 노드 - 의도/태스크 분류"""
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+import asyncio
 from ..state import GraphState, Intent
+from ..retrieval.hybrid import retrieve_context_docs
+from ..utils.keyword_matcher import scan_message
+from ..utils.log import get_logger
 
+logger = get_logger(__name__)
 
-def intent_detect_node(state: GraphState) -> Dict[str, Any]:
-    """
-    질문 성격 파악 (설계/디버깅/비교/최적화/코드생성/평가 등)
-    
-    입력: 사용자 질문 + signals
-    출력: intent
-    """
-    print("🎯 [IntentDetect] 의도 분석 중...")
-    
+
+def _classify_intent(state: GraphState) -> Tuple[Intent, List[str]]:
+    """키워드 스캔으로 의도와 필수 산출물 템플릿 결정 (I/O 없음)"""
     user_message = state["user_message"].lower()
     
-    # 의도 패턴 매칭
-    intent_patterns = {
-        "design": ["설계", "아키텍처", "구조", "어떻게 구성", "선택", "architecture", "design"],
-        "implementation": ["구현", "코드", "만들", "작성", "개발", "implement", "code"],
-        "evaluation": ["평가", "측정", "비교", "테스트", "ragas", "evaluate", "measure"],
-        "optimization": ["최적화", "성능", "빠르", "지연", "비용", "optimize", "performance"],
-        "troubleshoot": ["문제", "오류", "에러", "디버그", "안돼", "error", "debug", "fix"],
-        "compare": ["차이", "vs", "비교", "어느게", "compare", "difference"],
-        "explain": ["설명", "무엇", "뭐", "이란", "개념", "explain", "what is"],
-        "learn_path": ["배우", "학습", "공부", "시작", "learn", "study", "tutorial"]
-    }
+    # 의도 패턴 매칭 (공유 매처의 스캔 결과 재사용)
+    hits = scan_message(user_message)
     
     detected_type = "explain"  # 기본값
     max_score = 0
     
-    for intent_type, keywords in intent_patterns.items():
-        score = sum(1 for kw in keywords if kw in user_message)
+    for intent_type, keywords in hits.labels("intent").items():
+        score = len(keywords)
         if score > max_score:
             max_score = score
             detected_type = intent_type
@@ -41,9 +31,9 @@ def intent_detect_node(state: GraphState) -> Dict[str, Any]:
     # 서브타입 추론
     sub_type = ""
     if detected_type == "design":
-        if "인덱싱" in user_message or "indexing" in user_message:
+        if hits.has("intent_subtype", "indexing_design"):
             sub_type = "indexing_design"
-        elif "검색" in user_message or "retrieval" in user_message:
+        elif hits.has("intent_subtype", "retrieval_design"):
             sub_type = "retrieval_design"
     
     intent = Intent(
@@ -61,10 +51,15 @@ def intent_detect_node(state: GraphState) -> Dict[str, Any]:
     elif detected_type == "evaluation":
         required_outputs = ["metrics", "evaluation_plan"]
     
+    return intent, required_outputs
+
+
+def _intent_output(state: GraphState, intent: Intent, required_outputs: List[str], context_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
     task = state["task"]
     task.required_outputs = required_outputs
+    task.context_docs_meta = context_docs
     
-    print(f"✅ [IntentDetect] 의도: {detected_type} (신뢰도: {confidence:.2f})")
+    logger.info("✅ [IntentDetect] 의도: %s (신뢰도: %.2f)", intent.type, intent.confidence)
     
     return {
         "intent": intent,
@@ -72,3 +67,25 @@ def intent_detect_node(state: GraphState) -> Dict[str, Any]:
         "current_step": "intent_detect"
     }
 
+
+def intent_detect_node(state: GraphState) -> Dict[str, Any]:
+    """
+    질문 성격 파악 (설계/디버깅/비교/최적화/코드생성/평가 등)
+    
+    입력: 사용자 질문 + signals
+    출력: intent, task (필수 산출물, 검색 색인에서 찾은 관련 문서)
+    """
+    logger.info("🎯 [IntentDetect] 의도 분석 중...")
+    intent, required_outputs = _classify_intent(state)
+    # 로컬 검색 색인이 있으면 관련 문서 청크 연결 (없으면 빈 목록)
+    context_docs = retrieve_context_docs(state["task"].question or state["user_message"])
+    return _intent_output(state, intent, required_outputs, context_docs)
+
+
+async def aintent_detect_node(state: GraphState) -> Dict[str, Any]:
+    """intent_detect_node의 비동기 버전 (색인 파일 확인/검색을 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+    logger.info("🎯 [IntentDetect] 의도 분석 중...")
+    intent, required_outputs = _classify_intent(state)
+    context_docs = await asyncio.to_thread(retrieve_context_docs, state["task"].question or state["user_message"])
+    return _intent_output(state, intent, required_outputs, context_docs)
+
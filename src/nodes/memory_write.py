@@ -1,6 +1,11 @@
 """13. MemoryWrite 노드 - 장기 개인화"""
 from typing import Dict, Any
-from ..state import GraphState
+import asyncio
+from ..state import DEFAULT_USER_ID, GraphState
+from ..utils.log import get_logger
+from ..utils.memory_store import save_user_record
+
+logger = get_logger(__name__)
 
 
 def memory_write_node(state: GraphState) -> Dict[str, Any]:
@@ -10,7 +15,7 @@ def memory_write_node(state: GraphState) -> Dict[str, Any]:
     입력: mastery, gaps, 상호작용 로그
     출력: 갱신된 memory
     """
-    print("💾 [MemoryWrite] 메모리 저장 중...")
+    logger.info("💾 [MemoryWrite] 메모리 저장 중...")
     
     memory = state["memory"]
     mastery = state["mastery"]
@@ -26,23 +31,28 @@ def memory_write_node(state: GraphState) -> Dict[str, Any]:
         "confidence": state["eval"].confidence
     }
     
-    memory.history.append(interaction_log)
-    
-    # mastery 스냅샷 (변화 추적용)
-    # 실제 구현에서는 DB나 파일에 저장
+    memory.record_interaction(interaction_log)
     
     # seen_terms 업데이트 (이미 이전 노드에서 업데이트됨)
-    for term_info in gaps.unknown_terms_ranked:
-        if term_info["name"] not in memory.seen_terms:
-            memory.seen_terms.append(term_info["name"])
+    memory.seen_terms.update(term_info["name"] for term_info in gaps.unknown_terms_ranked)
     
-    # 다음 세션용 콜드스타트 단축키 (캐싱)
-    # 실제로는 user profile을 persistent storage에 저장
+    # 다음 턴에 create_initial_state가 불러오도록 영속화
+    # (write-behind 큐에 넘기고 바로 반환 - 디스크 쓰기는 응답 경로 밖에서 진행)
+    user_id = state["user"].id
+    if user_id != DEFAULT_USER_ID:
+        save_user_record(user_id, {
+            "memory": memory.model_dump(mode="json"),
+            "mastery": mastery.model_dump(mode="json")
+        })
     
-    print(f"✅ [MemoryWrite] 저장 완료: {len(memory.history)}개 인터랙션, {len(memory.seen_terms)}개 본 용어")
+    logger.info("✅ [MemoryWrite] 저장 완료: %s개 인터랙션, %s개 본 용어", len(memory.history), len(memory.seen_terms))
     
     return {
         "memory": memory,
         "current_step": "memory_write"
     }
 
+
+async def amemory_write_node(state: GraphState) -> Dict[str, Any]:
+    """memory_write_node의 비동기 버전 (write-behind 큐가 가득 차 기다리는 동안 이벤트 루프를 막지 않음)"""
+    return await asyncio.to_thread(memory_write_node, state)
@@ -1,6 +1,9 @@
 """8. PlanAnswer 노드 - 솔루션 플랜 생성"""
 from typing import Dict, Any
 from ..state import GraphState, Plan
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 def plan_answer_node(state: GraphState) -> Dict[str, Any]:
@@ -10,7 +13,7 @@ def plan_answer_node(state: GraphState) -> Dict[str, Any]:
     입력: taxonomy_map, user.constraints, mastery
     출력: plan.steps[], plan.options[], plan.tradeoffs[]
     """
-    print("📋 [PlanAnswer] 답변 플랜 생성 중...")
+    logger.info("📋 [PlanAnswer] 답변 플랜 생성 중...")
     
     user = state["user"]
     intent = state["intent"]
@@ -103,7 +106,7 @@ def plan_answer_node(state: GraphState) -> Dict[str, Any]:
         tradeoffs=tradeoffs
     )
     
-    print(f"✅ [PlanAnswer] 플랜 생성 완료: {len(steps)}단계, {len(options)}개 옵션")
+    logger.info("✅ [PlanAnswer] 플랜 생성 완료: %s단계, %s개 옵션", len(steps), len(options))
     
     return {
         "plan": plan,
@@ -1,6 +1,9 @@
 """12. QualityGate 노드 - 품질/가드레일 검수"""
 from typing import Dict, Any
 from ..state import GraphState
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 def quality_gate_node(state: GraphState) -> Dict[str, Any]:
@@ -10,7 +13,7 @@ def quality_gate_node(state: GraphState) -> Dict[str, Any]:
     입력: answer, eval
     출력: 보정된 answer, 업데이트된 eval
     """
-    print("✅ [QualityGate] 품질 검수 중...")
+    logger.info("✅ [QualityGate] 품질 검수 중...")
     
     answer = state["answer"]
     eval_obj = state["eval"]
@@ -58,7 +61,7 @@ def quality_gate_node(state: GraphState) -> Dict[str, Any]:
     # 중복/장황 제거 (실제로는 LLM으로 처리, 여기서는 간단히)
     # final_response는 이미 구조화되어 있어 그대로 사용
     
-    print(f"✅ [QualityGate] 검수 완료: 품질 점수 {quality_score:.2f}, 신뢰도 {eval_obj.confidence:.2f}")
+    logger.info("✅ [QualityGate] 검수 완료: 품질 점수 %.2f, 신뢰도 %.2f", quality_score, eval_obj.confidence)
     
     return {
         "answer": answer,
@@ -1,6 +1,9 @@
 """7. TaxonomyMap 노드 - 개념 매핑"""
 from typing import Dict, Any, List
 from ..state import GraphState
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 def taxonomy_map_node(state: GraphState) -> Dict[str, Any]:
@@ -10,7 +13,7 @@ def taxonomy_map_node(state: GraphState) -> Dict[str, Any]:
     입력: intent, signals
     출력: 관련 개념 리스트 (핵심/보조), 선후관계 (Prereq Chain)
     """
-    print("🗺️ [TaxonomyMap] 개념 매핑 중...")
+    logger.info("🗺️ [TaxonomyMap] 개념 매핑 중...")
     
     signals = state["signals"]
     intent = state["intent"]
@@ -23,19 +26,21 @@ def taxonomy_map_node(state: GraphState) -> Dict[str, Any]:
     # 신호와 매칭되는 개념 찾기
     related_concepts = []
     
+    index = domain_pack.index
+    
+    # 용어/스킬 매칭 점수 (역색인 조회)
+    signal_scores = {}
+    for term in signals.terms:
+        for concept_id in index.concepts_for_term(term):
+            signal_scores[concept_id] = signal_scores.get(concept_id, 0.0) + 0.3
+    
+    for skill in signals.skills:
+        for concept_id in index.concepts_for_term(skill):
+            signal_scores[concept_id] = signal_scores.get(concept_id, 0.0) + 0.2
+    
     taxonomy = domain_pack.taxonomy if hasattr(domain_pack, 'taxonomy') else []
     for concept in taxonomy:
-        relevance_score = 0.0
-        
-        # 용어 매칭
-        for term in signals.terms:
-            if term.lower() in [c.lower() for c in concept["concepts"]]:
-                relevance_score += 0.3
-        
-        # 스킬 매칭
-        for skill in signals.skills:
-            if skill in concept["concepts"]:
-                relevance_score += 0.2
+        relevance_score = signal_scores.get(concept["id"], 0.0)
         
         # 의도 기반 관련성
         if intent.type == "design" and "design" in concept["name"].lower():
@@ -65,16 +70,15 @@ def taxonomy_map_node(state: GraphState) -> Dict[str, Any]:
     
     # 선수지식 자동 확장 (부족한 mastery면 추가)
     prereq_chain = []
+    seen_prereqs = set()
     for concept in related_concepts[:5]:  # 상위 5개만
         if concept["mastery_score"] < 0.5:
             for prereq_id in concept["prerequisites"]:
-                if prereq_id not in [c["concept_id"] for c in prereq_chain]:
+                if prereq_id not in seen_prereqs:
                     # 선수지식 개념 찾기
-                    prereq_concept = next(
-                        (c for c in taxonomy if c["id"] == prereq_id),
-                        None
-                    )
+                    prereq_concept = index.concept(prereq_id)
                     if prereq_concept:
+                        seen_prereqs.add(prereq_id)
                         prereq_chain.append({
                             "concept_id": prereq_id,
                             "name": prereq_concept["name"],
@@ -87,7 +91,7 @@ def taxonomy_map_node(state: GraphState) -> Dict[str, Any]:
         "total_matched": len(related_concepts)
     }
     
-    print(f"✅ [TaxonomyMap] 매핑 완료: {len(related_concepts)}개 개념, {len(prereq_chain)}개 선수지식")
+    logger.info("✅ [TaxonomyMap] 매핑 완료: %s개 개념, %s개 선수지식", len(related_concepts), len(prereq_chain))
     
     return {
         "taxonomy_map": [taxonomy_map],
@@ -1,6 +1,9 @@
 """9. ToolAdvisors 노드 - 도구 조언 모듈 (선택적)"""
 from typing import Dict, Any, List
 from ..state import GraphState
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 def tool_advisors_node(state: GraphState) -> Dict[str, Any]:
@@ -10,7 +13,7 @@ def tool_advisors_node(state: GraphState) -> Dict[str, Any]:
     입력: plan, user.constraints
     출력: 후보 옵션 표 (장단점/비용/지연)
     """
-    print("🛠️ [ToolAdvisors] 도구 추천 생성 중...")
+    logger.info("🛠️ [ToolAdvisors] 도구 추천 생성 중...")
     
     user = state["user"]
     constraints = user.constraints
@@ -92,7 +95,7 @@ def tool_advisors_node(state: GraphState) -> Dict[str, Any]:
         }
         tool_advice.append(eval_option)
     
-    print(f"✅ [ToolAdvisors] 추천 완료: {len(tool_advice)}개 도구")
+    logger.info("✅ [ToolAdvisors] 추천 완료: %s개 도구", len(tool_advice))
     
     return {
         "tool_advice": tool_advice,
@@ -2,6 +2,10 @@
 from typing import Dict, Any
 import re
 from ..state import GraphState, Signals
+from ..utils.keyword_matcher import scan_message
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 def user_signals_node(state: GraphState) -> Dict[str, Any]:
@@ -11,7 +15,7 @@ def user_signals_node(state: GraphState) -> Dict[str, Any]:
     입력: 사용자의 현재 메시지
     출력: signals.terms, signals.skills
     """
-    print("🔍 [UserSignals] 사용자 신호 추출 중...")
+    logger.info("🔍 [UserSignals] 사용자 신호 추출 중...")
     
     user_message = state["user_message"].lower()
     domain_pack = state["domain_pack"]
@@ -19,24 +23,11 @@ def user_signals_node(state: GraphState) -> Dict[str, Any]:
     # 용어 추출 - glossary와 매칭
     extracted_terms = []
     if domain_pack:
-        # DomainPack 객체의 glossary 속성 접근
-        glossary = domain_pack.glossary if hasattr(domain_pack, 'glossary') else {}
-        for term in glossary.keys():
-            if term.lower() in user_message:
-                extracted_terms.append(term)
-    
-    # 기술 스택 감지
-    tech_keywords = [
-        "bm25", "hybrid", "vector", "embedding", "chunking",
-        "rerank", "ragas", "llm", "gpt", "kubernetes", "k8s",
-        "pinecone", "weaviate", "chroma", "qdrant",
-        "vllm", "langchain", "llamaindex"
-    ]
-    
-    extracted_skills = []
-    for keyword in tech_keywords:
-        if keyword in user_message:
-            extracted_skills.append(keyword)
+        # DomainPack 인덱스의 glossary 매처로 한 번에 스캔
+        extracted_terms = domain_pack.index.find_glossary_terms(user_message)
+    
+    # 기술 스택 감지 (공유 매처, TECH_KEYWORDS 정의 순서 유지)
+    extracted_skills = list(scan_message(user_message).labels("tech_skill"))
     
     # 코드/로그 패턴 감지
     code_fragments = re.findall(r'```[\s\S]*?```', state["user_message"])
@@ -51,7 +42,7 @@ def user_signals_node(state: GraphState) -> Dict[str, Any]:
     # 신호가 충분한지 판단
     needs_coldstart = len(extracted_terms) == 0 and len(extracted_skills) == 0
     
-    print(f"✅ [UserSignals] 추출 완료: {len(extracted_terms)}개 용어, {len(extracted_skills)}개 기술")
+    logger.info("✅ [UserSignals] 추출 완료: %s개 용어, %s개 기술", len(extracted_terms), len(extracted_skills))
     
     return {
         "signals": signals,
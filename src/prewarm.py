@@ -0,0 +1,154 @@
+"""DomainPack 사전 생성(prewarm) - 자주 묻는 분야의 팩을 백그라운드에서 미리 만들어 둠
+
+분야마다 첫 사용자가 LLM 생성 비용(섹션 4개 호출)을 치르지 않도록,
+domain_detect 노드가 기록한 요청 빈도(utils/domain_usage) 상위 분야의 팩을
+시작 시점과 이후 주기적으로 확인해 없으면 생성하고, TTL이 가까운 팩은 미리 교체한다.
+
+생성은 작은 스레드 풀(PREWARM_WORKERS)에서 하므로 요청 처리 쪽 LLM 호출과 동시에 도는 수가 제한된다.
+API 키가 없으면(템플릿 모드) 생성할 팩이 없으므로 아무것도 하지 않는다.
+
+    from src.prewarm import start_prewarmer
+    start_prewarmer()   # app 시작 시 (이후 PREWARM_INTERVAL초마다 반복)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+import os
+import threading
+import time
+
+from .nodes.dynamic_knowledge import refresh_domain_pack
+from .utils.domain_cache import get_domain_cache
+from .utils.domain_usage import DomainUsageTracker, get_domain_usage
+from .utils.llm_scheduler import llm_priority
+from .utils.log import get_logger
+from .utils.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+
+PREWARM_TOP_N = int(os.getenv("PREWARM_TOP_N", "5"))
+PREWARM_WORKERS = int(os.getenv("PREWARM_WORKERS", "2"))
+PREWARM_INTERVAL = float(os.getenv("PREWARM_INTERVAL", "600"))
+# 캐시 TTL의 이 비율만큼 지난 팩은 만료 전에 다시 생성
+PREWARM_REFRESH_FRACTION = float(os.getenv("PREWARM_REFRESH_FRACTION", "0.8"))
+
+PREWARM_RESULTS = REGISTRY.counter(
+    "rag_edu_prewarm_packs_total", "사전 생성 대상 분야 처리 결과 수", ["result"]
+)
+PREWARM_LATENCY = REGISTRY.histogram(
+    "rag_edu_prewarm_cycle_seconds", "사전 생성 1회(상위 분야 전체) 소요 시간(초)"
+)
+
+
+def _refresh_in_background(domain: str, max_age: float) -> str:
+    """사용자 요청보다 낮은 LLM 우선순위로 팩 준비"""
+    with llm_priority("background"):
+        return refresh_domain_pack(domain, max_age)
+
+
+class DomainPrewarmer:
+    """
+    인기 분야 DomainPack 사전 생성기
+
+    Args:
+        tracker: 분야 요청 빈도 (None이면 프로세스 공유 통계)
+        top_n: 매 회 확인할 상위 분야 수
+        workers: 동시에 생성할 분야 수 (스레드 풀 크기)
+        interval: 주기 실행 간격(초)
+    """
+
+    def __init__(
+        self,
+        tracker: Optional[DomainUsageTracker] = None,
+        top_n: int = PREWARM_TOP_N,
+        workers: int = PREWARM_WORKERS,
+        interval: float = PREWARM_INTERVAL,
+    ):
+        self.tracker = tracker or get_domain_usage()
+        self.top_n = top_n
+        self.interval = interval
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="prewarm")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def prewarm_once(self) -> Dict[str, str]:
+        """
+        상위 분야 팩을 한 번 준비하고 끝날 때까지 대기
+
+        Returns:
+            {분야: "fresh" | "generated" | "refreshed" | "failed"}
+        """
+        if os.getenv("OPENAI_API_KEY") is None:
+            return {}
+        ttl = get_domain_cache().ttl_seconds
+        max_age = ttl * PREWARM_REFRESH_FRACTION if ttl > 0 else 0.0
+        domains = [domain for domain, _ in self.tracker.top(self.top_n)]
+
+        start = time.perf_counter()
+        futures = {domain: self._executor.submit(_refresh_in_background, domain, max_age) for domain in domains}
+        results = {}
+        for domain, future in futures.items():
+            try:
+                results[domain] = future.result()
+            except Exception as e:
+                logger.warning("⚠️ [Prewarm] %s 팩 준비 실패: %s", domain, e)
+                results[domain] = "failed"
+            PREWARM_RESULTS.inc(result=results[domain])
+        PREWARM_LATENCY.observe(time.perf_counter() - start)
+
+        if domains:
+            logger.info("🔥 [Prewarm] 상위 %s개 분야 팩 준비: %s", len(domains), results)
+        self.tracker.save()
+        return results
+
+    def start(self) -> None:
+        """백그라운드 스레드 시작 (즉시 1회 실행 후 interval마다 반복)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="domain-prewarmer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.prewarm_once()
+            except Exception:
+                # 다음 주기에 다시 시도 (백그라운드 스레드가 죽지 않게)
+                logger.exception("❌ [Prewarm] 사전 생성 주기 실패")
+            self._stop.wait(self.interval)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """주기 실행 중지 (대기 중인 생성은 취소, 사용 통계 저장)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.tracker.save()
+
+
+_prewarmer: Optional[DomainPrewarmer] = None
+_prewarmer_lock = threading.Lock()
+
+
+def start_prewarmer() -> Optional[DomainPrewarmer]:
+    """
+    프로세스 공유 사전 생성기 시작 (PREWARM_TOP_N이 0이거나 API 키가 없으면 None)
+    """
+    global _prewarmer
+    if PREWARM_TOP_N <= 0 or os.getenv("OPENAI_API_KEY") is None:
+        return None
+    with _prewarmer_lock:
+        if _prewarmer is None:
+            _prewarmer = DomainPrewarmer()
+            _prewarmer.start()
+    return _prewarmer
+
+
+def stop_prewarmer(timeout: Optional[float] = None) -> None:
+    """프로세스 공유 사전 생성기 중지 (사용 통계 저장)"""
+    global _prewarmer
+    with _prewarmer_lock:
+        prewarmer, _prewarmer = _prewarmer, None
+    if prewarmer is not None:
+        prewarmer.stop(timeout)
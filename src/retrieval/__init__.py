@@ -0,0 +1,16 @@
+"""검색 서브시스템 - BM25 + dense 하이브리드 검색 (색인은 mmap 가능한 .npy 파일)
+
+    from src.retrieval.embedding import HashingEmbedder
+    from src.retrieval.segment import SegmentWriter
+    from src.retrieval.hybrid import HybridRetriever, new_segment_path, publish_segments
+
+    embedder = HashingEmbedder()
+    writer = SegmentWriter(embedder)
+    writer.add({"id": "doc1#0", "doc_id": "doc1", "title": "...", "text": "..."})
+    segment = writer.write(new_segment_path(root))
+    publish_segments(root, [segment], embedder.config())
+
+    HybridRetriever(root).search("하이브리드 검색이란?", k=5)
+
+파일/붙여넣은 텍스트는 ingest.Ingestor(청킹 + 중복 제거 + 프로세스 풀)로 넣는다.
+"""
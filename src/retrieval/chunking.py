@@ -0,0 +1,185 @@
+"""청킹 전략 - 고정 길이 / 재귀 구분자 / 문장 단위
+
+각 전략은 텍스트를 (시작, 끝) 문자 구간 목록으로 나누는 spans()만 구현하고,
+스트리밍은 공통 stream()이 맡는다. stream()은 텍스트 블록을 받아 버퍼에 쌓다가
+창(window)이 차면 마지막 청크를 뺀 나머지를 내보내고, 마지막 청크 시작부터만 남긴다.
+문서가 아무리 커도 버퍼는 창 크기 + 블록 크기를 넘지 않는다.
+
+길이 단위는 문자 수다 (한국어 문서에서 토큰 수보다 예측이 쉬움).
+"""
+from typing import Iterable, Iterator, List, Sequence, Tuple
+import re
+
+
+Span = Tuple[int, int]
+
+DEFAULT_CHUNK_SIZE = 800
+DEFAULT_OVERLAP = 100
+
+# 재귀 청킹 구분자 (앞쪽이 더 큰 의미 단위)
+RECURSIVE_SEPARATORS = ("\n\n", "\n", ". ", "다. ", "? ", "! ", " ")
+
+# 문장 끝: 마침표/물음표/느낌표(한중일 포함) 뒤 공백, 또는 빈 줄
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s+|\n\s*\n")
+
+
+class Chunker:
+    """
+    청킹 전략 기반 클래스
+
+    Args:
+        size: 청크 최대 길이(문자)
+        overlap: 이웃 청크가 겹치는 길이(문자, size보다 작아야 함)
+    """
+
+    name = "base"
+
+    def __init__(self, size: int = DEFAULT_CHUNK_SIZE, overlap: int = DEFAULT_OVERLAP):
+        if not 0 <= overlap < size:
+            raise ValueError(f"overlap은 0 이상 size({size}) 미만이어야 함: {overlap}")
+        self.size = size
+        self.overlap = overlap
+
+    def spans(self, text: str) -> List[Span]:
+        raise NotImplementedError
+
+    def split(self, text: str) -> List[str]:
+        """텍스트 전체를 청크 문자열로"""
+        return [text[start:end] for start, end in self.spans(text)]
+
+    def stream(self, blocks: Iterable[str], window: int = 0) -> Iterator[Tuple[int, str]]:
+        """
+        텍스트 블록 스트림을 청크로 (메모리는 window + 블록 크기로 제한)
+
+        Args:
+            blocks: 문서를 이어 붙이면 원문이 되는 텍스트 조각들
+            window: 버퍼가 이 길이를 넘으면 확정된 청크를 내보냄 (기본 size × 8)
+
+        Yields:
+            (문서 내 시작 위치, 청크 문자열)
+        """
+        window = window or self.size * 8
+        buffer, base = "", 0
+        for block in blocks:
+            buffer += block
+            if len(buffer) < window:
+                continue
+            spans = self.spans(buffer)
+            # 마지막 청크는 뒤에 이어질 텍스트에 따라 달라질 수 있어 보류
+            for start, end in spans[:-1]:
+                yield base + start, buffer[start:end]
+            keep = spans[-1][0] if spans else len(buffer)
+            buffer, base = buffer[keep:], base + keep
+        for start, end in self.spans(buffer):
+            yield base + start, buffer[start:end]
+
+    def _fixed(self, start: int, end: int) -> List[Span]:
+        """구간을 size 단위로 자르기 (overlap만큼 겹침)"""
+        step = self.size - self.overlap
+        spans = []
+        position = start
+        while position < end:
+            spans.append((position, min(position + self.size, end)))
+            if position + self.size >= end:
+                break
+            position += step
+        return spans
+
+    def _merge(self, pieces: Sequence[Span], text: str) -> List[Span]:
+        """인접 조각을 size 이하로 묶고, 다음 청크는 앞 청크의 끝 조각들(overlap 이하)부터 시작"""
+        chunks: List[Span] = []
+        current: List[Span] = []
+        for piece in pieces:
+            if current and piece[1] - current[0][0] > self.size:
+                chunks.append((current[0][0], current[-1][1]))
+                # overlap 이하가 될 때까지 앞쪽 조각 버리기
+                while current and (current[-1][1] - current[0][0] > self.overlap or piece[1] - current[0][0] > self.size):
+                    current.pop(0)
+            current.append(piece)
+        if current:
+            chunks.append((current[0][0], current[-1][1]))
+        return [span for span in chunks if text[span[0]:span[1]].strip()]
+
+
+class FixedChunker(Chunker):
+    """고정 길이 청킹"""
+
+    name = "fixed"
+
+    def spans(self, text: str) -> List[Span]:
+        return [span for span in self._fixed(0, len(text)) if text[span[0]:span[1]].strip()]
+
+
+class RecursiveChunker(Chunker):
+    """
+    재귀 구분자 청킹 - 문단 → 줄 → 문장 → 단어 순으로 나눠 size 이하가 되면 묶음
+    """
+
+    name = "recursive"
+
+    def __init__(self, size: int = DEFAULT_CHUNK_SIZE, overlap: int = DEFAULT_OVERLAP,
+                 separators: Sequence[str] = RECURSIVE_SEPARATORS):
+        super().__init__(size, overlap)
+        self.separators = tuple(separators)
+
+    def spans(self, text: str) -> List[Span]:
+        return self._merge(self._pieces(text, 0, len(text), 0), text)
+
+    def _pieces(self, text: str, start: int, end: int, level: int) -> List[Span]:
+        """구간을 size 이하 조각들로 (구분자는 앞 조각 끝에 붙임)"""
+        if end - start <= self.size:
+            return [(start, end)]
+        if level >= len(self.separators):
+            # 겹침은 _merge가 조각 단위로 처리하므로 여기서는 겹치지 않게 자름
+            return [(position, min(position + self.size, end)) for position in range(start, end, self.size)]
+        separator = self.separators[level]
+        pieces = []
+        position = start
+        while position < end:
+            found = text.find(separator, position, end)
+            piece_end = end if found < 0 else found + len(separator)
+            if piece_end - position > self.size:
+                pieces.extend(self._pieces(text, position, piece_end, level + 1))
+            else:
+                pieces.append((position, piece_end))
+            position = piece_end
+        return pieces
+
+
+class SentenceChunker(Chunker):
+    """
+    문장 단위 청킹 - 문장 경계에서만 자르고, 겹침도 문장 단위
+    (size보다 긴 문장은 고정 길이로 자름)
+    """
+
+    name = "sentence"
+
+    def spans(self, text: str) -> List[Span]:
+        sentences = []
+        position = 0
+        for match in _SENTENCE_END.finditer(text):
+            sentences.append((position, match.end()))
+            position = match.end()
+        if position < len(text):
+            sentences.append((position, len(text)))
+
+        pieces: List[Span] = []
+        for start, end in sentences:
+            if end - start > self.size:
+                pieces.extend((p, min(p + self.size, end)) for p in range(start, end, self.size))
+            else:
+                pieces.append((start, end))
+        return self._merge(pieces, text)
+
+
+CHUNKERS = {
+    chunker.name: chunker
+    for chunker in (FixedChunker, RecursiveChunker, SentenceChunker)
+}
+
+
+def create_chunker(strategy: str, size: int = DEFAULT_CHUNK_SIZE, overlap: int = DEFAULT_OVERLAP) -> Chunker:
+    """전략 이름(fixed / recursive / sentence)으로 청커 생성"""
+    if strategy not in CHUNKERS:
+        raise ValueError(f"지원하지 않는 청킹 전략: {strategy} ({', '.join(CHUNKERS)})")
+    return CHUNKERS[strategy](size, overlap)
@@ -0,0 +1,74 @@
+"""Dense 색인 - 정규화된 임베딩 행렬을 .npy 파일로 저장하고 mmap으로 조회
+
+파일 (세그먼트 디렉터리 안):
+- dense_vectors.npy: (문서 수, 차원) L2 정규화 float32 행렬
+
+정확한(brute-force) 내적 검색이며, 행렬을 블록 단위로 곱해 질의 한 번에
+필요한 메모리를 블록 크기로 제한한다. 페이지는 운영체제 페이지 캐시에서 공유된다.
+"""
+from typing import List, Tuple
+import os
+
+import numpy as np
+
+
+# 한 번에 곱하는 행 수 (블록 × 차원 × 4바이트만큼만 임시 메모리 사용)
+BLOCK_ROWS = 262144
+
+
+def write_dense(directory: str, vectors: np.ndarray) -> None:
+    """(문서 수, 차원) 벡터를 float32로 저장"""
+    np.save(os.path.join(directory, "dense_vectors.npy"), np.ascontiguousarray(vectors, dtype=np.float32))
+
+
+class DenseIndex:
+    """mmap으로 연 dense 벡터 색인"""
+
+    def __init__(self, directory: str):
+        self.vectors = np.load(os.path.join(directory, "dense_vectors.npy"), mmap_mode="r")
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    def search_batch(self, queries: np.ndarray, n: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        질의마다 내적 상위 n개 문서
+
+        Args:
+            queries: (질의 수, 차원) 정규화된 벡터
+
+        Returns:
+            질의별 (문서 번호 배열, 점수 배열) - 점수 내림차순
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        m = len(queries)
+        total = len(self.vectors)
+        n = min(n, total)
+        if n <= 0 or m == 0:
+            return [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)) for _ in range(m)]
+
+        best_ids = np.empty((m, 0), dtype=np.int64)
+        best_scores = np.empty((m, 0), dtype=np.float32)
+        for start in range(0, total, BLOCK_ROWS):
+            block = np.asarray(self.vectors[start:start + BLOCK_ROWS])
+            scores = queries @ block.T
+            keep = min(n, scores.shape[1])
+            top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            # 블록 상위 후보와 지금까지의 상위 후보를 합쳐 다시 n개로 줄임
+            ids = np.concatenate([best_ids, top + start], axis=1)
+            merged = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            keep = min(n, merged.shape[1])
+            top = np.argpartition(-merged, keep - 1, axis=1)[:, :keep]
+            best_ids = np.take_along_axis(ids, top, axis=1)
+            best_scores = np.take_along_axis(merged, top, axis=1)
+
+        results = []
+        for ids, scores in zip(best_ids, best_scores):
+            order = np.lexsort((ids, -scores))
+            results.append((ids[order], scores[order]))
+        return results
+
+    def search(self, query: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """질의 한 개에 대한 상위 n개 (문서 번호, 점수)"""
+        return self.search_batch(np.asarray(query, dtype=np.float32)[None, :], n)[0]
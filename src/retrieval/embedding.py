@@ -0,0 +1,52 @@
+"""로컬 임베딩 - 외부 모델 없이 CPU에서 계산하는 feature hashing 벡터
+
+BM25와 같은 토큰(한글 음절 bigram, 영문 단어)을 부호 있는 해시로 고정 차원에
+더한 뒤 L2 정규화한다. 어휘가 겹치지 않아도 부분 표기가 겹치면 가까워지므로
+sparse 검색과 순위가 다르게 나오고, RRF로 합쳤을 때 보완 효과가 있다.
+외부 임베딩 모델을 쓰려면 같은 embed(texts) 인터페이스를 가진 객체로 교체한다.
+"""
+from typing import Any, Dict, Sequence
+import zlib
+
+import numpy as np
+
+from ..utils.bm25 import tokenize
+
+
+DEFAULT_DIM = 256
+
+
+class HashingEmbedder:
+    """
+    토큰 feature hashing 임베딩
+
+    Args:
+        dim: 벡터 차원
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """(텍스트 수, dim) L2 정규화 float32 행렬"""
+        return self.embed_tokens([tokenize(text) for text in texts])
+
+    def embed_tokens(self, token_lists: Sequence[Sequence[str]]) -> np.ndarray:
+        """이미 토큰화한 텍스트들의 임베딩 (색인 작성 시 BM25와 토큰화를 공유)"""
+        matrix = np.zeros((len(token_lists), self.dim), dtype=np.float32)
+        for row, tokens in enumerate(token_lists):
+            hashes = np.fromiter(
+                (zlib.crc32(token.encode("utf-8")) for token in tokens), dtype=np.uint32
+            )
+            if hashes.size:
+                signs = np.where(hashes >> 31, -1.0, 1.0)
+                matrix[row] = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim)
+        # 반복 토큰의 영향을 줄이는 sublinear 스케일 후 정규화
+        np.copysign(np.log1p(np.abs(matrix)), matrix, out=matrix)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def config(self) -> Dict[str, Any]:
+        """색인 manifest에 기록할 설정 (검색 시 같은 임베딩인지 확인)"""
+        return {"type": "hashing", "dim": self.dim}
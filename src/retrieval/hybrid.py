@@ -0,0 +1,249 @@
+"""하이브리드 검색 - BM25(sparse)와 임베딩(dense) 결과를 Reciprocal Rank Fusion으로 결합
+
+색인 루트 디렉터리:
+- manifest.json: 공개된 세그먼트 목록과 임베딩 설정
+- seg-XXXXXX/: 세그먼트 (segment.py)
+
+두 검색기의 점수는 척도가 달라 직접 더할 수 없으므로 순위만 쓴다:
+
+    RRF(d) = Σ 1 / (rrf_k + rank_i(d))     (rank는 1부터, 목록에 없으면 0으로 기여)
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+import json
+import os
+import threading
+
+import numpy as np
+
+from ..utils.bm25 import tokenize
+from ..utils.log import get_logger
+from .embedding import HashingEmbedder
+from .segment import Segment
+
+logger = get_logger(__name__)
+
+
+DEFAULT_INDEX_DIR = os.path.join(".cache", "retrieval")
+MANIFEST_FILE = "manifest.json"
+
+DEFAULT_RRF_K = 60
+# 검색기마다 RRF에 넘기는 후보 수
+DEFAULT_CANDIDATES = 50
+
+# 질문마다 Task.context_docs_meta에 붙일 청크 수
+RETRIEVAL_CONTEXT_K = int(os.getenv("RETRIEVAL_CONTEXT_K", "3"))
+# context_docs_meta에 담는 본문 길이
+SNIPPET_CHARS = 200
+
+
+def rrf_fuse(rankings: Sequence[Sequence[Hashable]], k: int = DEFAULT_RRF_K) -> List[Tuple[Hashable, float]]:
+    """
+    순위 목록들을 RRF 점수로 합치기
+
+    Returns:
+        [(항목, RRF 점수), ...] 점수 내림차순 (동점은 먼저 등장한 항목 우선)
+    """
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, 1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+@dataclass(frozen=True)
+class RetrievedChunk:
+    """검색 결과 한 건"""
+    segment: int
+    doc_id: int
+    score: float                 # RRF 점수
+    sparse_rank: Optional[int]   # 각 검색기에서의 순위 (1부터, 후보에 없으면 None)
+    dense_rank: Optional[int]
+
+
+# ============ 색인 루트 (manifest) ============
+
+def read_manifest(root: str) -> Optional[Dict[str, Any]]:
+    """manifest (색인이 없으면 None)"""
+    try:
+        with open(os.path.join(root, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def new_segment_path(root: str) -> str:
+    """다음 세그먼트 디렉터리 경로 (아직 만들지 않음)"""
+    os.makedirs(root, exist_ok=True)
+    numbers = [int(name[4:]) for name in os.listdir(root) if name.startswith("seg-") and name[4:].isdigit()]
+    return os.path.join(root, f"seg-{max(numbers, default=0) + 1:06d}")
+
+
+def publish_segments(root: str, segment_dirs: Sequence[str], embedder_config: Dict[str, Any]) -> None:
+    """
+    작성이 끝난 세그먼트들을 manifest에 추가 (단일 작성자 가정)
+
+    manifest는 임시 파일에 쓴 뒤 교체하므로 검색 쪽은 이전 목록이나 새 목록 중 하나만 본다.
+    """
+    manifest = read_manifest(root) or {"segments": [], "embedder": embedder_config}
+    if manifest["embedder"] != embedder_config:
+        raise ValueError(f"색인의 임베딩 설정과 다름: {manifest['embedder']} != {embedder_config}")
+    manifest["segments"].extend(os.path.basename(path) for path in segment_dirs)
+    tmp_path = os.path.join(root, f"{MANIFEST_FILE}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(root, MANIFEST_FILE))
+
+
+# ============ 검색기 ============
+
+class HybridRetriever:
+    """
+    색인 루트의 모든 세그먼트에 대한 sparse + dense 검색과 RRF 결합
+
+    Args:
+        root: 색인 루트 디렉터리
+        embedder: 질의 임베딩 객체 (None이면 manifest 설정으로 HashingEmbedder 생성)
+        rrf_k: RRF 상수 (클수록 하위 순위의 기여가 상위와 비슷해짐)
+    """
+
+    def __init__(self, root: str, embedder=None, rrf_k: int = DEFAULT_RRF_K):
+        manifest = read_manifest(root)
+        if manifest is None:
+            raise FileNotFoundError(f"검색 색인이 없음: {root}")
+        self.root = root
+        self.rrf_k = rrf_k
+        if embedder is None:
+            config = manifest["embedder"]
+            if config.get("type") != "hashing":
+                raise ValueError(f"embedder를 지정해야 하는 색인: {config}")
+            embedder = HashingEmbedder(dim=config["dim"])
+        self.embedder = embedder
+        self.segments = [Segment(os.path.join(root, name)) for name in manifest["segments"]]
+
+    def __len__(self) -> int:
+        return sum(segment.n_chunks for segment in self.segments)
+
+    def sparse_search(self, query: str, n: int) -> List[Tuple[int, int]]:
+        """BM25 상위 n개 (세그먼트, 문서 번호)"""
+        tokens = tokenize(query)
+        hits = []
+        for number, segment in enumerate(self.segments):
+            doc_ids, scores = segment.sparse.search(tokens, n)
+            hits.extend(zip(scores.tolist(), [number] * len(doc_ids), doc_ids.tolist()))
+        hits.sort(key=lambda hit: (-hit[0], hit[1], hit[2]))
+        return [(number, doc_id) for _, number, doc_id in hits[:n]]
+
+    def dense_search(self, query_vector: np.ndarray, n: int) -> List[Tuple[int, int]]:
+        """내적 상위 n개 (세그먼트, 문서 번호)"""
+        hits = []
+        for number, segment in enumerate(self.segments):
+            doc_ids, scores = segment.dense.search(query_vector, n)
+            hits.extend(zip(scores.tolist(), [number] * len(doc_ids), doc_ids.tolist()))
+        hits.sort(key=lambda hit: (-hit[0], hit[1], hit[2]))
+        return [(number, doc_id) for _, number, doc_id in hits[:n]]
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        candidates: int = DEFAULT_CANDIDATES,
+        query_vector: Optional[np.ndarray] = None,
+    ) -> List[RetrievedChunk]:
+        """
+        하이브리드 상위 k개
+
+        Args:
+            query: 질의 텍스트 (BM25용, query_vector가 없으면 임베딩도 이 텍스트로 계산)
+            candidates: 검색기마다 RRF에 넘길 후보 수
+            query_vector: 미리 계산한 질의 임베딩
+        """
+        if query_vector is None:
+            query_vector = self.embedder.embed([query])[0]
+        sparse = self.sparse_search(query, candidates)
+        dense = self.dense_search(query_vector, candidates)
+        sparse_rank = {key: rank for rank, key in enumerate(sparse, 1)}
+        dense_rank = {key: rank for rank, key in enumerate(dense, 1)}
+        return [
+            RetrievedChunk(key[0], key[1], score, sparse_rank.get(key), dense_rank.get(key))
+            for key, score in rrf_fuse([sparse, dense], self.rrf_k)[:k]
+        ]
+
+    def record(self, hit: RetrievedChunk) -> Dict[str, Any]:
+        """검색 결과의 청크 레코드"""
+        return self.segments[hit.segment].record(hit.doc_id)
+
+    def close(self) -> None:
+        for segment in self.segments:
+            segment.close()
+
+
+# ============ 프로세스 공유 검색기 ============
+
+_retriever: Optional[HybridRetriever] = None
+_retriever_version: Optional[Tuple[str, float]] = None
+_retriever_lock = threading.Lock()
+
+
+def get_retriever() -> Optional[HybridRetriever]:
+    """
+    RETRIEVAL_INDEX_DIR(기본 .cache/retrieval)의 색인 검색기 (색인이 없으면 None)
+
+    manifest가 바뀌면(새 세그먼트 추가) 다음 호출에서 다시 연다.
+    """
+    global _retriever, _retriever_version
+    root = os.getenv("RETRIEVAL_INDEX_DIR", DEFAULT_INDEX_DIR)
+    try:
+        version = (root, os.stat(os.path.join(root, MANIFEST_FILE)).st_mtime)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if version != _retriever_version:
+        with _retriever_lock:
+            if version != _retriever_version:
+                # 이전 검색기는 진행 중인 검색이 있을 수 있어 닫지 않고 참조만 놓음
+                _retriever = HybridRetriever(root)
+                _retriever_version = version
+                logger.info("📚 검색 색인 로드: %s (%s개 청크)", root, len(_retriever))
+    return _retriever
+
+
+def index_version() -> Optional[float]:
+    """RETRIEVAL_INDEX_DIR manifest 수정 시각 (색인이 없으면 None, 응답 캐시 키에 사용)"""
+    root = os.getenv("RETRIEVAL_INDEX_DIR", DEFAULT_INDEX_DIR)
+    try:
+        return os.stat(os.path.join(root, MANIFEST_FILE)).st_mtime
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def retrieve_context_docs(question: str, k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    질문과 관련된 문서 청크 메타데이터 (Task.context_docs_meta 형식, 색인이 없으면 빈 목록)
+
+    색인이 손상됐거나(반쯤 쓰인 세그먼트, 임베딩 설정 불일치) 검색이 실패해도
+    대화는 계속되도록 경고만 남기고 빈 목록을 돌려준다.
+
+    Returns:
+        [{"chunk_id", "doc_id", "title", "source", "score", "snippet"}, ...]
+    """
+    if not question.strip():
+        return []
+    try:
+        retriever = get_retriever()
+        if retriever is None:
+            return []
+        hits = [(hit, retriever.record(hit)) for hit in retriever.search(question, k or RETRIEVAL_CONTEXT_K)]
+    except Exception as e:
+        logger.warning("⚠️ 문서 검색 실패 - 참고 자료 없이 진행: %s", e)
+        return []
+    docs = []
+    for hit, record in hits:
+        docs.append({
+            "chunk_id": record.get("id", f"{hit.segment}:{hit.doc_id}"),
+            "doc_id": record.get("doc_id", ""),
+            "title": record.get("title", ""),
+            "source": record.get("source", ""),
+            "score": round(hit.score, 6),
+            "snippet": record.get("text", "")[:SNIPPET_CHARS],
+        })
+    return docs
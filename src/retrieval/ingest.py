@@ -0,0 +1,310 @@
+"""문서 수집(ingestion) - 스트리밍 청킹 → 해시 중복 제거 → 프로세스 풀 토큰화/임베딩 → 세그먼트
+
+흐름:
+1. 문서를 블록 단위로 읽어 청커에 흘려보냄 (문서 전체를 메모리에 올리지 않음)
+2. 청크 본문 해시로 중복 제거 (색인에 이미 있는 청크 포함)
+3. 청크 배치를 프로세스 풀에서 토큰화/임베딩 (진행 중인 배치 수 제한)
+4. segment_chunks개가 모일 때마다 세그먼트로 내려쓰고, 끝나면 한 번에 manifest에 공개
+
+메모리는 문서 크기와 무관하게 (읽기 블록 + 청커 창 + 진행 중 배치 + 세그먼트 하나)로 제한된다.
+실패하면 이번 실행에서 쓴 세그먼트를 지우므로 검색 쪽은 수집 전 색인만 본다.
+
+실행:
+    python -m src.retrieval.ingest docs/ notes.md --strategy sentence
+    cat pasted.txt | python -m src.retrieval.ingest - --title "붙여넣은 메모"
+"""
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+import argparse
+import codecs
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+from ..utils.bm25 import tokenize
+from ..utils.log import get_logger
+from ..utils.metrics import REGISTRY
+from .chunking import CHUNKERS, DEFAULT_CHUNK_SIZE, DEFAULT_OVERLAP, Chunker, create_chunker
+from .embedding import HashingEmbedder
+from .hybrid import DEFAULT_INDEX_DIR, new_segment_path, publish_segments, read_manifest
+from .segment import Segment, SegmentWriter, chunk_hash
+
+logger = get_logger(__name__)
+
+
+# 세그먼트 하나에 담는 최대 청크 수 (수집 중 메모리 상한을 정함)
+INGEST_SEGMENT_CHUNKS = int(os.getenv("INGEST_SEGMENT_CHUNKS", "20000"))
+# 프로세스 풀 작업 하나에 보내는 청크 수
+INGEST_BATCH_CHUNKS = int(os.getenv("INGEST_BATCH_CHUNKS", "256"))
+# 파일을 읽는 블록 크기(바이트)
+READ_BLOCK_BYTES = 1 << 20
+# 디렉터리에서 수집할 파일 확장자
+INGEST_SUFFIXES = (".txt", ".md", ".markdown", ".rst")
+
+INGEST_BYTES = REGISTRY.counter("rag_edu_ingest_bytes_total", "수집한 문서 바이트 수")
+INGEST_CHUNKS = REGISTRY.counter("rag_edu_ingest_chunks_total", "색인에 추가한 청크 수")
+INGEST_DUPLICATES = REGISTRY.counter("rag_edu_ingest_duplicate_chunks_total", "중복이라 건너뛴 청크 수")
+
+
+@dataclass
+class Document:
+    """수집할 문서 하나 (blocks를 이어 붙이면 본문)"""
+    doc_id: str
+    title: str
+    source: str
+    blocks: Iterable[str]
+
+
+def read_blocks(stream, block_bytes: int = READ_BLOCK_BYTES) -> Iterator[str]:
+    """바이너리 스트림을 UTF-8 텍스트 블록으로 (블록 경계에 걸친 멀티바이트 문자도 안전)"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        data = stream.read(block_bytes)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _file_blocks(path: str) -> Iterator[str]:
+    with open(path, "rb") as f:
+        yield from read_blocks(f)
+
+
+def file_documents(paths: Sequence[str]) -> Iterator[Document]:
+    """파일/디렉터리 경로들의 문서 (디렉터리는 INGEST_SUFFIXES 파일을 재귀로, "-"는 표준 입력)"""
+    for path in paths:
+        if path == "-":
+            yield Document("stdin", "stdin", "-", read_blocks(sys.stdin.buffer))
+        elif os.path.isdir(path):
+            for directory, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(INGEST_SUFFIXES):
+                        yield _file_document(os.path.join(directory, filename))
+        else:
+            yield _file_document(path)
+
+
+def _file_document(path: str) -> Document:
+    return Document(os.path.normpath(path), os.path.basename(path), os.path.abspath(path), _file_blocks(path))
+
+
+def text_document(doc_id: str, text: str, title: str = "", source: str = "") -> Document:
+    """붙여넣은 텍스트 문서"""
+    return Document(doc_id, title or doc_id, source, [text])
+
+
+def _encode_batch(embedder, texts: List[str]) -> Tuple[List[List[str]], np.ndarray]:
+    """(워커 프로세스) 청크 배치 토큰화 + 임베딩 (토큰을 받는 임베딩이면 토큰화 결과 공유)"""
+    token_lists = [tokenize(text) for text in texts]
+    if hasattr(embedder, "embed_tokens"):
+        return token_lists, embedder.embed_tokens(token_lists)
+    return token_lists, embedder.embed(texts)
+
+
+@dataclass
+class IngestReport:
+    """수집 결과"""
+    documents: int = 0
+    bytes: int = 0
+    chunks: int = 0           # 색인에 추가한 청크
+    duplicates: int = 0       # 중복이라 건너뛴 청크
+    segments: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"문서 {self.documents:,}개, {self.bytes / 1e6:,.2f}MB → 청크 {self.chunks:,}개 "
+            f"(중복 {self.duplicates:,}개 제외), 세그먼트 {self.segments}개, {self.seconds:.2f}s "
+            f"({self.mb_per_second:,.2f} MB/s, {self.chunks_per_second:,.0f} chunks/s)"
+        )
+
+
+class Ingestor:
+    """
+    문서를 청킹해 검색 색인에 추가
+
+    Args:
+        root: 색인 루트 (None이면 RETRIEVAL_INDEX_DIR, 기본 .cache/retrieval)
+        chunker: 청킹 전략 (기본 RecursiveChunker)
+        embedder: 임베딩 객체 (None이면 기존 색인의 설정, 색인이 없으면 HashingEmbedder)
+        workers: 토큰화/임베딩 프로세스 수 (0이면 현재 프로세스에서 처리)
+        segment_chunks: 세그먼트 하나의 최대 청크 수
+        batch_chunks: 풀 작업 하나의 청크 수
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        chunker: Optional[Chunker] = None,
+        embedder=None,
+        workers: Optional[int] = None,
+        segment_chunks: int = INGEST_SEGMENT_CHUNKS,
+        batch_chunks: int = INGEST_BATCH_CHUNKS,
+    ):
+        self.root = root or os.getenv("RETRIEVAL_INDEX_DIR", DEFAULT_INDEX_DIR)
+        self.chunker = chunker or create_chunker("recursive")
+        manifest = read_manifest(self.root)
+        if embedder is None:
+            config = manifest["embedder"] if manifest else HashingEmbedder().config()
+            if config.get("type") != "hashing":
+                raise ValueError(f"embedder를 지정해야 하는 색인: {config}")
+            embedder = HashingEmbedder(dim=config["dim"])
+        self.embedder = embedder
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.segment_chunks = segment_chunks
+        # 세그먼트는 배치 단위로 채우므로 배치가 세그먼트보다 크면 안 됨
+        self.batch_chunks = min(batch_chunks, segment_chunks)
+        self._seen = self._existing_hashes(manifest)
+
+    def _existing_hashes(self, manifest: Optional[Dict[str, Any]]) -> Set[int]:
+        """이미 색인된 청크 해시"""
+        seen: Set[int] = set()
+        for name in (manifest or {}).get("segments", []):
+            segment = Segment(os.path.join(self.root, name))
+            seen.update(segment.hashes().tolist())
+            segment.close()
+        return seen
+
+    def _batches(
+        self, documents: Iterable[Document], report: IngestReport, fresh: Set[int]
+    ) -> Iterator[List[Tuple[Dict[str, Any], int]]]:
+        """중복을 뺀 (청크 레코드, 해시) 배치 (이번 실행의 새 해시는 fresh에 모음)"""
+        batch = []
+        for document in documents:
+            report.documents += 1
+            for number, (start, text) in enumerate(self.chunker.stream(self._counted(document.blocks, report))):
+                digest = chunk_hash(text)
+                if digest in self._seen or digest in fresh:
+                    report.duplicates += 1
+                    continue
+                fresh.add(digest)
+                batch.append(({
+                    "id": f"{document.doc_id}#{number}",
+                    "doc_id": document.doc_id,
+                    "title": document.title,
+                    "source": document.source,
+                    "start": start,
+                    "text": text,
+                }, digest))
+                if len(batch) >= self.batch_chunks:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _counted(blocks: Iterable[str], report: IngestReport) -> Iterator[str]:
+        for block in blocks:
+            report.bytes += len(block.encode("utf-8"))
+            yield block
+
+    def ingest(self, documents: Iterable[Document]) -> IngestReport:
+        """
+        문서들을 색인에 추가하고 새 세그먼트를 공개
+
+        Returns:
+            IngestReport (처리량 포함)
+        """
+        report = IngestReport()
+        start = time.perf_counter()
+        written: List[str] = []
+        fresh: Set[int] = set()
+        writer = SegmentWriter(self.embedder)
+        vectors: List[np.ndarray] = []
+
+        def flush():
+            nonlocal writer, vectors
+            if len(writer):
+                written.append(writer.write(new_segment_path(self.root), np.vstack(vectors)))
+                writer, vectors = SegmentWriter(self.embedder), []
+
+        def collect(batch, future):
+            token_lists, batch_vectors = future.result()
+            for (record, digest), tokens in zip(batch, token_lists):
+                writer.add(record, tokens, digest)
+            vectors.append(batch_vectors)
+            report.chunks += len(batch)
+            if len(writer) >= self.segment_chunks:
+                flush()
+
+        pool = ProcessPoolExecutor(self.workers) if self.workers > 0 else None
+        # 진행 중인 배치 수 제한 (읽기가 토큰화보다 빨라도 메모리가 늘지 않게)
+        pending = deque()
+        try:
+            for batch in self._batches(documents, report, fresh):
+                texts = [record["text"] for record, _ in batch]
+                if pool is None:
+                    future = Future()
+                    future.set_result(_encode_batch(self.embedder, texts))
+                else:
+                    future = pool.submit(_encode_batch, self.embedder, texts)
+                pending.append((batch, future))
+                if len(pending) > max(self.workers, 1) * 2:
+                    collect(*pending.popleft())
+            while pending:
+                collect(*pending.popleft())
+            flush()
+            if written:
+                publish_segments(self.root, written, self.embedder.config())
+            self._seen |= fresh
+        except BaseException:
+            for directory in written:
+                shutil.rmtree(directory, ignore_errors=True)
+            raise
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        report.segments = len(written)
+        report.seconds = time.perf_counter() - start
+        INGEST_BYTES.inc(report.bytes)
+        INGEST_CHUNKS.inc(report.chunks)
+        INGEST_DUPLICATES.inc(report.duplicates)
+        logger.info("📥 문서 수집 (%s): %s", self.root, report.summary())
+        return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> IngestReport:
+    parser = argparse.ArgumentParser(description="문서를 청킹해 로컬 검색 색인에 추가")
+    parser.add_argument("paths", nargs="+", help="파일/디렉터리 경로 (\"-\"는 표준 입력)")
+    parser.add_argument("--index", default=None, help="색인 루트 (기본 RETRIEVAL_INDEX_DIR 또는 .cache/retrieval)")
+    parser.add_argument("--strategy", choices=sorted(CHUNKERS), default="recursive")
+    parser.add_argument("--size", type=int, default=DEFAULT_CHUNK_SIZE, help="청크 최대 길이(문자)")
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP, help="청크 겹침 길이(문자)")
+    parser.add_argument("--workers", type=int, default=None, help="토큰화 프로세스 수 (0: 단일 프로세스)")
+    parser.add_argument("--title", default=None, help="표준 입력 문서의 제목")
+    args = parser.parse_args(argv)
+
+    documents = file_documents(args.paths)
+    if args.title:
+        documents = (
+            Document(doc.doc_id, args.title, doc.source, doc.blocks) if doc.source == "-" else doc
+            for doc in documents
+        )
+    ingestor = Ingestor(args.index, create_chunker(args.strategy, args.size, args.overlap), workers=args.workers)
+    report = ingestor.ingest(documents)
+    print(report.summary())
+    return report
+
+
+if __name__ == "__main__":
+    main()
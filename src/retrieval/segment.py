@@ -0,0 +1,187 @@
+"""색인 세그먼트 - sparse/dense 색인과 청크 원문을 한 디렉터리에 묶은 불변 단위
+
+세그먼트 디렉터리:
+- segment.json: 청크 수, 임베딩 설정, BM25 파라미터
+- sparse_*.npy / dense_vectors.npy: 각 색인 (sparse.py, dense.py)
+- chunks.jsonl + chunk_offsets.npy: 청크 레코드와 줄 시작 위치 (mmap으로 필요한 줄만 읽음)
+- chunk_hashes.npy: 청크 본문 해시 (중복 청크 판별용, 선택)
+
+세그먼트는 다 쓴 뒤 이름을 바꿔(rename) 공개하므로 읽는 쪽은 반쯤 쓰인 파일을 보지 않는다.
+새 문서는 기존 세그먼트를 고치지 않고 새 세그먼트로 추가한다.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import time
+
+import numpy as np
+
+from ..utils.bm25 import DEFAULT_B, DEFAULT_K1, tokenize
+from .dense import DenseIndex, write_dense
+from .sparse import SparseIndex, write_sparse
+
+
+SEGMENT_FILE = "segment.json"
+HASHES_FILE = "chunk_hashes.npy"
+
+
+def chunk_hash(text: str) -> int:
+    """청크 본문 해시 (공백 차이는 무시, 64비트 부호 없는 정수)"""
+    normalized = " ".join(text.split()).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(normalized, digest_size=8).digest(), "little")
+
+
+def write_segment(
+    directory: str,
+    records: Iterable[Dict[str, Any]],
+    vocab: Sequence[str],
+    token_ids: np.ndarray,
+    doc_ptr: np.ndarray,
+    vectors: np.ndarray,
+    embedder_config: Dict[str, Any],
+    k1: float = DEFAULT_K1,
+    b: float = DEFAULT_B,
+    hashes: Optional[np.ndarray] = None,
+) -> str:
+    """
+    토큰화/임베딩이 끝난 청크들로 세그먼트 작성
+
+    Args:
+        directory: 만들 세그먼트 디렉터리 (이미 있으면 실패)
+        records: 청크 레코드 (id, text 등 JSON 직렬화 가능한 dict), 순서가 곧 문서 번호
+        vocab / token_ids / doc_ptr: 토큰화 결과 (write_sparse 참고)
+        vectors: (청크 수, 차원) 정규화된 임베딩
+        hashes: 청크별 chunk_hash 값 (있으면 chunk_hashes.npy로 저장)
+
+    Returns:
+        세그먼트 디렉터리 경로
+    """
+    tmp_dir = f"{directory}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir)
+    try:
+        offsets = [0]
+        with open(os.path.join(tmp_dir, "chunks.jsonl"), "wb") as f:
+            for record in records:
+                line = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        n_chunks = len(offsets) - 1
+        if n_chunks != len(doc_ptr) - 1 or n_chunks != len(vectors):
+            raise ValueError(f"청크 수 불일치: records={n_chunks}, docs={len(doc_ptr) - 1}, vectors={len(vectors)}")
+        np.save(os.path.join(tmp_dir, "chunk_offsets.npy"), np.asarray(offsets, dtype=np.int64))
+        if hashes is not None:
+            if len(hashes) != n_chunks:
+                raise ValueError(f"청크 수 불일치: records={n_chunks}, hashes={len(hashes)}")
+            np.save(os.path.join(tmp_dir, HASHES_FILE), np.asarray(hashes, dtype=np.uint64))
+
+        write_sparse(tmp_dir, vocab, token_ids, doc_ptr, k1=k1, b=b)
+        write_dense(tmp_dir, vectors)
+
+        with open(os.path.join(tmp_dir, SEGMENT_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "n_chunks": n_chunks,
+                "embedder": embedder_config,
+                "k1": k1,
+                "b": b,
+                "created_at": time.time(),
+            }, f)
+        os.rename(tmp_dir, directory)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return directory
+
+
+class SegmentWriter:
+    """
+    청크를 모아 세그먼트 하나로 쓰는 도우미 (토큰화/임베딩을 이 프로세스에서 수행)
+
+    Args:
+        embedder: embed(texts)와 config()를 가진 임베딩 객체
+    """
+
+    def __init__(self, embedder):
+        self.embedder = embedder
+        self.records: List[Dict[str, Any]] = []
+        self._vocab: Dict[str, int] = {}
+        self._token_ids: List[int] = []
+        self._doc_ptr = [0]
+        self._hashes: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, record: Dict[str, Any], tokens: Optional[Sequence[str]] = None, digest: Optional[int] = None) -> None:
+        """
+        청크 추가
+
+        Args:
+            record: "text"를 포함한 청크 레코드
+            tokens: 미리 토큰화한 결과 (없으면 record["text"]를 토큰화)
+            digest: 미리 계산한 chunk_hash (없으면 계산)
+        """
+        if tokens is None:
+            tokens = tokenize(record["text"])
+        vocab = self._vocab
+        self._token_ids.extend(vocab.setdefault(token, len(vocab)) for token in tokens)
+        self._doc_ptr.append(len(self._token_ids))
+        self._hashes.append(chunk_hash(record["text"]) if digest is None else digest)
+        self.records.append(record)
+
+    def write(self, directory: str, vectors: Optional[np.ndarray] = None) -> str:
+        """
+        세그먼트 파일 작성
+
+        Args:
+            vectors: 미리 계산한 임베딩 (없으면 embedder로 계산)
+        """
+        if vectors is None:
+            vectors = self.embedder.embed([record["text"] for record in self.records])
+        return write_segment(
+            directory,
+            self.records,
+            list(self._vocab),
+            np.asarray(self._token_ids, dtype=np.int64),
+            np.asarray(self._doc_ptr, dtype=np.int64),
+            vectors,
+            self.embedder.config(),
+            hashes=np.asarray(self._hashes, dtype=np.uint64),
+        )
+
+
+class Segment:
+    """읽기 전용으로 연 세그먼트 (모든 배열/청크 파일은 mmap)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, SEGMENT_FILE), encoding="utf-8") as f:
+            self.info = json.load(f)
+        self.n_chunks = self.info["n_chunks"]
+        self.sparse = SparseIndex(directory, self.n_chunks)
+        self.dense = DenseIndex(directory)
+        self._offsets = np.load(os.path.join(directory, "chunk_offsets.npy"), mmap_mode="r")
+        self._chunks_file = open(os.path.join(directory, "chunks.jsonl"), "rb")
+        self._chunks = (
+            mmap.mmap(self._chunks_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._offsets[-1] > 0 else b""
+        )
+
+    def hashes(self) -> np.ndarray:
+        """청크 본문 해시 (해시 없이 쓴 세그먼트는 빈 배열)"""
+        path = os.path.join(self.directory, HASHES_FILE)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=np.uint64)
+        return np.load(path, mmap_mode="r")
+
+    def record(self, doc_id: int) -> Dict[str, Any]:
+        """문서 번호로 청크 레코드 조회"""
+        start, end = int(self._offsets[doc_id]), int(self._offsets[doc_id + 1])
+        return json.loads(self._chunks[start:end])
+
+    def close(self) -> None:
+        if isinstance(self._chunks, mmap.mmap):
+            self._chunks.close()
+        self._chunks_file.close()
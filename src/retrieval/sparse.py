@@ -0,0 +1,129 @@
+"""Sparse 색인 - BM25 역색인을 CSR 배열 파일로 저장하고 mmap으로 조회
+
+파일 (세그먼트 디렉터리 안):
+- sparse_vocab.npy: 정렬된 토큰 배열 (토큰 id = 배열 위치, searchsorted로 조회)
+- sparse_offsets.npy: 토큰 id별 posting 시작 위치 (int64, 어휘 수 + 1)
+- sparse_docs.npy: posting 문서 번호 (int32, 토큰 id 순 → 문서 번호 순)
+- sparse_weights.npy: posting별 미리 계산한 BM25 가중치 (float32)
+
+모든 배열은 np.load(mmap_mode="r")로 열리므로 여러 워커 프로세스가 같은 페이지 캐시를 공유한다.
+"""
+from typing import List, Sequence, Tuple
+import os
+
+import numpy as np
+
+from ..utils.bm25 import DEFAULT_B, DEFAULT_K1
+
+
+# posting 합계가 문서 수의 이 비율보다 작으면 전체 점수 배열 대신 후보만 집계
+_CANDIDATE_RATIO = 0.125
+
+
+def write_sparse(
+    directory: str,
+    vocab: Sequence[str],
+    token_ids: np.ndarray,
+    doc_ptr: np.ndarray,
+    k1: float = DEFAULT_K1,
+    b: float = DEFAULT_B,
+) -> None:
+    """
+    토큰화된 문서들로 BM25 CSR 색인 파일 작성 (배열 연산만 사용)
+
+    Args:
+        directory: 세그먼트 디렉터리
+        vocab: 토큰 id → 토큰 (순서 무관)
+        token_ids: 모든 문서의 토큰 id를 이어 붙인 배열
+        doc_ptr: 문서 i의 토큰은 token_ids[doc_ptr[i]:doc_ptr[i + 1]] (길이 = 문서 수 + 1)
+    """
+    doc_ptr = np.asarray(doc_ptr, dtype=np.int64)
+    n_docs = len(doc_ptr) - 1
+    lengths = np.diff(doc_ptr).astype(np.float32)
+    average_length = float(lengths.mean()) if n_docs and lengths.mean() > 0 else 1.0
+
+    # 토큰 id를 정렬된 어휘 순서로 재배치
+    vocab_array = np.asarray(vocab, dtype=str)
+    order = np.argsort(vocab_array, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    terms = rank[np.asarray(token_ids, dtype=np.int64)]
+    docs = np.repeat(np.arange(n_docs, dtype=np.int64), np.diff(doc_ptr))
+
+    # (토큰, 문서) 쌍별 빈도 - 정렬 결과가 곧 CSR 순서
+    keys, tf = np.unique(terms * max(n_docs, 1) + docs, return_counts=True)
+    posting_terms = keys // max(n_docs, 1)
+    posting_docs = keys % max(n_docs, 1)
+
+    df = np.bincount(posting_terms, minlength=len(vocab_array))
+    offsets = np.zeros(len(vocab_array) + 1, dtype=np.int64)
+    np.cumsum(df, out=offsets[1:])
+
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    norm = k1 * (1 - b + b * lengths[posting_docs] / average_length)
+    weights = idf[posting_terms] * tf * (k1 + 1) / (tf + norm)
+
+    np.save(os.path.join(directory, "sparse_vocab.npy"), vocab_array[order])
+    np.save(os.path.join(directory, "sparse_offsets.npy"), offsets)
+    np.save(os.path.join(directory, "sparse_docs.npy"), posting_docs.astype(np.int32))
+    np.save(os.path.join(directory, "sparse_weights.npy"), weights.astype(np.float32))
+
+
+class SparseIndex:
+    """mmap으로 연 BM25 CSR 색인"""
+
+    def __init__(self, directory: str, n_docs: int):
+        load = lambda name: np.load(os.path.join(directory, name), mmap_mode="r")
+        self.vocab = load("sparse_vocab.npy")
+        self.offsets = load("sparse_offsets.npy")
+        self.docs = load("sparse_docs.npy")
+        self.weights = load("sparse_weights.npy")
+        self.n_docs = n_docs
+
+    def token_ids(self, tokens: Sequence[str]) -> List[int]:
+        """어휘에 있는 토큰의 id (중복 제거)"""
+        if not len(self.vocab):
+            return []
+        query = np.asarray(sorted(set(tokens)), dtype=self.vocab.dtype)
+        positions = np.searchsorted(self.vocab, query)
+        positions = np.minimum(positions, len(self.vocab) - 1)
+        return positions[self.vocab[positions] == query].tolist()
+
+    def search(self, tokens: Sequence[str], n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        상위 n개 문서
+
+        Returns:
+            (문서 번호 배열, 점수 배열) - 점수 내림차순, 점수 0 제외
+        """
+        slices = [(int(self.offsets[t]), int(self.offsets[t + 1])) for t in self.token_ids(tokens)]
+        total = sum(end - start for start, end in slices)
+        if not total or n <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        if total < self.n_docs * _CANDIDATE_RATIO:
+            # 짧은 posting들 - 후보 문서만 모아 합산
+            docs = np.concatenate([self.docs[start:end] for start, end in slices])
+            weights = np.concatenate([self.weights[start:end] for start, end in slices])
+            candidates, inverse = np.unique(docs, return_inverse=True)
+            scores = np.bincount(inverse, weights=weights).astype(np.float32)
+        else:
+            candidates = None
+            scores = np.zeros(self.n_docs, dtype=np.float32)
+            for start, end in slices:
+                scores[self.docs[start:end]] += self.weights[start:end]
+
+        top = _top_n(scores, n)
+        top = top[scores[top] > 0]
+        doc_ids = top if candidates is None else candidates[top]
+        return doc_ids.astype(np.int64), scores[top]
+
+
+def _top_n(scores: np.ndarray, n: int) -> np.ndarray:
+    """점수 상위 n개 위치 (내림차순, 동점은 앞 번호 우선)"""
+    if n < len(scores):
+        top = np.argpartition(-scores, n - 1)[:n]
+    else:
+        top = np.arange(len(scores))
+    return top[np.lexsort((top, -scores[top]))]
+
@@ -1,14 +1,28 @@
 """상태 스키마 정의 - LangGraph에서 사용할 전역 상태 구조"""
-from typing import TypedDict, List, Dict, Optional, Annotated, Any
-from pydantic import BaseModel, Field
-import operator
+from typing import TypedDict, List, Dict, Optional, Annotated, Any, Set
+from pydantic import BaseModel, Field, PrivateAttr
+import hashlib
+import json
+import os
+
+from .utils.domain_index import DomainPackIndex, shared_index
+from .utils.memory_store import load_user_record
+
+
+# 메모리 상한 - 오래 쓰는 사용자/세션도 턴 수와 무관하게 일정한 크기 유지
+MEMORY_HISTORY_SIZE = int(os.getenv("MEMORY_HISTORY_SIZE", "20"))  # 최근 인터랙션 수
+MEMORY_QUIZ_SIZE = int(os.getenv("MEMORY_QUIZ_SIZE", "50"))  # 최근 퀴즈 기록 수
+CHAT_HISTORY_SIZE = int(os.getenv("CHAT_HISTORY_SIZE", "20"))  # 세션 대화 메시지 수
+
+# 익명 사용자 - 여러 사람이 공유하므로 메모리를 불러오거나 저장하지 않음
+DEFAULT_USER_ID = "default_user"
 
 
 # ============ Pydantic 모델 정의 ============
 
 class User(BaseModel):
     """사용자 정보"""
-    id: str = "default_user"
+    id: str = DEFAULT_USER_ID
     lang: str = "ko"
     prefs: Dict[str, Any] = Field(default_factory=dict)
     constraints: Dict[str, Any] = Field(default_factory=dict)
@@ -22,6 +36,28 @@ class DomainPack(BaseModel):
     question_bank: List[Dict[str, Any]] = Field(default_factory=list)
     tool_recipes: List[Dict[str, Any]] = Field(default_factory=list)
     version: str = "1.0"
+    domain: str = ""  # 생성 대상 분야 (세션에서 다음 턴 재사용 여부 판단)
+    
+    _index: Optional[DomainPackIndex] = PrivateAttr(default=None)
+    _fingerprint: Optional[str] = PrivateAttr(default=None)
+    
+    @property
+    def fingerprint(self) -> str:
+        """내용 해시 (같은 내용이면 다른 인스턴스여도 같은 값)"""
+        if self._fingerprint is None:
+            raw = json.dumps(self.model_dump(), sort_keys=True, ensure_ascii=False)
+            self._fingerprint = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        return self._fingerprint
+    
+    @property
+    def index(self) -> DomainPackIndex:
+        """조회용 인덱스 (같은 내용의 팩끼리 공유, 팩은 읽기 전용으로 취급)"""
+        if self._index is None:
+            self._index = shared_index(
+                self.fingerprint,
+                lambda: DomainPackIndex(self.taxonomy, self.glossary, self.question_bank),
+            )
+        return self._index
 
 
 class Signals(BaseModel):
@@ -79,11 +115,63 @@ class Evaluation(BaseModel):
     next_actions: List[str] = Field(default_factory=list)
 
 
+class MemoryStats(BaseModel):
+    """최근 기록 버퍼에서 밀려난 인터랙션/퀴즈의 누적 집계"""
+    interactions: int = 0
+    intent_counts: Dict[str, int] = Field(default_factory=dict)
+    confidence_sum: float = 0.0
+    quiz_answered: int = 0
+    quiz_correct: int = 0
+    concept_quiz: Dict[str, List[int]] = Field(default_factory=dict)  # 개념 → [응답 수, 정답 수]
+    
+    def add_interaction(self, log: Dict[str, Any]) -> None:
+        self.interactions += 1
+        intent = log.get("intent", "unknown")
+        self.intent_counts[intent] = self.intent_counts.get(intent, 0) + 1
+        self.confidence_sum += log.get("confidence", 0.0)
+    
+    def add_quiz(self, record: Dict[str, Any]) -> None:
+        correct = int(bool(record.get("correct")))
+        self.quiz_answered += 1
+        self.quiz_correct += correct
+        counts = self.concept_quiz.setdefault(record.get("concept", ""), [0, 0])
+        counts[0] += 1
+        counts[1] += correct
+
+
 class Memory(BaseModel):
-    """장기 메모리"""
-    seen_terms: List[str] = Field(default_factory=list)
+    """장기 메모리
+    
+    history/quiz_records는 최근 기록만 담는 고정 크기 버퍼이고,
+    밀려난 기록은 stats에 집계로 압축된다.
+    """
+    seen_terms: Set[str] = Field(default_factory=set)
     history: List[Dict[str, Any]] = Field(default_factory=list)
     quiz_records: List[Dict[str, Any]] = Field(default_factory=list)
+    stats: MemoryStats = Field(default_factory=MemoryStats)
+    
+    def record_interaction(self, log: Dict[str, Any]) -> None:
+        """인터랙션 추가 (MEMORY_HISTORY_SIZE 초과분은 집계로 압축)"""
+        self.history.append(log)
+        overflow = len(self.history) - MEMORY_HISTORY_SIZE
+        if overflow > 0:
+            for old in self.history[:overflow]:
+                self.stats.add_interaction(old)
+            del self.history[:overflow]
+    
+    def record_quiz(self, records: List[Dict[str, Any]]) -> None:
+        """퀴즈 기록 추가 (MEMORY_QUIZ_SIZE 초과분은 집계로 압축)"""
+        self.quiz_records.extend(records)
+        overflow = len(self.quiz_records) - MEMORY_QUIZ_SIZE
+        if overflow > 0:
+            for old in self.quiz_records[:overflow]:
+                self.stats.add_quiz(old)
+            del self.quiz_records[:overflow]
+
+
+def add_recent_messages(left: List[Dict[str, str]], right: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """chat_history 리듀서 - 이어 붙이되 최근 CHAT_HISTORY_SIZE개만 유지"""
+    return (left + right)[-CHAT_HISTORY_SIZE:]
 
 
 # ============ LangGraph State TypedDict ============
@@ -91,11 +179,11 @@ class Memory(BaseModel):
 class GraphState(TypedDict):
     """LangGraph에서 사용할 전역 상태
     
-    Annotated[List, operator.add]를 사용하여 메시지 누적
+    chat_history는 add_recent_messages 리듀서로 최근 메시지만 누적
     """
     # 사용자 입력
     user_message: str
-    chat_history: Annotated[List[Dict[str, str]], operator.add]
+    chat_history: Annotated[List[Dict[str, str]], add_recent_messages]
     
     # 분야 감지 (NEW)
     detected_domain: str
@@ -120,6 +208,9 @@ class GraphState(TypedDict):
     taxonomy_map: List[Dict[str, Any]]
     tool_advice: List[Dict[str, Any]]
     
+    # 세션 - 마지막 숙련도 프로필 시각 (0이면 아직 없음)
+    profiled_at: float
+    
     # 현재 단계
     current_step: str
     
@@ -127,29 +218,53 @@ class GraphState(TypedDict):
     final_response: str
 
 
-def create_initial_state(user_message: str = "") -> GraphState:
-    """초기 상태 생성"""
+def create_turn_input(user_message: str) -> Dict[str, Any]:
+    """
+    턴 단위 필드만 초기화한 입력
+    
+    세션 그래프의 두 번째 턴부터 사용한다. 여기 없는 user/domain_pack/mastery/
+    memory/profiled_at/chat_history는 체크포인트에 저장된 이전 턴의 값이 유지된다.
+    """
+    return {
+        "user_message": user_message,
+        "detected_domain": "",
+        "domain_confidence": 0.0,
+        "signals": Signals(),
+        "intent": Intent(),
+        "task": Task(question=user_message),
+        "plan": Plan(),
+        "answer": Answer(),
+        "gaps": Gaps(),
+        "eval": Evaluation(),
+        "needs_coldstart": False,
+        "needs_diagnostic": False,
+        "taxonomy_map": [],
+        "tool_advice": [],
+        "current_step": "start",
+        "final_response": ""
+    }
+
+
+def create_initial_state(user_message: str = "", user_id: str = DEFAULT_USER_ID) -> GraphState:
+    """
+    초기 상태 생성
+    
+    Args:
+        user_message: 사용자 입력 메시지
+        user_id: 사용자 ID (저장된 memory/mastery가 있으면 불러옴, 익명 사용자 제외)
+    """
+    memory, mastery = Memory(), Mastery()
+    record = load_user_record(user_id) if user_id != DEFAULT_USER_ID else None
+    if record is not None:
+        memory = Memory.model_validate(record["memory"])
+        mastery = Mastery.model_validate(record["mastery"])
+    
     return GraphState(
-        user_message=user_message,
         chat_history=[],
-        detected_domain="",
-        domain_confidence=0.0,
-        user=User(),
+        user=User(id=user_id),
         domain_pack=None,
-        signals=Signals(),
-        mastery=Mastery(),
-        intent=Intent(),
-        task=Task(question=user_message),
-        plan=Plan(),
-        answer=Answer(),
-        gaps=Gaps(),
-        eval=Evaluation(),
-        memory=Memory(),
-        needs_coldstart=False,
-        needs_diagnostic=False,
-        taxonomy_map=[],
-        tool_advice=[],
-        current_step="start",
-        final_response=""
+        mastery=mastery,
+        memory=memory,
+        profiled_at=0.0,
+        **create_turn_input(user_message)
     )
-
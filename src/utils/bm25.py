@@ -0,0 +1,143 @@
+"""BM25 검색 - DomainPack 내용(용어 사전/개념/문제 은행)에서 근거 문단 찾기
+
+한국어는 띄어쓰기 단위에 조사가 붙어 단어가 그대로 일치하지 않는 경우가 많아
+("청킹은" vs "청킹") 한글 구간은 음절 bigram으로, 영문/숫자는 단어로 토큰화한다.
+
+색인 시점에 (용어, 문단)마다 BM25 가중치를 미리 계산해 두므로, 조회는
+질의 토큰마다 배열 덧셈 한 번과 top-k 선택뿐이다.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+import math
+import re
+
+import numpy as np
+
+
+# 한글 음절 구간 / 영문·숫자 단어 (snake_case, kebab-case는 나눔)
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+
+# 질문형 어미/의문사 bigram - 거의 모든 질문에 나와 관련 없는 문단을 끌어올림
+STOP_BIGRAMS = frozenset({
+    "하나", "나요", "인가", "가요", "무엇", "엇인", "엇을", "어떻", "떻게", "어떤",
+    "해야", "뭐야", "뭔가", "있나", "있어", "니다", "습니", "세요", "하는", "하면",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어 인식 토큰화
+
+    - 한글 구간: 음절 bigram ("벡터검색" → 벡터, 터검, 검색), 한 글자면 그대로.
+      질문형 어미 bigram(STOP_BIGRAMS)은 제외
+    - 영문/숫자: 소문자 단어 ("Vector_DB" → vector, db)
+    """
+    tokens = []
+    for run in _TOKEN_PATTERN.findall(text.lower()):
+        if "가" <= run[0] <= "힣" and len(run) > 1:
+            bigrams = (run[i:i + 2] for i in range(len(run) - 1))
+            tokens.extend(bigram for bigram in bigrams if bigram not in STOP_BIGRAMS)
+        else:
+            tokens.append(run)
+    return tokens
+
+
+@dataclass(frozen=True)
+class Passage:
+    """검색 대상 문단"""
+    id: str       # "glossary:BM25", "concept:retrieval", "question:q3"
+    source: str   # glossary / concept / question
+    title: str
+    text: str
+
+
+class BM25Index:
+    """
+    문단 목록에 대한 Okapi BM25 역색인
+
+    Args:
+        passages: 색인할 문단 (순서가 곧 문단 번호)
+        k1: 용어 빈도 포화 계수
+        b: 문단 길이 정규화 계수
+    """
+
+    def __init__(self, passages: Sequence[Passage], k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        self.passages = tuple(passages)
+        self.passage_by_id: Dict[str, Passage] = {p.id: p for p in self.passages}
+        self.k1 = k1
+        self.b = b
+
+        tokenized = [tokenize(f"{p.title} {p.text}") for p in self.passages]
+        lengths = np.array([len(tokens) for tokens in tokenized], dtype=np.float64)
+        average_length = lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0
+
+        postings: Dict[str, Dict[int, int]] = {}
+        for doc_id, tokens in enumerate(tokenized):
+            for token in tokens:
+                frequencies = postings.setdefault(token, {})
+                frequencies[doc_id] = frequencies.get(doc_id, 0) + 1
+
+        # 토큰 → (문단 번호 배열, 미리 계산한 BM25 가중치 배열)
+        count = len(self.passages)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for token, frequencies in postings.items():
+            doc_ids = np.fromiter(frequencies.keys(), dtype=np.intp, count=len(frequencies))
+            tf = np.fromiter(frequencies.values(), dtype=np.float64, count=len(frequencies))
+            idf = math.log(1 + (count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            norm = k1 * (1 - b + b * lengths[doc_ids] / average_length)
+            self._postings[token] = (doc_ids, idf * tf * (k1 + 1) / (tf + norm))
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def scores(self, query: str) -> np.ndarray:
+        """질의에 대한 문단별 BM25 점수"""
+        scores = np.zeros(len(self.passages), dtype=np.float64)
+        for token in set(tokenize(query)):
+            posting = self._postings.get(token)
+            if posting is not None:
+                doc_ids, weights = posting
+                scores[doc_ids] += weights
+        return scores
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[Passage, float]]:
+        """
+        상위 k개 문단 (점수가 0인 문단 제외, 점수 내림차순)
+
+        Returns:
+            [(문단, 점수), ...]
+        """
+        if k <= 0 or not self.passages:
+            return []
+        scores = self.scores(query)
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        # 동점은 문단 순서를 유지 (결과가 실행마다 같도록)
+        ranked = sorted(candidates.tolist(), key=lambda i: (-scores[i], i))
+        return [(self.passages[i], float(scores[i])) for i in ranked if scores[i] > 0]
+
+
+def build_pack_passages(
+    taxonomy: Sequence[Dict],
+    glossary: Dict[str, str],
+    question_bank: Sequence[Dict],
+) -> List[Passage]:
+    """DomainPack 내용을 검색용 문단으로 펼치기"""
+    passages = []
+    for term, definition in glossary.items():
+        passages.append(Passage(f"glossary:{term}", "glossary", term, definition))
+    for concept in taxonomy:
+        terms = ", ".join(term.replace("_", " ") for term in concept.get("concepts", []))
+        passages.append(Passage(f"concept:{concept['id']}", "concept", concept.get("name", concept["id"]), terms))
+    for question in question_bank:
+        # 제목(질문)과 함께 색인되므로 본문은 정답 보기만
+        options = question.get("options", [])
+        correct = question.get("correct")
+        answer = options[correct] if isinstance(correct, int) and 0 <= correct < len(options) else ""
+        passages.append(Passage(f"question:{question.get('id', len(passages))}", "question", question.get("question", ""), answer))
+    return passages
@@ -0,0 +1,273 @@
+"""DomainPack 캐시 - 동일 분야 재질문 시 LLM 재생성 없이 즉시 응답
+
+2단 구조:
+- 메모리 티어: 프로세스 내 LRU (OrderedDict)
+- 디스크 티어: 키별 JSON 파일, TTL 만료 + 접근 시각(mtime) 기준 LRU 제거
+
+키는 (분야, 프롬프트 버전, 모델)이므로 프롬프트나 모델을 바꾸면
+기존 항목은 자연스럽게 무효화된다.
+"""
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+import time
+
+from ..state import DomainPack
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "domain_packs")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MEMORY_ENTRIES = 32
+DEFAULT_DISK_ENTRIES = 256
+
+
+def _normalize_domain(domain: str) -> str:
+    """분야명 정규화 (대소문자/공백 차이 무시)"""
+    return " ".join(domain.lower().split())
+
+
+class DomainPackCache:
+    """(domain, prompt_version, model) 키 기반 DomainPack 2단 캐시
+
+    캐시된 DomainPack 객체는 여러 요청이 공유하므로 읽기 전용으로 다룬다.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_entries: int = DEFAULT_DISK_ENTRIES,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, Tuple[float, DomainPack]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "writes": 0,
+        }
+
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError as e:
+                # 디스크 티어를 못 쓰면 메모리 티어만으로 동작 (put에서 다시 시도)
+                logger.warning("⚠️ DomainPack 캐시 디렉터리 생성 실패(%s): %s", cache_dir, e)
+
+    # ============ 키/경로 ============
+
+    @staticmethod
+    def make_key(domain: str, prompt_version: str, model: str) -> str:
+        """캐시 키 생성"""
+        raw = f"{_normalize_domain(domain)}|{prompt_version}|{model}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    # ============ 조회/저장 ============
+
+    def get(self, domain: str, prompt_version: str, model: str) -> Optional[DomainPack]:
+        """캐시 조회 (메모리 → 디스크 순). 없거나 만료되면 None"""
+        key = self.make_key(domain, prompt_version, model)
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, pack = entry
+                if not self._is_expired(created_at):
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return pack
+                del self._memory[key]
+                self._stats["expired"] += 1
+
+        loaded = self._load_from_disk(key)
+
+        with self._lock:
+            if loaded is None:
+                self._stats["misses"] += 1
+                return None
+            created_at, pack = loaded
+            self._stats["disk_hits"] += 1
+            self._remember(key, created_at, pack)
+            return pack
+
+    def put(self, domain: str, prompt_version: str, model: str, pack: DomainPack) -> None:
+        """캐시 저장 (메모리 + 디스크)"""
+        key = self.make_key(domain, prompt_version, model)
+        created_at = time.time()
+
+        with self._lock:
+            self._remember(key, created_at, pack)
+            self._stats["writes"] += 1
+
+        if self.cache_dir:
+            record = {
+                "domain": domain,
+                "prompt_version": prompt_version,
+                "model": model,
+                "created_at": created_at,
+                "pack": pack.model_dump(),
+            }
+            # 임시 파일에 쓴 뒤 교체하여 동시 읽기에서 반쯤 쓰인 파일이 보이지 않도록 함
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(record, f, ensure_ascii=False)
+                os.replace(tmp_path, self._path(key))
+                self._evict_disk()
+            except OSError as e:
+                # 읽기 전용/용량 부족 등 디스크 오류는 메모리 티어 항목만 남기고 넘어감
+                logger.warning("⚠️ DomainPack 디스크 캐시 저장 실패(%s): %s", domain, e)
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def peek(self, domain: str, prompt_version: str, model: str) -> Optional[DomainPack]:
+        """메모리 티어만 확인 (디스크 읽기, LRU 순서, 통계 변화 없음)"""
+        key = self.make_key(domain, prompt_version, model)
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None or self._is_expired(entry[0]):
+            return None
+        return entry[1]
+
+    def age(self, domain: str, prompt_version: str, model: str) -> Optional[float]:
+        """메모리 티어 항목이 만들어진 뒤 지난 시간(초, 없으면 None)"""
+        key = self.make_key(domain, prompt_version, model)
+        with self._lock:
+            entry = self._memory.get(key)
+        return None if entry is None else time.time() - entry[0]
+
+    def stats(self) -> Dict[str, int]:
+        """히트/미스 카운터 스냅샷"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["memory_entries"] = len(self._memory)
+        return snapshot
+
+    def clear(self) -> None:
+        """메모리/디스크 캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    # ============ 내부 구현 ============
+
+    def _remember(self, key: str, created_at: float, pack: DomainPack) -> None:
+        """메모리 티어 저장 (락 보유 상태에서 호출)"""
+        self._memory[key] = (created_at, pack)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[float, DomainPack]]:
+        if not self.cache_dir:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            created_at = float(record["created_at"])
+            if self._is_expired(created_at):
+                os.remove(path)
+                with self._lock:
+                    self._stats["expired"] += 1
+                return None
+            pack = DomainPack(**record["pack"])
+            os.utime(path)  # 접근 시각 갱신 (LRU)
+            return created_at, pack
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            # 손상된 파일은 버리고 미스로 처리
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _evict_disk(self) -> None:
+        """디스크 항목 수가 한도를 넘으면 가장 오래 접근하지 않은 파일부터 삭제"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+
+        overflow = len(entries) - self.max_disk_entries
+        if overflow <= 0:
+            return
+
+        entries.sort()
+        for _, path in entries[:overflow]:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            with self._lock:
+                self._stats["evictions"] += 1
+
+
+_domain_cache: Optional[DomainPackCache] = None
+_domain_cache_lock = threading.Lock()
+
+
+def get_domain_cache() -> DomainPackCache:
+    """프로세스 공유 DomainPack 캐시 (환경 변수로 설정)
+
+    - DOMAIN_CACHE_DIR: 디스크 캐시 경로 (빈 문자열이면 메모리 전용)
+    - DOMAIN_CACHE_TTL: TTL 초 (0이면 만료 없음)
+    - DOMAIN_CACHE_MAX_ENTRIES: 디스크 최대 항목 수
+    """
+    global _domain_cache
+    if _domain_cache is None:
+        with _domain_cache_lock:
+            if _domain_cache is None:
+                _domain_cache = DomainPackCache(
+                    cache_dir=os.getenv("DOMAIN_CACHE_DIR", DEFAULT_CACHE_DIR) or None,
+                    ttl_seconds=float(os.getenv("DOMAIN_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+                    max_disk_entries=int(os.getenv("DOMAIN_CACHE_MAX_ENTRIES", DEFAULT_DISK_ENTRIES)),
+                )
+    return _domain_cache
+
+
+def set_domain_cache(cache: Optional[DomainPackCache]) -> None:
+    """
+    DomainPack 캐시 교체 (테스트/벤치마크용)
+
+    Args:
+        cache: 새 캐시 (None이면 다음 조회 시 환경 변수로 다시 생성)
+    """
+    global _domain_cache
+    with _domain_cache_lock:
+        _domain_cache = cache
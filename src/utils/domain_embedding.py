@@ -0,0 +1,145 @@
+"""분야 임베딩 - 키워드가 하나도 맞지 않는 질문을 가장 가까운 기존 분야로 연결
+
+외부 모델 없이 CPU에서 바로 계산되는 hashed character n-gram 벡터를 쓴다.
+단어 경계를 포함한 2~3글자 조각을 해시해 고정 차원에 더하므로 조사/어미가 붙거나
+("쿠버네티스에서") 표기가 조금 달라도 ("도커파일") 겹치는 조각으로 유사도가 잡힌다.
+
+분야별 프로필(설명 + 키워드)은 n-gram 포함 여부를 담은 (분야 수, 차원) 연속 float32
+행렬 하나에 담기고, 조회는 행렬-벡터 곱 한 번으로 모든 분야의 점수를 구한다.
+
+점수는 질의 n-gram 중 분야 프로필에 들어 있는 비율(IDF 가중)이다. 긴 프로필과의
+코사인 유사도는 짧은 질의에서 너무 작아지고, 여러 분야에 공통인 조각("하는" 등)은
+IDF로 가중치가 낮아져 막연한 질문이 특정 분야로 끌려가지 않는다.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from .keyword_patterns import DOMAIN_PATTERNS
+
+
+EMBEDDING_DIM = 4096
+NGRAM_SIZES = (2, 3)
+
+# 이 값 미만이면 어느 분야와도 가깝지 않다고 보고 fallback 하지 않음
+SEMANTIC_DOMAIN_THRESHOLD = float(os.getenv("SEMANTIC_DOMAIN_THRESHOLD", "0.25"))
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+# 분야 설명 - 키워드 테이블에 없는 한글 표기/관련 용어 위주
+DOMAIN_DESCRIPTIONS: Dict[str, str] = {
+    "RAG": "검색 증강 생성 문서 청킹 벡터 데이터베이스 유사도 검색 재랭킹 프롬프트 컨텍스트 주입 "
+           "출처 인용 랭그래프 라마인덱스 하이브리드 검색 질의응답 챗봇 지식베이스 문서 검색",
+    "Machine Learning": "인공지능 기계학습 신경 네트워크 경사하강법 과적합 정규화 하이퍼파라미터 "
+                        "파이토치 텐서플로 데이터셋 라벨링 손실 함수 역전파 파인튜닝 트랜스포머 어텐션",
+    "Backend Development": "백엔드 서버 개발 웹 서버 엔드포인트 라우팅 미들웨어 인증 토큰 세션 "
+                           "스프링 장고 플라스크 노드 익스프레스 쿼리 트랜잭션 인덱스 캐시 메시지 큐",
+    "Frontend Development": "프론트엔드 화면 개발 리액트 뷰 앵귤러 컴포넌트 상태 관리 훅 렌더링 "
+                            "자바스크립트 타입스크립트 스타일 레이아웃 반응형 브라우저 번들러 웹팩",
+    "DevOps": "데브옵스 도커 컨테이너 이미지 쿠버네티스 파드 디플로이먼트 헬름 파이프라인 "
+              "지속적 통합 지속적 배포 젠킨스 테라폼 인프라 코드 로그 수집 알림 롤백",
+    "Data Science": "데이터 분석 판다스 데이터프레임 넘파이 시각화 그래프 차트 통계 가설 검정 "
+                    "평균 분산 회귀 분석 분류 군집 전처리 결측치 이상치 주피터 노트북",
+    "Blockchain": "블록체인 비트코인 이더리움 스마트 컨트랙트 솔리디티 지갑 토큰 채굴 "
+                  "합의 알고리즘 작업 증명 지분 증명 탈중앙화 가스비 트랜잭션 해시",
+    "Cloud Computing": "클라우드 아마존 웹 서비스 애저 구글 클라우드 인스턴스 가상 머신 스토리지 "
+                       "버킷 람다 함수 서버리스 오토스케일링 리전 가용 영역 요금",
+    "Cybersecurity": "보안 해킹 취약점 침투 테스트 모의 해킹 암호화 복호화 인증서 방화벽 "
+                     "악성 코드 랜섬웨어 피싱 접근 제어 권한 상승 로그 분석 보안 점검",
+    "Mobile Development": "모바일 앱 개발 안드로이드 아이폰 아이오에스 스위프트 코틀린 플러터 "
+                          "리액트 네이티브 앱스토어 플레이스토어 푸시 알림 화면 전환",
+}
+
+
+def _ngrams(text: str) -> List[str]:
+    """단어별로 경계 공백을 붙인 문자 n-gram"""
+    grams = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        padded = f" {word} "
+        for size in NGRAM_SIZES:
+            grams.extend(padded[i:i + size] for i in range(len(padded) - size + 1))
+    return grams
+
+
+def embed(texts: Sequence[str], dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    텍스트들을 hashed n-gram 빈도 벡터로 변환
+
+    Returns:
+        (텍스트 수, dim) float32 행렬
+    """
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        hashes = np.fromiter(
+            (zlib.crc32(gram.encode("utf-8")) for gram in _ngrams(text)), dtype=np.uint32
+        )
+        if hashes.size:
+            matrix[row] = np.bincount(hashes % dim, minlength=dim)
+    return matrix
+
+
+class DomainEmbeddingIndex:
+    """
+    분야 프로필 행렬과 최근접 분야 검색
+
+    Args:
+        profiles: 분야 → 프로필 텍스트
+        dim: 임베딩 차원
+    """
+
+    def __init__(self, profiles: Dict[str, str], dim: int = EMBEDDING_DIM):
+        self.domains = tuple(profiles)
+        self.dim = dim
+        # (분야 수, dim) n-gram 포함 여부
+        self.matrix = np.ascontiguousarray(embed([profiles[d] for d in self.domains], dim) > 0, dtype=np.float32)
+        # 분야 빈도의 역수 - 어느 프로필에도 없는 조각이 가장 큼 (맞지 않은 부분으로 감점)
+        document_frequency = self.matrix.sum(axis=0)
+        self.weights = np.log((len(self.domains) + 1) / (document_frequency + 1)).astype(np.float32)
+
+    def similarities(self, texts: Sequence[str]) -> np.ndarray:
+        """(텍스트 수, 분야 수) 점수 (0~1, 질의 n-gram 중 분야 프로필에 있는 가중 비율)"""
+        weighted = embed(texts, self.dim) * self.weights
+        totals = weighted.sum(axis=1, keepdims=True)
+        scores = weighted @ self.matrix.T
+        return np.divide(scores, totals, out=np.zeros_like(scores), where=totals > 0)
+
+    def nearest_batch(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """텍스트마다 가장 가까운 (분야, 점수)"""
+        if not self.domains:
+            return [("", 0.0)] * len(texts)
+        scores = self.similarities(texts)
+        best = scores.argmax(axis=1)
+        return [(self.domains[i], float(scores[row, i])) for row, i in enumerate(best)]
+
+    def nearest(self, text: str, threshold: float = 0.0) -> Optional[Tuple[str, float]]:
+        """가장 가까운 (분야, 점수), threshold 미만이면 None"""
+        domain, score = self.nearest_batch([text])[0]
+        if not domain or score < threshold:
+            return None
+        return domain, score
+
+
+def domain_profiles() -> Dict[str, str]:
+    """키워드 테이블의 분야마다 설명 + 키워드로 프로필 텍스트 구성"""
+    return {
+        domain: " ".join([DOMAIN_DESCRIPTIONS.get(domain, domain), *keywords])
+        for domain, keywords in DOMAIN_PATTERNS.items()
+    }
+
+
+_shared_index: Optional[DomainEmbeddingIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_domain_embeddings() -> DomainEmbeddingIndex:
+    """알려진 분야 프로필로 만든 프로세스 공유 인덱스"""
+    global _shared_index
+    if _shared_index is None:
+        with _shared_index_lock:
+            if _shared_index is None:
+                _shared_index = DomainEmbeddingIndex(domain_profiles())
+    return _shared_index
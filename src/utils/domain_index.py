@@ -0,0 +1,142 @@
+"""DomainPack 인덱스 - taxonomy/선수지식/용어 조회를 위한 사전 계산 구조
+
+노드들이 taxonomy를 매번 선형 탐색하지 않도록 DomainPack마다 한 번 만들어
+공유한다 (DomainPack.index). DomainPack은 생성 이후 읽기 전용으로 다룬다.
+
+세션 체크포인트 복원이나 템플릿 생성처럼 같은 내용의 팩이 새 인스턴스로 들어와도
+인덱스를 다시 만들지 않도록, 팩 내용 해시(fingerprint)별로 프로세스 안에서 공유한다.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+import os
+import threading
+
+from .bm25 import BM25Index, Passage, build_pack_passages
+from .keyword_matcher import KeywordMatcher
+from .knowledge_tracing import KnowledgeTracer
+
+
+# fingerprint별로 보관할 인덱스 수
+INDEX_CACHE_SIZE = int(os.getenv("DOMAIN_INDEX_CACHE_SIZE", "64"))
+
+
+def fold_term(term: str) -> str:
+    """용어 정규화 (대소문자 무시, '_'와 공백 동일 취급)"""
+    return " ".join(term.casefold().replace("_", " ").split())
+
+
+class DomainPackIndex:
+    """DomainPack 조회용 인덱스 모음"""
+
+    def __init__(
+        self,
+        taxonomy: List[Dict[str, Any]],
+        glossary: Dict[str, str],
+        question_bank: Sequence[Dict[str, Any]] = (),
+    ):
+        self.taxonomy = taxonomy
+        self.question_bank = question_bank
+
+        # id → 개념
+        self.concept_by_id: Dict[str, Dict[str, Any]] = {}
+        # id → 소문자 세부 개념 집합
+        self.concept_terms: Dict[str, FrozenSet[str]] = {}
+        # 소문자 세부 개념 → 개념 id (역색인, taxonomy 순서)
+        self.term_to_concepts: Dict[str, Tuple[str, ...]] = {}
+        # id → 선수지식 id (인접 리스트)
+        self.prerequisites: Dict[str, Tuple[str, ...]] = {}
+
+        inverted: Dict[str, List[str]] = {}
+        for concept in taxonomy:
+            concept_id = concept["id"]
+            terms = frozenset(term.lower() for term in concept.get("concepts", []))
+
+            self.concept_by_id.setdefault(concept_id, concept)
+            self.concept_terms.setdefault(concept_id, terms)
+            self.prerequisites.setdefault(concept_id, tuple(concept.get("prerequisites", [])))
+
+            for term in terms:
+                inverted.setdefault(term, []).append(concept_id)
+
+        self.term_to_concepts = {term: tuple(ids) for term, ids in inverted.items()}
+
+        # 정규화된 용어 → glossary 원래 키
+        self.glossary = glossary
+        self.glossary_folded: Dict[str, str] = {}
+        for term in glossary:
+            self.glossary_folded.setdefault(fold_term(term), term)
+
+        self._glossary_matcher: Optional[KeywordMatcher] = None
+        self._tracer: Optional[KnowledgeTracer] = None
+        self._retriever: Optional[BM25Index] = None
+
+    @property
+    def tracer(self) -> KnowledgeTracer:
+        """taxonomy 개념 순서에 묶인 지식 추적 엔진 (최초 접근 시 생성)"""
+        if self._tracer is None:
+            self._tracer = KnowledgeTracer(list(self.concept_by_id))
+        return self._tracer
+
+    @property
+    def retriever(self) -> BM25Index:
+        """용어 사전/개념/문제 은행 BM25 색인 (최초 접근 시 생성)"""
+        if self._retriever is None:
+            self._retriever = BM25Index(build_pack_passages(self.taxonomy, self.glossary, self.question_bank))
+        return self._retriever
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[Passage, float]]:
+        """질의와 관련된 상위 k개 문단"""
+        return self.retriever.search(query, k)
+
+    def passage(self, passage_id: str) -> Optional[Passage]:
+        """id로 문단 조회"""
+        return self.retriever.passage_by_id.get(passage_id)
+
+    def concept(self, concept_id: str) -> Optional[Dict[str, Any]]:
+        """id로 개념 조회"""
+        return self.concept_by_id.get(concept_id)
+
+    def concepts_for_term(self, term: str) -> Tuple[str, ...]:
+        """세부 개념(term)을 포함하는 개념 id 목록"""
+        return self.term_to_concepts.get(term.lower(), ())
+
+    def glossary_term(self, name: str) -> Optional[str]:
+        """대소문자/구분자 차이를 무시하고 glossary 키 찾기"""
+        if name in self.glossary:
+            return name
+        return self.glossary_folded.get(fold_term(name))
+
+    def find_glossary_terms(self, message: str) -> List[str]:
+        """소문자화된 메시지에 등장하는 glossary 용어 (glossary 정의 순서)"""
+        if self._glossary_matcher is None:
+            self._glossary_matcher = KeywordMatcher({
+                "glossary": {term: [term.lower()] for term in self.glossary}
+            })
+        return list(self._glossary_matcher.scan(message).labels("glossary"))
+
+
+_shared_indexes: "OrderedDict[str, DomainPackIndex]" = OrderedDict()
+_shared_indexes_lock = threading.Lock()
+
+
+def shared_index(fingerprint: str, build: Callable[[], DomainPackIndex]) -> DomainPackIndex:
+    """
+    팩 내용 해시별로 공유되는 인덱스 (LRU, 없으면 build()로 생성)
+
+    Args:
+        fingerprint: DomainPack.fingerprint
+        build: 인덱스 생성 함수
+    """
+    with _shared_indexes_lock:
+        index = _shared_indexes.get(fingerprint)
+        if index is not None:
+            _shared_indexes.move_to_end(fingerprint)
+            return index
+    index = build()
+    with _shared_indexes_lock:
+        # 동시에 만들어졌으면 먼저 등록된 인덱스를 사용
+        index = _shared_indexes.setdefault(fingerprint, index)
+        _shared_indexes.move_to_end(fingerprint)
+        while len(_shared_indexes) > INDEX_CACHE_SIZE:
+            _shared_indexes.popitem(last=False)
+    return index
@@ -0,0 +1,143 @@
+"""분야 요청 빈도 추적 - 사전 생성(prewarm)할 인기 분야 선정용
+
+domain_detect 노드가 감지한 분야마다 record()를 호출한다. 빈도는 반감기가 있는
+지수 감쇠 점수라 오래전 인기 분야는 점점 밀려나고 최근 많이 묻는 분야가 위로 온다.
+
+    score(t) = score(t0) · 0.5^((t - t0) / half_life) (+1 요청마다)
+
+점수는 JSON 파일(DOMAIN_USAGE_FILE, 기본 .cache/domain_usage.json)로 저장해
+재시작 후에도 시작 시점 prewarm 대상으로 쓴다.
+"""
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import threading
+import time
+
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+
+DEFAULT_USAGE_FILE = os.path.join(".cache", "domain_usage.json")
+DEFAULT_HALF_LIFE = 24 * 3600.0
+# 이 점수 아래로 감쇠한 분야는 저장/집계에서 제외
+MIN_SCORE = 0.01
+
+
+class DomainUsageTracker:
+    """
+    분야별 감쇠 요청 빈도 (스레드 안전)
+
+    Args:
+        path: 저장 파일 경로 (None이면 메모리 전용)
+        half_life: 점수 반감기(초)
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_USAGE_FILE, half_life: float = DEFAULT_HALF_LIFE):
+        self.path = path
+        self.half_life = half_life
+        # 분야 → (점수, 점수를 계산한 시각)
+        self._scores: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path:
+            self._load()
+
+    def _decayed(self, score: float, updated_at: float, now: float) -> float:
+        return score * 0.5 ** (max(now - updated_at, 0.0) / self.half_life)
+
+    def record(self, domain: str, now: Optional[float] = None) -> None:
+        """분야 요청 1회 기록"""
+        now = time.time() if now is None else now
+        with self._lock:
+            score, updated_at = self._scores.get(domain, (0.0, now))
+            self._scores[domain] = (self._decayed(score, updated_at, now) + 1.0, now)
+            self._dirty = True
+
+    def top(self, n: int, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """점수 상위 n개 분야 [(분야, 현재 점수), ...]"""
+        now = time.time() if now is None else now
+        with self._lock:
+            scored = [
+                (domain, self._decayed(score, updated_at, now))
+                for domain, (score, updated_at) in self._scores.items()
+            ]
+        scored = [item for item in scored if item[1] >= MIN_SCORE]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:n]
+
+    # ============ 저장 ============
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._scores = {domain: (float(score), float(at)) for domain, (score, at) in data["scores"].items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # 손상된 파일은 무시하고 빈 통계로 시작
+            logger.warning("⚠️ 분야 사용 통계를 읽지 못함 (%s): %s", self.path, e)
+
+    def save(self) -> None:
+        """변경이 있으면 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            if not self._dirty:
+                return
+            # 거의 0으로 감쇠한 분야는 버려서 파일이 계속 커지지 않게 함
+            self._scores = {
+                domain: (score, at) for domain, (score, at) in self._scores.items()
+                if self._decayed(score, at, now) >= MIN_SCORE
+            }
+            data = {"half_life": self.half_life, "scores": {d: list(v) for d, v in self._scores.items()}}
+            self._dirty = False
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # 저장하지 못한 변경이 다음 save()에서 다시 기록되도록 dirty 상태 복구
+            with self._lock:
+                self._dirty = True
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+_domain_usage: Optional[DomainUsageTracker] = None
+_domain_usage_lock = threading.Lock()
+
+
+def get_domain_usage() -> DomainUsageTracker:
+    """프로세스 공유 분야 사용 통계 (DOMAIN_USAGE_FILE: 빈 문자열이면 메모리 전용)"""
+    global _domain_usage
+    if _domain_usage is None:
+        with _domain_usage_lock:
+            if _domain_usage is None:
+                _domain_usage = DomainUsageTracker(
+                    path=os.getenv("DOMAIN_USAGE_FILE", DEFAULT_USAGE_FILE) or None,
+                    half_life=float(os.getenv("DOMAIN_USAGE_HALF_LIFE", DEFAULT_HALF_LIFE)),
+                )
+    return _domain_usage
+
+
+def set_domain_usage(tracker: Optional[DomainUsageTracker]) -> None:
+    """
+    분야 사용 통계 교체 (테스트/벤치마크용)
+
+    Args:
+        tracker: 새 통계 (None이면 다음 조회 시 환경 변수로 다시 생성)
+    """
+    global _domain_usage
+    with _domain_usage_lock:
+        _domain_usage = tracker
@@ -0,0 +1,147 @@
+"""다중 패턴 키워드 매처 - Aho-Corasick 오토마톤 기반
+
+모든 패턴 테이블로 오토마톤을 한 번만 만들고, 메시지를 한 번 훑어서
+테이블별(분야/의도/경험 수준/제약/기술 스택 등) 히트를 돌려준다.
+비용은 패턴 수와 무관하게 O(메시지 길이 + 히트 수)이다.
+
+매칭 의미는 기존 노드의 `kw in message` 부분 문자열 검사와 동일하다.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from functools import lru_cache
+import threading
+
+from .keyword_patterns import PATTERN_TABLES
+
+
+class KeywordHits:
+    """테이블 → 라벨 → 매칭된 키워드 (정의 순서 유지, 읽기 전용)"""
+
+    __slots__ = ("_hits",)
+
+    def __init__(self, hits: Dict[str, Dict[str, Tuple[str, ...]]]):
+        self._hits = hits
+
+    def labels(self, table: str) -> Dict[str, Tuple[str, ...]]:
+        """테이블에서 하나 이상 매칭된 라벨과 키워드 (라벨 정의 순서)"""
+        return self._hits.get(table, {})
+
+    def keywords(self, table: str, label: str) -> Tuple[str, ...]:
+        """라벨에 매칭된 키워드"""
+        return self._hits.get(table, {}).get(label, ())
+
+    def count(self, table: str, label: str) -> int:
+        """라벨에 매칭된 서로 다른 키워드 수"""
+        return len(self.keywords(table, label))
+
+    def has(self, table: str, label: Optional[str] = None) -> bool:
+        """라벨(또는 테이블 전체)에 매칭이 있는지"""
+        if label is None:
+            return bool(self._hits.get(table))
+        return bool(self.keywords(table, label))
+
+
+class KeywordMatcher:
+    """여러 패턴 테이블을 하나의 Aho-Corasick 오토마톤으로 매칭"""
+
+    def __init__(self, tables: Dict[str, Dict[str, Iterable[str]]]):
+        # 키워드별 (정의 순서, 테이블, 라벨) 목록 - 같은 키워드가 여러 테이블에 있을 수 있음
+        self._entries: Dict[str, List[Tuple[int, str, str]]] = {}
+        order = 0
+        for table, labels in tables.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    self._entries.setdefault(keyword, []).append((order, table, label))
+                    order += 1
+
+        self._build(self._entries.keys())
+
+    def _build(self, keywords: Iterable[str]) -> None:
+        """goto/fail/output 테이블 구성"""
+        self._goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[str]] = [[]]
+
+        for keyword in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(keyword)
+
+        # BFS로 실패 링크 계산, 출력은 실패 링크를 따라 병합
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                outputs[next_state].extend(outputs[self._fail[next_state]])
+
+        self._outputs: List[Tuple[str, ...]] = [tuple(dict.fromkeys(out)) for out in outputs]
+
+    def find(self, text: str) -> set:
+        """텍스트에 부분 문자열로 등장하는 서로 다른 키워드 집합 (단일 패스)"""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+    def scan(self, text: str) -> KeywordHits:
+        """텍스트를 한 번 훑어 테이블별 히트 반환"""
+        matched = []
+        for keyword in self.find(text):
+            matched.extend((order, table, label, keyword) for order, table, label in self._entries[keyword])
+        matched.sort()
+
+        hits: Dict[str, Dict[str, List[str]]] = {}
+        for _, table, label, keyword in matched:
+            hits.setdefault(table, {}).setdefault(label, []).append(keyword)
+
+        return KeywordHits({
+            table: {label: tuple(keywords) for label, keywords in labels.items()}
+            for table, labels in hits.items()
+        })
+
+
+_shared_matcher: Optional[KeywordMatcher] = None
+_shared_matcher_lock = threading.Lock()
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """전체 패턴 테이블로 만든 프로세스 공유 매처"""
+    global _shared_matcher
+    if _shared_matcher is None:
+        with _shared_matcher_lock:
+            if _shared_matcher is None:
+                _shared_matcher = KeywordMatcher(PATTERN_TABLES)
+    return _shared_matcher
+
+
+@lru_cache(maxsize=1024)
+def scan_message(message: str) -> KeywordHits:
+    """
+    소문자화된 메시지 스캔 (결과 캐시)
+
+    한 턴 안에서 여러 노드가 같은 메시지를 조회하므로 실제 스캔은 한 번만 일어난다.
+    """
+    return get_keyword_matcher().scan(message)
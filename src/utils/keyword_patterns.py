@@ -0,0 +1,128 @@
+"""키워드 패턴 테이블 - 키워드 기반 노드들이 공유하는 패턴 정의
+
+테이블 이름 → 라벨 → 키워드 목록 구조이며, 모든 키워드는 소문자 기준이다.
+라벨과 키워드의 정의 순서는 노드의 동점 처리/출력 순서에 그대로 쓰인다.
+"""
+from typing import Dict, List
+
+
+# 분야별 키워드 패턴 (DomainDetect, 확장 가능)
+DOMAIN_PATTERNS: Dict[str, List[str]] = {
+    "RAG": [
+        "rag", "retrieval", "augmented", "generation",
+        "벡터", "임베딩", "검색", "생성", "llm", "랭체인",
+        "pinecone", "weaviate", "chroma", "qdrant"
+    ],
+    "Machine Learning": [
+        "머신러닝", "딥러닝", "학습", "모델", "훈련", "추론",
+        "tensorflow", "pytorch", "keras", "scikit", "신경망",
+        "cnn", "rnn", "transformer", "accuracy", "loss"
+    ],
+    "Backend Development": [
+        "백엔드", "서버", "api", "rest", "graphql", "데이터베이스",
+        "django", "flask", "fastapi", "express", "spring",
+        "postgresql", "mongodb", "redis", "kafka"
+    ],
+    "Frontend Development": [
+        "프론트엔드", "웹", "react", "vue", "angular", "ui", "ux",
+        "javascript", "typescript", "css", "html", "component",
+        "next.js", "nuxt", "svelte"
+    ],
+    "DevOps": [
+        "데브옵스", "배포", "ci/cd", "docker", "kubernetes", "k8s",
+        "jenkins", "github actions", "terraform", "ansible",
+        "모니터링", "로깅", "prometheus", "grafana"
+    ],
+    "Data Science": [
+        "데이터 과학", "분석", "시각화", "통계", "pandas", "numpy",
+        "matplotlib", "seaborn", "jupyter", "분포", "상관관계",
+        "회귀", "분류", "군집"
+    ],
+    "Blockchain": [
+        "블록체인", "암호화폐", "스마트 컨트랙트", "이더리움",
+        "solidity", "web3", "nft", "defi", "dapp", "합의"
+    ],
+    "Cloud Computing": [
+        "클라우드", "aws", "azure", "gcp", "람다", "s3", "ec2",
+        "serverless", "cloud", "iaas", "paas", "saas"
+    ],
+    "Cybersecurity": [
+        "보안", "해킹", "취약점", "암호화", "인증", "방화벽",
+        "penetration", "vulnerability", "encryption", "ssl", "tls"
+    ],
+    "Mobile Development": [
+        "모바일", "앱", "android", "ios", "swift", "kotlin",
+        "react native", "flutter", "xamarin", "cross-platform"
+    ]
+}
+
+# 일반 학습 키워드 (분야가 불명확한 학습 질문 감지)
+GENERAL_LEARNING_PATTERNS: Dict[str, List[str]] = {
+    "general": ["배우", "학습", "공부", "시작", "입문", "알려줘", "설명"]
+}
+
+# 의도 패턴 (IntentDetect)
+INTENT_PATTERNS: Dict[str, List[str]] = {
+    "design": ["설계", "아키텍처", "구조", "어떻게 구성", "선택", "architecture", "design"],
+    "implementation": ["구현", "코드", "만들", "작성", "개발", "implement", "code"],
+    "evaluation": ["평가", "측정", "비교", "테스트", "ragas", "evaluate", "measure"],
+    "optimization": ["최적화", "성능", "빠르", "지연", "비용", "optimize", "performance"],
+    "troubleshoot": ["문제", "오류", "에러", "디버그", "안돼", "error", "debug", "fix"],
+    "compare": ["차이", "vs", "비교", "어느게", "compare", "difference"],
+    "explain": ["설명", "무엇", "뭐", "이란", "개념", "explain", "what is"],
+    "learn_path": ["배우", "학습", "공부", "시작", "learn", "study", "tutorial"]
+}
+
+# 설계 의도의 서브타입 (IntentDetect)
+INTENT_SUBTYPE_PATTERNS: Dict[str, List[str]] = {
+    "indexing_design": ["인덱싱", "indexing"],
+    "retrieval_design": ["검색", "retrieval"]
+}
+
+# 경험 수준 (ColdstartProbe)
+EXPERIENCE_LEVEL_PATTERNS: Dict[str, List[str]] = {
+    "beginner": ["처음", "시작", "입문", "초보", "모르", "배우"],
+    "intermediate": ["경험", "해봤", "알고", "구현"],
+    "advanced": ["최적화", "프로덕션", "배포", "성능", "고급"]
+}
+
+# 코드 언어 선호 (ColdstartProbe)
+CODE_LANG_PATTERNS: Dict[str, List[str]] = {
+    "go": ["golang", "go"]
+}
+
+# 배포 환경 (ColdstartProbe, 정의 순서가 우선순위)
+DEPLOY_ENV_PATTERNS: Dict[str, List[str]] = {
+    "kubernetes": ["k8s", "kubernetes"],
+    "serverless": ["서버리스", "serverless"],
+    "production": ["프로덕션", "production"]
+}
+
+# 제약사항 (ColdstartProbe)
+CONSTRAINT_PATTERNS: Dict[str, List[str]] = {
+    "latency_priority": ["빠른", "지연", "latency"],
+    "cost_priority": ["비용", "cost", "저렴"],
+    "quality_priority": ["정확", "품질", "accuracy"]
+}
+
+# 기술 스택 키워드 (UserSignals)
+TECH_KEYWORDS: List[str] = [
+    "bm25", "hybrid", "vector", "embedding", "chunking",
+    "rerank", "ragas", "llm", "gpt", "kubernetes", "k8s",
+    "pinecone", "weaviate", "chroma", "qdrant",
+    "vllm", "langchain", "llamaindex"
+]
+
+
+# 공유 매처가 한 번에 스캔하는 전체 테이블
+PATTERN_TABLES: Dict[str, Dict[str, List[str]]] = {
+    "domain": DOMAIN_PATTERNS,
+    "general_learning": GENERAL_LEARNING_PATTERNS,
+    "intent": INTENT_PATTERNS,
+    "intent_subtype": INTENT_SUBTYPE_PATTERNS,
+    "experience_level": EXPERIENCE_LEVEL_PATTERNS,
+    "code_lang": CODE_LANG_PATTERNS,
+    "deploy_env": DEPLOY_ENV_PATTERNS,
+    "constraint": CONSTRAINT_PATTERNS,
+    "tech_skill": {keyword: [keyword] for keyword in TECH_KEYWORDS},
+}
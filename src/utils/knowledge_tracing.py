@@ -0,0 +1,149 @@
+"""베이지안 지식 추적(BKT) - 개념별 숙련 확률을 NumPy 배열로 갱신
+
+숙련도는 taxonomy 개념 순서로 정렬된 배열 P(L)이다. 관찰(메시지의 용어/기술 언급,
+퀴즈 정답/오답)은 개념별 횟수 배열로 모아 한 번의 벡터 연산으로 반영한다.
+
+    관찰 후:  odds(L | k회 관찰) = odds(L) × LR^k
+              LR = (1 - slip) / guess      (긍정 관찰)
+                 = slip / (1 - guess)      (부정 관찰)
+    학습 전이: P(L') = P(L | obs) + (1 - P(L | obs)) × learn   (관찰된 개념만)
+
+배열의 마지막 축이 개념이므로 (사용자 수, 개념 수) 행렬을 넘기면 코호트 전체를
+한 번에 갱신/재매핑할 수 있다 (taxonomy가 바뀌었을 때의 일괄 재계산).
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+# 0/1에 닿으면 odds가 발산하므로 확률을 이 범위로 제한
+_EPSILON = 1e-6
+
+
+@dataclass(frozen=True)
+class BKTParams:
+    """관찰 종류별 BKT 파라미터"""
+    slip: float    # 숙련했는데 틀릴(언급하지 않을) 확률
+    guess: float   # 숙련하지 않았는데 맞힐(언급할) 확률
+    learn: float   # 관찰 한 번 뒤 숙련으로 넘어갈 확률
+
+
+# 용어/기술 언급은 약한 증거 (P=0.4에서 한 번 언급 시 약 0.55 / 0.5),
+# 퀴즈 응답은 표준 BKT 수준의 강한 증거
+OBSERVATION_PARAMS: Dict[str, BKTParams] = {
+    "term": BKTParams(slip=0.1, guess=0.5, learn=0.0),
+    "skill": BKTParams(slip=0.1, guess=0.6, learn=0.0),
+    "quiz": BKTParams(slip=0.1, guess=0.25, learn=0.1),
+}
+
+# 경험 수준(0~3)별 사전 숙련 확률 P(L0)
+EXPERIENCE_PRIORS = {
+    0: 0.2,  # 초보
+    1: 0.4,  # 입문
+    2: 0.6,  # 중급
+    3: 0.8   # 고급
+}
+
+
+def experience_prior(experience_level: int) -> float:
+    return EXPERIENCE_PRIORS.get(experience_level, EXPERIENCE_PRIORS[1])
+
+
+def bkt_update(p: np.ndarray, counts: np.ndarray, params: BKTParams, correct: bool = True) -> np.ndarray:
+    """
+    관찰 횟수 배열만큼 P(L)을 한 번에 갱신
+
+    Args:
+        p: 숙련 확률 (..., 개념 수)
+        counts: 개념별 관찰 횟수 (p와 같은 모양이거나 브로드캐스트 가능)
+        params: 관찰 종류의 BKT 파라미터
+        correct: 긍정(정답/언급) 관찰인지
+
+    Returns:
+        갱신된 새 배열
+    """
+    p = np.clip(np.asarray(p, dtype=np.float64), _EPSILON, 1 - _EPSILON)
+    counts = np.asarray(counts, dtype=np.float64)
+    if correct:
+        likelihood_ratio = (1 - params.slip) / params.guess
+    else:
+        likelihood_ratio = params.slip / (1 - params.guess)
+
+    odds = p / (1 - p) * np.power(likelihood_ratio, counts)
+    posterior = odds / (1 + odds)
+    if params.learn:
+        posterior = np.where(counts > 0, posterior + (1 - posterior) * params.learn, posterior)
+    return np.clip(posterior, 0.0, 1.0)
+
+
+class KnowledgeTracer:
+    """
+    한 taxonomy의 개념 순서에 묶인 BKT 엔진
+
+    Args:
+        concept_ids: 배열 축 순서가 될 개념 id 목록 (taxonomy 순서)
+    """
+
+    def __init__(self, concept_ids: Sequence[str]):
+        self.concept_ids = tuple(concept_ids)
+        self.position = {concept_id: i for i, concept_id in enumerate(self.concept_ids)}
+
+    @property
+    def size(self) -> int:
+        return len(self.concept_ids)
+
+    def counts(self, concept_ids: Iterable[str]) -> np.ndarray:
+        """개념 id 나열(중복 허용) → 개념별 관찰 횟수 배열 (모르는 id는 무시)"""
+        positions = [self.position[c] for c in concept_ids if c in self.position]
+        return np.bincount(np.asarray(positions, dtype=np.intp), minlength=self.size).astype(np.float64)
+
+    def from_levels(self, levels: Dict[str, float], prior: float) -> np.ndarray:
+        """levels dict → 배열 (기록이 없는 개념은 prior)"""
+        return np.array([levels.get(c, prior) for c in self.concept_ids], dtype=np.float64)
+
+    def to_levels(self, p: np.ndarray) -> Dict[str, float]:
+        """배열 → levels dict (taxonomy 순서)"""
+        return dict(zip(self.concept_ids, p.tolist()))
+
+    def observe(
+        self,
+        p: np.ndarray,
+        concept_ids: Iterable[str],
+        kind: str,
+        correct: bool = True,
+    ) -> np.ndarray:
+        """개념 id 나열에 대한 관찰을 한 번의 벡터 연산으로 반영"""
+        return bkt_update(p, self.counts(concept_ids), OBSERVATION_PARAMS[kind], correct)
+
+    def from_levels_batch(self, cohort: Sequence[Dict[str, float]], prior: float) -> np.ndarray:
+        """사용자들의 levels dict → (사용자 수, 개념 수) 행렬"""
+        matrix = np.full((len(cohort), self.size), prior, dtype=np.float64)
+        for row, levels in enumerate(cohort):
+            for concept_id, value in levels.items():
+                column = self.position.get(concept_id)
+                if column is not None:
+                    matrix[row, column] = value
+        return matrix
+
+    def to_levels_batch(self, matrix: np.ndarray) -> List[Dict[str, float]]:
+        return [self.to_levels(row) for row in matrix]
+
+    def remap(self, p: np.ndarray, target: "KnowledgeTracer", prior: Optional[float] = None) -> np.ndarray:
+        """
+        다른 taxonomy의 개념 축으로 재배열 (..., 개념 수 → ..., target 개념 수)
+
+        공통 개념은 값을 옮기고, 새 개념은 prior로 채운다 (prior=None이면 기존 값의 평균).
+        """
+        p = np.asarray(p, dtype=np.float64)
+        if prior is None:
+            fill = p.mean(axis=-1, keepdims=True) if self.size else np.full(p.shape[:-1] + (1,), 0.5)
+        else:
+            fill = np.full(p.shape[:-1] + (1,), prior)
+        result = np.broadcast_to(fill, p.shape[:-1] + (target.size,)).copy()
+
+        shared = [(self.position[c], j) for j, c in enumerate(target.concept_ids) if c in self.position]
+        if shared:
+            source, destination = (np.array(axis, dtype=np.intp) for axis in zip(*shared))
+            result[..., destination] = p[..., source]
+        return result
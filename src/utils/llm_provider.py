@@ -0,0 +1,155 @@
+"""LLM 제공자 - (모델, temperature)별 채팅 클라이언트를 재사용
+
+ChatOpenAI를 호출마다 만들면 HTTP 연결(TLS 핸드셰이크 포함)과 클라이언트 설정이
+매번 버려진다. 제공자는 (모델, temperature)별 클라이언트를 한 번 만들어 두고,
+모든 클라이언트가 keep-alive 연결 풀을 가진 httpx 클라이언트 하나를 공유한다.
+
+테스트/벤치마크에서는 제공자를 교체한다:
+
+    set_llm_provider(StaticLLMProvider(FakeChatModel()))          # 가짜 모델
+    set_llm_provider(PooledLLMProvider(base_url="http://127.0.0.1:8000/v1",
+                                       api_key="local"))           # 로컬 대역 서버
+    set_llm_provider(None)                                        # 기본값 복원
+"""
+from typing import Any, Dict, Optional, Tuple
+import os
+import threading
+
+
+# 연결 풀 설정 - 섹션 생성 동시 실행 상한(LLM_MAX_CONCURRENCY)보다 작지 않게
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "16"))
+DEFAULT_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+DEFAULT_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "30"))
+
+
+class LLMProvider:
+    """채팅 모델 제공자 인터페이스 - invoke/ainvoke를 가진 객체를 반환"""
+
+    def get(self, model: str, temperature: float = 0.7) -> Any:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """보유한 연결 정리 (기본: 없음)"""
+
+
+class PooledLLMProvider(LLMProvider):
+    """
+    ChatOpenAI 클라이언트 풀
+
+    Args:
+        base_url: OpenAI 호환 API 주소 (None이면 OPENAI_BASE_URL 또는 OpenAI 기본값)
+        api_key: API 키 (None이면 OPENAI_API_KEY)
+        timeout: 호출별 타임아웃(초)
+        max_connections: 공유 연결 풀 크기
+        keepalive_expiry: 유휴 연결 유지 시간(초)
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    ):
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+
+        self._clients: Dict[Tuple[str, float], Any] = {}
+        self._http_client = None
+        self._http_async_client = None
+        self._lock = threading.Lock()
+
+    def _http_clients(self):
+        """공유 httpx 클라이언트 (최초 1회 생성, 잠금 안에서 호출)"""
+        if self._http_client is None:
+            import httpx
+
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            )
+            self._http_client = httpx.Client(limits=limits, timeout=self.timeout)
+            self._http_async_client = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+        return self._http_client, self._http_async_client
+
+    def get(self, model: str, temperature: float = 0.7) -> Any:
+        key = (model, float(temperature))
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                from langchain_openai import ChatOpenAI
+
+                http_client, http_async_client = self._http_clients()
+                options: Dict[str, Any] = {}
+                if self.base_url:
+                    options["base_url"] = self.base_url
+                if self.api_key:
+                    options["api_key"] = self.api_key
+                client = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    timeout=self.timeout,
+                    # 재시도는 LLM 스케줄러가 한도/429 중지를 지키며 대기열로 다시 보냄
+                    max_retries=0,
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                    **options,
+                )
+                self._clients[key] = client
+        return client
+
+    def close(self) -> None:
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            # AsyncClient는 이벤트 루프 밖에서 닫을 수 없으므로 참조만 버림
+            self._http_client = None
+            self._http_async_client = None
+            self._clients.clear()
+
+
+class StaticLLMProvider(LLMProvider):
+    """모델/temperature와 상관없이 항상 같은 객체를 반환 (테스트용 가짜 모델 주입)"""
+
+    def __init__(self, llm: Any):
+        self.llm = llm
+
+    def get(self, model: str, temperature: float = 0.7) -> Any:
+        return self.llm
+
+
+_provider: Optional[LLMProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_llm_provider() -> LLMProvider:
+    """프로세스 공유 LLM 제공자 (기본: PooledLLMProvider)"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = PooledLLMProvider()
+    return _provider
+
+
+def set_llm_provider(provider: Optional[LLMProvider]) -> None:
+    """
+    LLM 제공자 교체
+
+    Args:
+        provider: 새 제공자 (None이면 다음 조회 시 기본 제공자를 새로 생성)
+    """
+    global _provider
+    with _provider_lock:
+        previous, _provider = _provider, provider
+    if previous is not None and previous is not provider:
+        previous.close()
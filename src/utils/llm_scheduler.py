@@ -0,0 +1,459 @@
+"""LLM 호출 스케줄러 - 분당 요청/토큰 한도(토큰 버킷) + 우선순위 대기열
+
+모든 LLM 호출은 스케줄러에서 슬롯을 받은 뒤 나간다. 슬롯은 두 토큰 버킷이 모두 허락할 때 나오며,
+- 요청 버킷: 분당 LLM_RPM회 (1회 = 1)
+- 토큰 버킷: 분당 LLM_TPM토큰 (프롬프트 추정 토큰 + 예상 출력 토큰, 응답 usage로 사후 정산)
+기다리는 호출은 우선순위(interactive > batch > background), 같은 우선순위 안에서는 도착 순서로 나간다.
+제공자가 429(rate limit)를 돌려주면 잠시 전체 발송을 멈추고 대기열로 돌아가 재시도한다.
+재시도는 모두 여기서 하므로 ChatOpenAI 클라이언트의 SDK 재시도는 끈다 (llm_provider).
+
+우선순위는 contextvar로 전달한다 (기본 interactive):
+
+    with llm_priority("background"):
+        refresh_domain_pack(domain)
+
+LLM_RPM/LLM_TPM이 0(기본)이면 해당 한도 없이 바로 통과한다 (429 시 발송 중지와 메트릭은 그대로 적용).
+"""
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, List, Optional
+import asyncio
+import contextlib
+import itertools
+import os
+import threading
+import time
+
+from .log import get_logger
+from .metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+
+# 우선순위 이름 → 순위 (작을수록 먼저)
+PRIORITIES = {"interactive": 0, "batch": 1, "background": 2}
+DEFAULT_PRIORITY = "interactive"
+
+LLM_RPM = float(os.getenv("LLM_RPM", "0"))
+LLM_TPM = float(os.getenv("LLM_TPM", "0"))
+# 호출 전 토큰 버킷에서 미리 차감하는 출력 토큰 수 (응답 usage가 오면 실제 값으로 정산)
+LLM_EXPECTED_OUTPUT_TOKENS = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "800"))
+# 429/일시 오류(연결 실패, 5xx) 재시도 횟수
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "2"))
+# 429 응답에 Retry-After가 없을 때 발송을 멈추는 시간(초)
+RATE_LIMIT_COOLDOWN = 1.0
+
+LLM_QUEUE_WAIT = REGISTRY.histogram(
+    "rag_edu_llm_queue_wait_seconds", "LLM 호출이 한도 대기열에서 기다린 시간(초)", ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+LLM_CALLS = REGISTRY.counter(
+    "rag_edu_llm_calls_total", "LLM 호출 수 (ok / error / rate_limited / transient / queue_timeout)", ["priority", "result"]
+)
+LLM_TOKENS = REGISTRY.counter("rag_edu_llm_tokens_total", "LLM 호출 토큰 수 (응답 usage, 없으면 추정치)", ["priority"])
+LLM_QUEUE_DEPTH = REGISTRY.gauge("rag_edu_llm_queue_depth", "한도 대기열에서 기다리는 LLM 호출 수", ["priority"])
+
+_priority: ContextVar[str] = ContextVar("llm_priority", default=DEFAULT_PRIORITY)
+
+
+@contextlib.contextmanager
+def llm_priority(name: str) -> Iterator[None]:
+    """with 블록 안의 LLM 호출 우선순위 지정 ("interactive" | "batch" | "background")"""
+    if name not in PRIORITIES:
+        raise ValueError(f"알 수 없는 우선순위: {name} ({', '.join(PRIORITIES)})")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """현재 컨텍스트의 LLM 호출 우선순위"""
+    return _priority.get()
+
+
+class PriorityTicket:
+    """
+    호출 묶음(예: 팩 하나의 섹션 호출들)이 공유하는 우선순위
+
+    대기 중에도 raise_to로 올릴 수 있어, 백그라운드 생성에 사용자 요청이 합류하면
+    남은 호출이 사용자 우선순위로 나간다.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name or current_priority()
+
+    @property
+    def rank(self) -> int:
+        return PRIORITIES[self.name]
+
+    def raise_to(self, name: str) -> None:
+        if PRIORITIES[name] < self.rank:
+            self.name = name
+
+
+class RateLimitTimeout(TimeoutError):
+    """마감 시간까지 한도 대기열에서 슬롯을 받지 못함"""
+
+
+def estimate_tokens(text: str) -> int:
+    """프롬프트 토큰 수 추정 (UTF-8 4바이트당 1토큰 - 영문 약 4자, 한글 약 1.3자)"""
+    return max(1, len(text.encode("utf-8")) // 4)
+
+
+def response_tokens(response: Any) -> Optional[int]:
+    """응답의 실제 사용 토큰 수 (usage 정보가 없으면 None)"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return usage.get("total_tokens")
+    return None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """제공자의 429 응답인지 (openai.RateLimitError 또는 status_code 429)"""
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_transient(error: BaseException) -> bool:
+    """다시 보내면 성공할 수 있는 오류인지 (연결 실패/시간 초과/5xx)"""
+    status = getattr(error, "status_code", None)
+    return (isinstance(status, int) and status >= 500) or type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def _retry_after(error: BaseException) -> float:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return max(float(headers.get("retry-after", RATE_LIMIT_COOLDOWN)), 0.0)
+    except (TypeError, ValueError):
+        return RATE_LIMIT_COOLDOWN
+
+
+class TokenBucket:
+    """분당 per_minute 단위가 채워지는 버킷 (용량 = 1분치)"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 시간(초, refill 직후 호출). 용량보다 큰 요청은 가득 찰 때까지"""
+        missing = min(amount, self.capacity) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _Waiter:
+    __slots__ = ("tokens", "ticket", "seq", "grant", "granted", "cancelled")
+
+    def __init__(self, tokens: int, ticket: PriorityTicket, seq: int, grant: Callable[[], None]):
+        self.tokens = tokens
+        self.ticket = ticket
+        self.seq = seq
+        self.grant = grant
+        self.granted = False
+        self.cancelled = False
+
+
+class LLMScheduler:
+    """
+    LLM 호출 한도/우선순위 스케줄러 (스레드 안전, 동기/비동기 호출 공용)
+
+    Args:
+        rpm: 분당 요청 한도 (0이면 제한 없음)
+        tpm: 분당 토큰 한도 (0이면 제한 없음)
+    """
+
+    def __init__(self, rpm: float = LLM_RPM, tpm: float = LLM_TPM):
+        self._requests = TokenBucket(rpm) if rpm > 0 else None
+        self._tokens = TokenBucket(tpm) if tpm > 0 else None
+        self._cond = threading.Condition()
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._dispatcher: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._requests is not None or self._tokens is not None
+
+    def depth(self, priority: Optional[str] = None) -> int:
+        """대기 중인 호출 수 (priority를 주면 그 우선순위만)"""
+        with self._cond:
+            return sum(
+                1 for waiter in self._waiters
+                if not waiter.cancelled and (priority is None or waiter.ticket.name == priority)
+            )
+
+    # ============ 슬롯 ============
+
+    def _delay(self, tokens: int, now: float) -> float:
+        """지금부터 tokens짜리 호출을 보낼 수 있을 때까지의 시간 (잠금 안에서 호출)"""
+        delay = self._paused_until - now
+        for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+            if bucket is not None:
+                bucket.refill(now)
+                delay = max(delay, bucket.wait_time(amount))
+        return delay
+
+    def _take(self, tokens: int) -> None:
+        if self._requests is not None:
+            self._requests.take(1)
+        if self._tokens is not None:
+            self._tokens.take(tokens)
+
+    def _try_fast_path(self, tokens: int) -> bool:
+        """대기열이 비어 있고 한도가 남았으면 바로 통과 (잠금 안에서 호출, 한도가 없어도 429 중지는 따름)"""
+        if any(not waiter.cancelled for waiter in self._waiters):
+            return False
+        if self._delay(tokens, time.monotonic()) > 0:
+            return False
+        self._take(tokens)
+        return True
+
+    def _enqueue(self, tokens: int, ticket: PriorityTicket, grant: Callable[[], None]) -> _Waiter:
+        """대기열에 등록하고 발송 스레드를 깨움 (잠금 안에서 호출)"""
+        waiter = _Waiter(tokens, ticket, next(self._seq), grant)
+        self._waiters.append(waiter)
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._dispatch, name="llm-scheduler", daemon=True)
+            self._dispatcher.start()
+        self._cond.notify_all()
+        return waiter
+
+    def _dispatch(self) -> None:
+        """우선순위가 가장 높은 대기 호출부터, 한도가 허락하는 대로 슬롯을 내줌"""
+        with self._cond:
+            while True:
+                self._waiters = [waiter for waiter in self._waiters if not waiter.cancelled]
+                if not self._waiters:
+                    self._cond.wait()
+                    continue
+                # 우선순위는 대기 중에 올라갈 수 있으므로 매번 다시 고름
+                head = min(self._waiters, key=lambda waiter: (waiter.ticket.rank, waiter.seq))
+                delay = self._delay(head.tokens, time.monotonic())
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                self._waiters.remove(head)
+                try:
+                    head.grant()
+                except RuntimeError:
+                    # 기다리던 이벤트 루프가 이미 닫힘
+                    continue
+                self._take(head.tokens)
+                head.granted = True
+
+    def _cancel(self, waiter: _Waiter) -> bool:
+        """대기 취소 (이미 슬롯을 받았으면 False, 잠금 안에서 호출)"""
+        if waiter.granted:
+            return False
+        waiter.cancelled = True
+        self._cond.notify_all()
+        return True
+
+    def acquire(self, tokens: int, ticket: Optional[PriorityTicket] = None, timeout: Optional[float] = None) -> float:
+        """
+        슬롯을 받을 때까지 대기 (동기)
+
+        Returns:
+            대기 시간(초)
+
+        Raises:
+            RateLimitTimeout: timeout 안에 슬롯을 받지 못함
+        """
+        ticket = ticket or PriorityTicket()
+        start = time.monotonic()
+        with self._cond:
+            if self._try_fast_path(tokens):
+                return 0.0
+            event = threading.Event()
+            waiter = self._enqueue(tokens, ticket, event.set)
+        if not event.wait(timeout):
+            with self._cond:
+                if self._cancel(waiter):
+                    raise RateLimitTimeout(f"LLM 한도 대기 {timeout:.1f}초 초과")
+        return time.monotonic() - start
+
+    async def aacquire(self, tokens: int, ticket: Optional[PriorityTicket] = None) -> float:
+        """acquire의 비동기 버전 (이벤트 루프를 막지 않음, 취소되면 대기열에서 빠짐)"""
+        ticket = ticket or PriorityTicket()
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def grant() -> None:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        with self._cond:
+            if self._try_fast_path(tokens):
+                return 0.0
+            waiter = self._enqueue(tokens, ticket, grant)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._cond:
+                if not self._cancel(waiter):
+                    # 슬롯을 받은 직후 취소됨 - 쓰지 않은 한도 반환
+                    self._refund(tokens, 1)
+            raise
+        return time.monotonic() - start
+
+    def _refund(self, tokens: int, requests: int = 0) -> None:
+        """쓰지 않은 한도 반환 (잠금 안에서 호출)"""
+        if self._requests is not None and requests:
+            self._requests.give_back(requests)
+        if self._tokens is not None:
+            self._tokens.give_back(tokens)
+        self._cond.notify_all()
+
+    def settle(self, estimated: int, used: int) -> None:
+        """호출 후 토큰 사용량 정산 (추정보다 적게 썼으면 반환, 많이 썼으면 추가 차감)"""
+        if self._tokens is None or used == estimated:
+            return
+        with self._cond:
+            self._tokens.refill(time.monotonic())
+            if used < estimated:
+                self._refund(estimated - used)
+            else:
+                self._tokens.take(used - estimated)
+
+    def pause(self, seconds: float) -> None:
+        """seconds초 동안 새 슬롯 발송 중지 (제공자 429 대응)"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    # ============ 호출 ============
+
+    def _finish(self, response: Any, estimated: int, ticket: PriorityTicket) -> Any:
+        used = response_tokens(response) or estimated
+        self.settle(estimated, used)
+        LLM_TOKENS.inc(used, priority=ticket.name)
+        LLM_CALLS.inc(priority=ticket.name, result="ok")
+        return response
+
+    def _on_error(self, error: Exception, attempt: int, estimated: int, ticket: PriorityTicket) -> bool:
+        """
+        재시도할지 (재시도는 SDK가 아니라 여기서 대기열을 다시 거쳐 보냄)
+
+        실패한 시도는 응답 토큰을 쓰지 않았으므로 미리 차감한 추정치를 돌려준다.
+        429면 발송을 잠시 멈추고, 연결 실패/5xx는 바로 대기열로 돌아가 재시도 횟수 안에서 True.
+        """
+        self.settle(estimated, 0)
+        if attempt < LLM_RATE_LIMIT_RETRIES:
+            if is_rate_limited(error):
+                LLM_CALLS.inc(priority=ticket.name, result="rate_limited")
+                delay = _retry_after(error)
+                logger.warning("⚠️ LLM 한도 초과(429) - %.1f초 발송 중지 후 재시도", delay)
+                self.pause(delay)
+                return True
+            if is_transient(error):
+                LLM_CALLS.inc(priority=ticket.name, result="transient")
+                logger.warning("⚠️ LLM 호출 일시 오류 - 재시도: %s", error)
+                return True
+        LLM_CALLS.inc(priority=ticket.name, result="error")
+        return False
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        prompt: str,
+        ticket: Optional[PriorityTicket] = None,
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """
+        슬롯을 받아 fn() 호출 (동기)
+
+        Args:
+            fn: LLM 호출 (예: lambda: llm.invoke(prompt))
+            prompt: 토큰 추정용 프롬프트
+            ticket: 우선순위 (None이면 현재 컨텍스트)
+            deadline: 슬롯 대기 마감 시각 (time.monotonic 기준)
+        """
+        ticket = ticket or PriorityTicket()
+        estimated = estimate_tokens(prompt) + LLM_EXPECTED_OUTPUT_TOKENS
+        attempt = 0
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                waited = self.acquire(estimated, ticket, timeout)
+            except RateLimitTimeout:
+                LLM_CALLS.inc(priority=ticket.name, result="queue_timeout")
+                raise
+            LLM_QUEUE_WAIT.observe(waited, priority=ticket.name)
+            try:
+                response = fn()
+            except Exception as e:
+                if self._on_error(e, attempt, estimated, ticket):
+                    attempt += 1
+                    continue
+                raise
+            return self._finish(response, estimated, ticket)
+
+    async def acall(
+        self,
+        afn: Callable[[], Awaitable[Any]],
+        prompt: str,
+        ticket: Optional[PriorityTicket] = None,
+    ) -> Any:
+        """call의 비동기 버전 (마감은 호출자가 asyncio.wait_for로 지정)"""
+        ticket = ticket or PriorityTicket()
+        estimated = estimate_tokens(prompt) + LLM_EXPECTED_OUTPUT_TOKENS
+        attempt = 0
+        while True:
+            waited = await self.aacquire(estimated, ticket)
+            LLM_QUEUE_WAIT.observe(waited, priority=ticket.name)
+            try:
+                response = await afn()
+            except Exception as e:
+                if self._on_error(e, attempt, estimated, ticket):
+                    attempt += 1
+                    continue
+                raise
+            return self._finish(response, estimated, ticket)
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """프로세스 공유 LLM 스케줄러 (LLM_RPM / LLM_TPM: 0이면 해당 한도 없음)"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
+
+
+def set_llm_scheduler(scheduler: Optional[LLMScheduler]) -> None:
+    """
+    LLM 스케줄러 교체 (테스트/벤치마크용)
+
+    Args:
+        scheduler: 새 스케줄러 (None이면 다음 조회 시 환경 변수로 다시 생성)
+    """
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
+
+
+def _queue_depth(priority: str) -> float:
+    scheduler = _scheduler
+    return scheduler.depth(priority) if scheduler is not None else 0
+
+
+for _name in PRIORITIES:
+    LLM_QUEUE_DEPTH.set_function(lambda name=_name: _queue_depth(name), priority=_name)
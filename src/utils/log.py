@@ -0,0 +1,53 @@
+"""로깅 설정 - 노드 진행 출력을 레벨로 제어
+
+기본 레벨은 WARNING이므로 노드의 진행 메시지(INFO)는 출력되지 않아
+stdout I/O가 요청 처리 경로에서 빠진다. 개발 중에는 환경 변수로 켠다:
+
+    RAG_EDU_LOG_LEVEL=INFO python app.py
+"""
+import logging
+import os
+import sys
+import threading
+
+
+ROOT_LOGGER_NAME = "rag_edu"
+DEFAULT_LOG_LEVEL = "WARNING"
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def _configure() -> None:
+    """rag_edu 루트 로거에 stdout 핸들러 연결 (최초 1회)"""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        root.addHandler(handler)
+        root.setLevel(os.getenv("RAG_EDU_LOG_LEVEL", DEFAULT_LOG_LEVEL).upper())
+        root.propagate = False
+        _configured = True
+
+
+def get_logger(module_name: str) -> logging.Logger:
+    """
+    모듈용 로거 반환
+
+    Args:
+        module_name: 보통 __name__ (예: src.nodes.domain_detect → rag_edu.nodes.domain_detect)
+    """
+    if not _configured:
+        _configure()
+    suffix = module_name.split(".", 1)[1] if "." in module_name else module_name
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{suffix}")
+
+
+def set_log_level(level: str) -> None:
+    """실행 중 로그 레벨 변경 (예: "INFO", "WARNING")"""
+    if not _configured:
+        _configure()
+    logging.getLogger(ROOT_LOGGER_NAME).setLevel(level.upper())
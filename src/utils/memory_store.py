@@ -0,0 +1,240 @@
+"""사용자 메모리 저장소 - User.id별 Memory/Mastery를 SQLite(WAL)에 영속화
+
+대화 턴이 시작될 때 create_initial_state가 불러오고, memory_write 노드가
+턴 끝에 저장한다. WAL 모드라 읽기는 쓰기와 동시에 진행되며, 여러 사용자의
+갱신은 save_many로 한 트랜잭션에 묶어 fsync 횟수를 줄인다.
+
+노드는 저장소를 직접 쓰지 않고 write-behind 큐를 거친다 (응답 경로에서 디스크 I/O 제외):
+
+    save_user_record("user-1", {"memory": {...}, "mastery": {...}})
+    load_user_record("user-1")      # 아직 쓰이지 않은 갱신까지 반영
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+from .write_behind import WriteBehindQueue, register_for_shutdown
+
+
+DEFAULT_DB_PATH = os.path.join(".cache", "memory.db")
+
+# 저장 대상 필드 (GraphState 키와 동일)
+RECORD_FIELDS = ("memory", "mastery")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_memory (
+    user_id TEXT PRIMARY KEY,
+    memory TEXT NOT NULL,
+    mastery TEXT NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+_UPSERT = """
+INSERT INTO user_memory (user_id, memory, mastery, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT(user_id) DO UPDATE SET
+    memory = excluded.memory,
+    mastery = excluded.mastery,
+    updated_at = excluded.updated_at
+"""
+
+
+class _ConnectionHolder:
+    """스레드 로컬에 두는 연결 래퍼 (스레드가 끝나 해제되면 연결을 닫기 위한 weakref 대상)"""
+    __slots__ = ("connection", "__weakref__")
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+
+def _close_connection(connection: sqlite3.Connection, connections: set, lock: threading.Lock) -> None:
+    with lock:
+        connections.discard(connection)
+    connection.close()
+
+
+class MemoryStore:
+    """
+    SQLite 기반 사용자 메모리 저장소
+
+    스레드마다 연결을 따로 열어 읽기가 서로를 막지 않게 한다.
+    연결은 스레드가 끝나면 닫힌다 (to_thread/워커 풀의 짧은 스레드가 핸들을 남기지 않음).
+    레코드는 {"memory": dict, "mastery": dict} 형태의 JSON 직렬화 가능한 값이다.
+
+    Args:
+        path: DB 파일 경로 (":memory:"는 스레드마다 별도 DB가 되므로 단일 스레드 테스트용)
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._connections: set = set()
+        self._connections_lock = threading.Lock()
+        self._connection()  # 스키마/WAL 설정을 생성 시점에 끝냄
+
+    def _connection(self) -> sqlite3.Connection:
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # WAL에서는 NORMAL이어도 커밋 단위 원자성이 유지됨 (전원 장애 시 마지막 커밋만 유실 가능)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            connection.execute(_SCHEMA)
+            connection.commit()
+            holder = self._local.holder = _ConnectionHolder(connection)
+            with self._connections_lock:
+                self._connections.add(connection)
+            # 스레드가 끝나 스레드 로컬이 해제되면 연결도 닫음
+            weakref.finalize(holder, _close_connection, connection, self._connections, self._connections_lock)
+        return holder.connection
+
+    def load(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """저장된 레코드 (없으면 None)"""
+        row = self._connection().execute(
+            "SELECT memory, mastery FROM user_memory WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"memory": json.loads(row[0]), "mastery": json.loads(row[1])}
+
+    def save(self, user_id: str, record: Dict[str, Any]) -> None:
+        """레코드 1건 저장 (upsert)"""
+        self.save_many([(user_id, record)])
+
+    def save_many(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        여러 사용자의 레코드를 한 트랜잭션으로 저장
+
+        Returns:
+            저장한 레코드 수
+        """
+        now = time.time()
+        rows = [
+            (
+                user_id,
+                json.dumps(record.get("memory", {}), ensure_ascii=False, separators=(",", ":")),
+                json.dumps(record.get("mastery", {}), ensure_ascii=False, separators=(",", ":")),
+                now,
+            )
+            for user_id, record in records
+        ]
+        if not rows:
+            return 0
+        connection = self._connection()
+        with connection:
+            connection.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def delete(self, user_id: str) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM user_memory WHERE user_id = ?", (user_id,))
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM user_memory").fetchone()[0]
+
+    def close(self) -> None:
+        """모든 스레드의 연결 닫기"""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+
+_memory_store: Optional[MemoryStore] = None
+_memory_writer: Optional[WriteBehindQueue] = None
+_memory_store_lock = threading.Lock()
+_memory_store_disabled = False
+
+
+def get_memory_store() -> Optional[MemoryStore]:
+    """
+    프로세스 공유 메모리 저장소
+
+    - MEMORY_DB_PATH: DB 경로 (빈 문자열이면 영속화하지 않고 None 반환)
+    """
+    global _memory_store, _memory_store_disabled
+    if _memory_store is None and not _memory_store_disabled:
+        with _memory_store_lock:
+            if _memory_store is None and not _memory_store_disabled:
+                path = os.getenv("MEMORY_DB_PATH", DEFAULT_DB_PATH)
+                if path:
+                    _memory_store = MemoryStore(path)
+                else:
+                    _memory_store_disabled = True
+    return _memory_store
+
+
+def get_memory_writer() -> Optional[WriteBehindQueue]:
+    """
+    메모리 저장소 앞단의 write-behind 큐 (저장소가 비활성화면 None)
+
+    - MEMORY_WRITE_BACKLOG: 대기 가능한 최대 사용자 수 (기본 10000)
+    - MEMORY_WRITE_POLICY: 가득 찼을 때 "block"(기본) 또는 "drop"
+    """
+    global _memory_writer
+    if _memory_writer is None:
+        store = get_memory_store()
+        if store is None:
+            return None
+        with _memory_store_lock:
+            if _memory_writer is None:
+                _memory_writer = register_for_shutdown(WriteBehindQueue(
+                    store.save_many,
+                    name="memory",
+                    max_pending=int(os.getenv("MEMORY_WRITE_BACKLOG", "10000")),
+                    policy=os.getenv("MEMORY_WRITE_POLICY", "block"),
+                ))
+    return _memory_writer
+
+
+def load_user_record(user_id: str) -> Optional[Dict[str, Any]]:
+    """쓰기 대기 중인 갱신을 우선하여 사용자 레코드 조회"""
+    writer = get_memory_writer()
+    if writer is None:
+        return None
+    record = writer.get(user_id)
+    if record is not None:
+        return record
+    return get_memory_store().load(user_id)
+
+
+def save_user_record(user_id: str, record: Dict[str, Any]) -> bool:
+    """
+    사용자 레코드를 write-behind 큐에 등록
+
+    Returns:
+        False면 저장소가 비활성화되었거나 대기열이 가득 차 버려짐
+    """
+    writer = get_memory_writer()
+    if writer is None:
+        return False
+    return writer.submit(user_id, record)
+
+
+def set_memory_store(store: Optional[MemoryStore]) -> None:
+    """
+    메모리 저장소 교체 (테스트/벤치마크용, 기존 큐의 남은 갱신은 먼저 씀)
+
+    Args:
+        store: 새 저장소 (None이면 다음 조회 시 환경 변수로 다시 생성)
+    """
+    global _memory_store, _memory_writer, _memory_store_disabled
+    with _memory_store_lock:
+        writer = _memory_writer
+        _memory_store = store
+        _memory_writer = None
+        _memory_store_disabled = False
+    if writer is not None:
+        writer.close()
@@ -0,0 +1,224 @@
+"""응답 캐시 - 비슷하게 표현된 같은 질문이면 그래프를 실행하지 않고 이전 최종 응답 반환
+
+조회 구조:
+- 질문을 BM25 토큰 집합으로 바꿔 MinHash 서명 계산 (질문형 어미는 토큰화에서 이미 제외)
+- 서명을 band로 나눈 LSH 버킷에서 후보를 찾고, 토큰 집합의 실제 Jaccard로 확인
+- 버킷 키에 컨텍스트(분야, 경험 수준/선호, 제약)가 들어가므로 컨텍스트가 다르면 후보가 되지 않음
+
+항목은 만들 때의 DomainPack fingerprint를 기억하고, 현재 팩과 다르면 버린다
+(팩이 다시 생성되면 그 분야의 응답은 모두 무효). TTL이 지났거나 LRU로 밀려난 항목도 제거한다.
+응답 본문에 원래 질문이 그대로 들어 있으면 히트한 질문 표현으로 바꿔 돌려준다.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Hashable, List, Optional, Tuple
+import itertools
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from .bm25 import tokenize
+from .metrics import REGISTRY
+
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))       # 0이면 사용 안 함
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))        # 초, 0이면 만료 없음
+# 같은 질문으로 볼 토큰 집합 Jaccard 하한
+# (어순/조사/어미만 다른 변형은 0.7 이상, 핵심어 하나가 다른 질문은 0.5 안팎)
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.65"))
+
+# MinHash 64개를 4개씩 16 band로 → Jaccard 0.65인 쌍이 후보가 될 확률 약 96%
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+MINHASH_SEED = 20240611
+# 저장한 응답에서 원래 질문 자리를 표시 (일반 텍스트에 나오지 않는 문자)
+_QUESTION_SLOT = "\x00question\x00"
+
+CACHE_LOOKUPS = REGISTRY.counter(
+    "rag_edu_response_cache_lookups_total", "응답 캐시 조회 결과 수", ["result"]
+)
+CACHE_EVICTIONS = REGISTRY.counter(
+    "rag_edu_response_cache_evictions_total", "LRU로 밀려난 응답 캐시 항목 수"
+)
+
+
+@dataclass
+class _Entry:
+    tokens: FrozenSet[str]
+    context: Tuple[Hashable, ...]
+    fingerprint: str
+    response: str
+    created_at: float
+    buckets: List[Tuple]
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class ResponseCache:
+    """
+    MinHash/LSH 기반 근사 중복 질문 응답 캐시 (스레드 안전)
+
+    Args:
+        max_entries: 최대 항목 수 (넘으면 가장 오래 쓰지 않은 항목 제거)
+        ttl_seconds: 항목 유효 시간 (0이면 만료 없음)
+        threshold: 같은 질문으로 볼 Jaccard 하한
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_SIZE,
+        ttl_seconds: float = RESPONSE_CACHE_TTL,
+        threshold: float = RESPONSE_CACHE_THRESHOLD,
+        num_perm: int = MINHASH_PERMUTATIONS,
+        bands: int = LSH_BANDS,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어떨어져야 함")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.bands = bands
+        rng = np.random.default_rng(MINHASH_SEED)
+        # multiply-shift 해시족: h(x) = ((a·x + b) mod 2^64) >> 32
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple, set] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "expired": 0, "evictions": 0, "writes": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    # ============ MinHash / LSH ============
+
+    def signature(self, tokens: FrozenSet[str]) -> np.ndarray:
+        """토큰 집합의 MinHash 서명"""
+        hashes = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in tokens), dtype=np.uint64, count=len(tokens))
+        with np.errstate(over="ignore"):
+            return ((hashes[:, None] * self._a + self._b) >> np.uint64(32)).min(axis=0)
+
+    def _bucket_keys(self, tokens: FrozenSet[str], context: Tuple[Hashable, ...]) -> List[Tuple]:
+        bands = self.signature(tokens).reshape(self.bands, -1)
+        return [(context, band, row.tobytes()) for band, row in enumerate(bands)]
+
+    # ============ 조회/저장 ============
+
+    def get(self, question: str, context: Tuple[Hashable, ...], fingerprint: str) -> Optional[str]:
+        """
+        비슷한 질문의 캐시된 응답
+
+        Args:
+            question: 사용자 질문
+            context: 응답을 바꾸는 조건 (분야, 경험 수준, 제약 등 hashable 튜플)
+            fingerprint: 현재 DomainPack fingerprint (다르면 캐시 무효)
+        """
+        tokens = frozenset(tokenize(question))
+        if not self.enabled or not tokens:
+            return None
+        buckets = self._bucket_keys(tokens, context)
+        now = time.time()
+        with self._lock:
+            best_id, best_score = None, self.threshold
+            candidates = set().union(*(self._buckets.get(key, ()) for key in buckets))
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                if self._is_expired(entry, now):
+                    self._remove(entry_id)
+                    self._count("expired")
+                elif entry.fingerprint != fingerprint:
+                    self._remove(entry_id)
+                    self._count("stale")
+                else:
+                    score = jaccard(tokens, entry.tokens)
+                    if score >= best_score:
+                        best_id, best_score = entry_id, score
+            if best_id is None:
+                self._count("misses")
+                return None
+            self._entries.move_to_end(best_id)
+            self._count("hits")
+            return self._entries[best_id].response.replace(_QUESTION_SLOT, question)
+
+    def put(self, question: str, context: Tuple[Hashable, ...], fingerprint: str, response: str) -> None:
+        """응답 저장 (같은 버킷의 거의 같은 질문 항목은 교체)"""
+        tokens = frozenset(tokenize(question))
+        if not self.enabled or not tokens:
+            return
+        buckets = self._bucket_keys(tokens, context)
+        with self._lock:
+            for entry_id in set().union(*(self._buckets.get(key, ()) for key in buckets)):
+                if jaccard(tokens, self._entries[entry_id].tokens) >= self.threshold:
+                    self._remove(entry_id)
+            entry_id = next(self._ids)
+            template = response.replace(question, _QUESTION_SLOT) if question.strip() else response
+            self._entries[entry_id] = _Entry(tokens, context, fingerprint, template, time.time(), buckets)
+            for key in buckets:
+                self._buckets.setdefault(key, set()).add(entry_id)
+            self._stats["writes"] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+                CACHE_EVICTIONS.inc()
+
+    def _is_expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry.created_at > self.ttl_seconds
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        for key in entry.buckets:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _count(self, result: str) -> None:
+        self._stats[result] += 1
+        CACHE_LOOKUPS.inc(result=result)
+
+    def stats(self) -> Dict[str, int]:
+        """히트/미스 카운터 스냅샷"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["entries"] = len(self._entries)
+        return snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """프로세스 공유 응답 캐시 (RESPONSE_CACHE_SIZE / RESPONSE_CACHE_TTL / RESPONSE_CACHE_THRESHOLD)"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """
+    응답 캐시 교체 (테스트/벤치마크용)
+
+    Args:
+        cache: 새 캐시 (None이면 다음 조회 시 환경 변수로 다시 생성)
+    """
+    global _response_cache
+    with _response_cache_lock:
+        _response_cache = cache
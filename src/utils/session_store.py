@@ -0,0 +1,151 @@
+"""세션 체크포인터 - 대화 세션별 그래프 상태를 메모리에 보관
+
+LangGraph InMemorySaver는 모든 중간 체크포인트와 채널 버전을 영원히 쌓는다.
+세션 재개에는 마지막 상태만 필요하므로 세션마다 최신 체크포인트 1개만 남기고,
+세션 수가 상한을 넘으면 가장 오래 쓰지 않은 세션을 지운다.
+
+사용자 memory/mastery의 재시작 간 영속화는 memory_store가 맡고,
+이 체크포인터는 같은 프로세스 안에서의 턴 간 상태(domain_pack, 프로필 시각 등)를 맡는다.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple, get_args, get_type_hints
+import os
+import threading
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from pydantic import BaseModel
+
+from ..state import GraphState
+
+
+DEFAULT_MAX_SESSIONS = 1000
+
+
+class SessionSaver(InMemorySaver):
+    """
+    최신 체크포인트만 유지하는 LRU 세션 체크포인터
+
+    Args:
+        max_sessions: 보관할 최대 세션(thread_id) 수
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.max_sessions = max_sessions
+        # thread_id → None (순서가 곧 최근 사용 순서)
+        self._sessions: "OrderedDict[str, None]" = OrderedDict()
+        # (thread_id, checkpoint_ns) → 최신 체크포인트의 채널 버전
+        self._latest_versions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # 실행 중인 세션 → 실행 수 (LRU 제거 대상에서 제외)
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def _touch(self, thread_id: str) -> None:
+        """세션을 최근 사용으로 표시하고 상한 초과분 제거 (잠금 안에서 호출)"""
+        self._sessions[thread_id] = None
+        self._sessions.move_to_end(thread_id)
+        while len(self._sessions) > self.max_sessions:
+            victim = next(
+                (tid for tid in self._sessions if tid not in self._pins and tid != thread_id), None
+            )
+            if victim is None:
+                # 방금 저장한 세션 외에 모두 실행 중이면 끝날 때까지 상한 초과 허용
+                break
+            del self._sessions[victim]
+            self._delete(victim)
+
+    def _delete(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        for key in [key for key in self._latest_versions if key[0] == thread_id]:
+            del self._latest_versions[key]
+
+    def get_tuple(self, config):
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            if thread_id in self._sessions:
+                self._sessions.move_to_end(thread_id)
+            return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            saved_config = super().put(config, checkpoint, metadata, new_versions)
+
+            # 이전 체크포인트와 그 pending writes 제거
+            checkpoints = self.storage[thread_id][checkpoint_ns]
+            for checkpoint_id in [cid for cid in checkpoints if cid != checkpoint["id"]]:
+                del checkpoints[checkpoint_id]
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+            # 새 버전으로 대체된 채널 값 제거
+            key = (thread_id, checkpoint_ns)
+            previous = self._latest_versions.get(key, {})
+            for channel, version in new_versions.items():
+                old_version = previous.get(channel)
+                if old_version is not None and old_version != version:
+                    self.blobs.pop((thread_id, checkpoint_ns, channel, old_version), None)
+            self._latest_versions[key] = dict(checkpoint["channel_versions"])
+
+            self._touch(thread_id)
+            return saved_config
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(thread_id, None)
+            self._delete(thread_id)
+
+    def pin(self, thread_id: str) -> bool:
+        """
+        실행 동안 세션을 LRU 제거에서 제외 (unpin으로 해제)
+
+        확인과 고정을 한 잠금 안에서 하므로, 확인한 뒤 실행 전에 세션이 지워지는 일이 없다.
+
+        Returns:
+            세션 체크포인트가 이미 있는지
+        """
+        with self._lock:
+            self._pins[thread_id] = self._pins.get(thread_id, 0) + 1
+            exists = thread_id in self._sessions
+            if exists:
+                self._sessions.move_to_end(thread_id)
+            return exists
+
+    def unpin(self, thread_id: str) -> None:
+        with self._lock:
+            count = self._pins.get(thread_id, 0) - 1
+            if count > 0:
+                self._pins[thread_id] = count
+            else:
+                self._pins.pop(thread_id, None)
+
+    def has_session(self, thread_id: str) -> bool:
+        with self._lock:
+            return thread_id in self._sessions
+
+    def session_count(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+def _state_models() -> List[Tuple[str, str]]:
+    """GraphState 필드에 쓰이는 pydantic 모델 (체크포인트 역직렬화 허용 목록)"""
+    models = set()
+    for annotation in get_type_hints(GraphState).values():
+        for candidate in (annotation, *get_args(annotation)):
+            if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+                models.add((candidate.__module__, candidate.__name__))
+    return sorted(models)
+
+
+def create_session_saver() -> SessionSaver:
+    """환경 변수로 설정한 세션 체크포인터 (SESSION_MAX_ENTRIES: 최대 세션 수)"""
+    return SessionSaver(
+        max_sessions=int(os.getenv("SESSION_MAX_ENTRIES", DEFAULT_MAX_SESSIONS)),
+        serde=JsonPlusSerializer(allowed_msgpack_modules=_state_models()),
+    )
@@ -0,0 +1,98 @@
+"""Single-flight - 같은 키의 동시 작업을 하나로 합침
+
+같은 키로 동시에 들어온 호출 중 첫 번째(리더)만 작업을 실행하고, 나머지(팔로워)는
+리더의 결과를 함께 받는다. 리더가 예외로 끝나면 팔로워도 같은 예외를 받는다.
+작업이 끝나면 키를 비우므로 이후 호출은 새로 실행한다 (결과 캐시가 아님).
+
+진행 중인 작업은 concurrent.futures.Future로 공유하므로 동기 호출(do)과 비동기 호출(ado)이,
+서로 다른 스레드나 이벤트 루프에서 와도 같은 작업에 합류한다.
+
+    flights = SingleFlight("domain_pack")
+    pack = flights.do(key, lambda: generate(domain))
+    pack = await flights.ado(key, lambda: agenerate(domain))
+"""
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import threading
+
+from .metrics import REGISTRY
+
+
+SINGLEFLIGHT_CALLS = REGISTRY.counter(
+    "rag_edu_singleflight_calls_total", "single-flight 호출 수 (leader: 실행, follower: 결과 공유)", ["group", "role"]
+)
+
+
+class SingleFlight:
+    """
+    키별 동시 작업 합치기 (스레드 안전)
+
+    Args:
+        name: 메트릭 group 라벨
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """진행 중인 작업의 Future와 리더 여부"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        SINGLEFLIGHT_CALLS.inc(group=self.name, role="leader" if leader else "follower")
+        return future, leader
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None,
+                error: Optional[BaseException] = None) -> None:
+        # 결과를 알리기 전에 키를 비워, 결과를 받은 뒤의 호출은 새 작업을 시작하게 함
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """key의 작업 결과 (진행 중이면 합류해 대기, 아니면 fn() 실행)"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def ado(self, key: Hashable, afn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        do의 비동기 버전 (afn()은 코루틴을 반환)
+
+        작업은 별도 태스크로 실행하므로 리더 호출이 취소돼도 팔로워는 결과를 받는다.
+        """
+        future, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(afn())
+
+            def done(task: asyncio.Task) -> None:
+                if task.cancelled():
+                    self._finish(key, future, error=asyncio.CancelledError())
+                elif task.exception() is not None:
+                    self._finish(key, future, error=task.exception())
+                else:
+                    self._finish(key, future, result=task.result())
+
+            task.add_done_callback(done)
+        # 이 호출이 취소돼도 공유 작업은 취소하지 않음
+        return await asyncio.shield(asyncio.wrap_future(future))
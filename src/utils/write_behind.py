@@ -0,0 +1,260 @@
+"""Write-behind 큐 - 저장소 쓰기를 응답 경로에서 분리
+
+submit()은 메모리에 기록만 하고 즉시 반환하며, 백그라운드 스레드가 모아서
+write_many()로 한 번에 쓴다. 같은 키의 갱신이 쓰기 전에 여러 번 들어오면
+마지막 값 하나로 합친다(coalescing). 아직 쓰지 않은 값은 get()으로 읽을 수 있어
+다음 턴이 직전 턴의 기록을 놓치지 않는다.
+
+대기열이 max_pending을 넘으면 정책에 따라:
+- "block": 자리가 날 때까지 호출자를 기다리게 함 (block_timeout 초과 시 버림)
+- "drop": 새 키의 갱신을 바로 버림
+
+배치 쓰기가 실패하면(SQLITE_BUSY, 디스크 가득 참 등) 그 사이 더 새 값이 들어오지 않은 키를
+대기열 앞에 되돌리고 지수 백오프로 다시 쓴다. max_retries번 연속 실패한 키만 버린다.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import atexit
+import threading
+import time
+
+from .log import get_logger
+from .metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+
+POLICIES = ("block", "drop")
+# 재시도 대기 상한(초)
+MAX_RETRY_BACKOFF = 5.0
+
+QUEUE_DEPTH = REGISTRY.gauge(
+    "rag_edu_write_behind_depth", "쓰기 대기 중인 키 수 (진행 중인 배치 포함)", ["queue"]
+)
+QUEUE_WRITTEN = REGISTRY.counter(
+    "rag_edu_write_behind_written_total", "저장소에 쓴 레코드 수", ["queue"]
+)
+QUEUE_COALESCED = REGISTRY.counter(
+    "rag_edu_write_behind_coalesced_total", "쓰기 전에 덮어써져 합쳐진 갱신 수", ["queue"]
+)
+QUEUE_DROPPED = REGISTRY.counter(
+    "rag_edu_write_behind_dropped_total", "대기열이 가득 차거나 재시도를 다 써서 버린 갱신 수", ["queue"]
+)
+QUEUE_ERRORS = REGISTRY.counter(
+    "rag_edu_write_behind_errors_total", "실패한 배치 쓰기 수", ["queue"]
+)
+FLUSH_LATENCY = REGISTRY.histogram(
+    "rag_edu_write_behind_flush_seconds", "배치 쓰기 시간(초)", ["queue"]
+)
+
+
+class WriteBehindQueue:
+    """
+    키별로 합쳐지는 백그라운드 쓰기 큐
+
+    Args:
+        write_many: [(key, value), ...]를 받아 저장하는 함수
+        name: 메트릭 라벨
+        max_pending: 대기 가능한 최대 키 수
+        policy: 대기열이 가득 찼을 때 "block" 또는 "drop"
+        block_timeout: block 정책에서 기다리는 최대 시간(초)
+        batch_size: 한 번에 쓰는 최대 레코드 수
+        linger: 첫 갱신 후 배치를 모으기 위해 기다리는 시간(초)
+        max_retries: 쓰기에 실패한 키를 다시 시도하는 최대 횟수
+        retry_backoff: 첫 재시도 전 대기 시간(초, 연속 실패마다 두 배)
+    """
+
+    def __init__(
+        self,
+        write_many: Callable[[Iterable[Tuple[str, Any]]], Any],
+        name: str = "default",
+        max_pending: int = 10000,
+        policy: str = "block",
+        block_timeout: float = 1.0,
+        batch_size: int = 256,
+        linger: float = 0.005,
+        max_retries: int = 5,
+        retry_backoff: float = 0.1,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"policy는 {POLICIES} 중 하나여야 함: {policy}")
+        self.write_many = write_many
+        self.name = name
+        self.max_pending = max_pending
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._pending: "OrderedDict[str, Any]" = OrderedDict()
+        self._inflight: Dict[str, Any] = {}
+        # 키별 연속 쓰기 실패 횟수, 큐 전체 연속 실패 배치 수(백오프 계산)
+        self._attempts: Dict[str, int] = {}
+        self._failures = 0
+        self._closing = threading.Event()
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._has_space = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+
+        QUEUE_DEPTH.set_function(self.depth, queue=name)
+        self._thread = threading.Thread(target=self._run, name=f"write-behind-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, key: str, value: Any) -> bool:
+        """
+        갱신 등록 (저장소 I/O 없이 반환)
+
+        Returns:
+            False면 대기열이 가득 차 갱신을 버림
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"write-behind 큐({self.name})가 이미 닫힘")
+            if key in self._pending:
+                self._pending[key] = value
+                QUEUE_COALESCED.inc(queue=self.name)
+                return True
+
+            if len(self._pending) >= self.max_pending:
+                if self.policy == "block":
+                    deadline = time.monotonic() + self.block_timeout
+                    while len(self._pending) >= self.max_pending and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._has_space.wait(remaining)
+                if len(self._pending) >= self.max_pending:
+                    QUEUE_DROPPED.inc(queue=self.name)
+                    logger.warning("⚠️ write-behind 큐(%s) 가득 참 - %s 갱신 버림", self.name, key)
+                    return False
+
+            self._pending[key] = value
+            self._has_work.notify()
+            return True
+
+    def get(self, key: str) -> Optional[Any]:
+        """아직 저장소에 쓰지 않은 최신 값 (없으면 None)"""
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            return self._inflight.get(key)
+
+    def depth(self) -> int:
+        with self._lock:
+            return len(self._pending) + len(self._inflight)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        지금까지 등록된 갱신이 모두 쓰일 때까지 대기
+
+        Returns:
+            timeout 안에 비워졌는지
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._has_work.notify()
+            while self._pending or self._inflight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+            return True
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """남은 갱신을 쓰고 워커 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._closing.set()
+            self._has_work.notify()
+            self._has_space.notify_all()
+        self._thread.join(timeout)
+        if self._pending:
+            logger.warning("⚠️ write-behind 큐(%s) 종료 시 %s건을 쓰지 못함", self.name, len(self._pending))
+
+    def _take_batch(self) -> List[Tuple[str, Any]]:
+        """대기열 앞쪽에서 배치 꺼내기 (잠금 안에서 호출)"""
+        batch = []
+        while self._pending and len(batch) < self.batch_size:
+            batch.append(self._pending.popitem(last=False))
+        self._inflight = dict(batch)
+        self._has_space.notify_all()
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._has_work.wait()
+                if not self._pending and self._closed:
+                    return
+            # 짧게 기다려 같은 배치에 더 많은 갱신을 모음 (종료 중에는 생략)
+            if self.linger and not self._closed:
+                time.sleep(self.linger)
+            with self._lock:
+                batch = self._take_batch()
+
+            start = time.perf_counter()
+            failed = False
+            try:
+                self.write_many(batch)
+                QUEUE_WRITTEN.inc(len(batch), queue=self.name)
+            except Exception as e:
+                failed = True
+                QUEUE_ERRORS.inc(queue=self.name)
+                logger.error("❌ write-behind 큐(%s) 배치 쓰기 실패 (%s건): %s", self.name, len(batch), e)
+            finally:
+                FLUSH_LATENCY.observe(time.perf_counter() - start, queue=self.name)
+                with self._lock:
+                    if failed:
+                        self._requeue(batch)
+                    else:
+                        self._failures = 0
+                        for key, _ in batch:
+                            self._attempts.pop(key, None)
+                    self._inflight = {}
+                    if not self._pending:
+                        self._idle.notify_all()
+
+            # 실패 직후 같은 오류를 반복하지 않도록 잠시 쉼 (종료 중에는 바로 재시도)
+            if failed and self._pending:
+                delay = min(self.retry_backoff * 2 ** (self._failures - 1), MAX_RETRY_BACKOFF)
+                self._closing.wait(delay)
+
+    def _requeue(self, batch: List[Tuple[str, Any]]) -> None:
+        """실패한 배치를 대기열 앞에 되돌림 (잠금 안에서 호출, 더 새 값이 있는 키는 제외)"""
+        self._failures += 1
+        for key, value in reversed(batch):
+            if key in self._pending:
+                # 쓰는 동안 들어온 새 값이 이 값을 대체
+                self._attempts.pop(key, None)
+                continue
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts > self.max_retries:
+                self._attempts.pop(key, None)
+                QUEUE_DROPPED.inc(queue=self.name)
+                logger.error("❌ write-behind 큐(%s) %s 갱신을 %s회 재시도 후 버림", self.name, key, self.max_retries)
+                continue
+            self._attempts[key] = attempts
+            self._pending[key] = value
+            self._pending.move_to_end(key, last=False)
+
+
+_open_queues: List[WriteBehindQueue] = []
+
+
+def register_for_shutdown(queue: WriteBehindQueue) -> WriteBehindQueue:
+    """프로세스 종료 시 남은 갱신을 쓰도록 등록"""
+    _open_queues.append(queue)
+    return queue
+
+
+@atexit.register
+def _close_all() -> None:
+    for queue in _open_queues:
+        queue.close()
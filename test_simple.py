@@ -1,6 +1,7 @@
 """간단한 테스트 스크립트 - API 키 없이도 그래프 구조 확인 가능"""
+import os
 import sys
-sys.path.append('/root/rag_edu')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.graph import create_graph
 from src.state import create_initial_state
@@ -40,6 +41,89 @@ def test_graph_structure():
         return False
 
 
+def test_graph_registry():
+    """컴파일된 그래프 레지스트리 테스트"""
+    print("\n" + "=" * 50)
+    print("그래프 레지스트리 테스트")
+    print("=" * 50)
+    
+    from src.graph import get_graph, rebuild_graph
+    
+    first = get_graph()
+    assert get_graph() is first, "같은 프로세스에서는 동일한 그래프를 재사용해야 함"
+    
+    rebuild_graph()
+    rebuilt = get_graph()
+    assert rebuilt is not first, "rebuild_graph 후에는 새 그래프여야 함"
+    assert get_graph() is rebuilt
+    
+    print("✅ 그래프 재사용 및 재빌드 확인")
+    return True
+
+
+def test_async_graph():
+    """비동기 그래프 실행 테스트 (ainvoke 경로가 동기 경로와 같은 응답을 생성)"""
+    print("\n" + "=" * 50)
+    print("비동기 그래프 실행 테스트")
+    print("=" * 50)
+    
+    import asyncio
+    from src.graph import run_rag_education_bot, arun_rag_education_bot
+    
+    question = "Hybrid Search가 뭐야?"
+    sync_response = run_rag_education_bot(question)
+    
+    async def run_concurrently():
+        return await asyncio.gather(*(arun_rag_education_bot(question) for _ in range(5)))
+    
+    async_responses = asyncio.run(run_concurrently())
+    assert all(response == sync_response for response in async_responses)
+    assert "신뢰도" in sync_response
+    
+    # 블로킹 I/O가 있는 노드(메모리 저장, 검색 색인 조회)는 이벤트 루프 밖 스레드에서 실행
+    import threading
+    import src.nodes.intent_detect as intent_detect_module
+    import src.nodes.memory_write as memory_write_module
+    from src.utils.response_cache import get_response_cache
+    threads, retrieve_threads = [], []
+    original_save = memory_write_module.save_user_record
+    original_retrieve = intent_detect_module.retrieve_context_docs
+    memory_write_module.save_user_record = lambda user_id, record: threads.append(threading.get_ident())
+    intent_detect_module.retrieve_context_docs = lambda question: retrieve_threads.append(threading.get_ident()) or []
+    
+    async def run_as_user():
+        loop_thread = threading.get_ident()
+        await arun_rag_education_bot("비동기 저장 경로 확인 질문", user_id="async-user", raise_errors=True)
+        return loop_thread
+    
+    try:
+        get_response_cache().clear()
+        loop_thread = asyncio.run(run_as_user())
+    finally:
+        memory_write_module.save_user_record = original_save
+        intent_detect_module.retrieve_context_docs = original_retrieve
+    assert threads and loop_thread not in threads, "memory_write는 스레드에서 실행"
+    assert retrieve_threads and loop_thread not in retrieve_threads, "intent_detect 검색은 스레드에서 실행"
+    
+    # 스트리밍: compose_answer의 개요/섹션이 노드 완료 전에 하나씩 나옴
+    from src.graph import arun_rag_education_bot_stream
+    
+    async def collect_stream():
+        return [output async for output in arun_rag_education_bot_stream("비동기 스트리밍 섹션 확인 질문", raise_errors=True)]
+    
+    get_response_cache().clear()
+    outputs = asyncio.run(collect_stream())
+    partials = [output["compose_answer"] for output in outputs if "partial" in output.get("compose_answer", {})]
+    completed = next(output["compose_answer"] for output in outputs if "answer" in output.get("compose_answer", {}))
+    answer = completed["answer"]
+    assert partials[0] == {"partial": "outline", "content": answer.outline}
+    assert [{"title": p["title"], "content": p["content"]} for p in partials[1:]] == answer.content_blocks
+    assert outputs.index({"compose_answer": partials[-1]}) < outputs.index({"compose_answer": completed})
+    
+    print("✅ 동시 비동기 실행 5건 확인")
+    return True
+
+
 def test_state_creation():
     """상태 생성 테스트"""
     print("\n" + "=" * 50)
@@ -99,15 +183,1274 @@ def test_domain_data():
         return False
 
 
+def test_domain_cache():
+    """DomainPack 캐시 테스트 (메모리/디스크 티어, TTL, LRU)"""
+    print("\n" + "=" * 50)
+    print("DomainPack 캐시 테스트")
+    print("=" * 50)
+    
+    import tempfile
+    from src.utils.domain_cache import DomainPackCache
+    from src.nodes.dynamic_knowledge import generate_knowledge_template
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DomainPackCache(cache_dir=cache_dir, max_disk_entries=2)
+        pack = generate_knowledge_template("RAG")
+        
+        assert cache.get("RAG", "1", "m") is None
+        cache.put("RAG", "1", "m", pack)
+        assert cache.get("rag", "1", "m") is pack, "메모리 티어 히트"
+        assert cache.get("RAG", "2", "m") is None, "프롬프트 버전이 다르면 미스"
+        
+        # 새 인스턴스는 디스크 티어에서 복원
+        reloaded = DomainPackCache(cache_dir=cache_dir).get("RAG", "1", "m")
+        assert reloaded is not None and reloaded.taxonomy == pack.taxonomy
+        
+        # LRU: 한도(2) 초과 시 가장 오래 접근하지 않은 항목 제거
+        cache.put("DevOps", "1", "m", pack)
+        cache.put("Blockchain", "1", "m", pack)
+        assert len([n for n in os.listdir(cache_dir) if n.endswith(".json")]) == 2
+        
+        # TTL 만료
+        expired = DomainPackCache(cache_dir=cache_dir, ttl_seconds=1e-9)
+        assert expired.get("Blockchain", "1", "m") is None
+        
+        stats = cache.stats()
+        assert stats["memory_hits"] == 1 and stats["misses"] == 2
+        
+        # 디스크 티어를 쓸 수 없어도(경로가 파일) 저장은 메모리 티어로 성공
+        blocker = os.path.join(cache_dir, "not_a_dir")
+        open(blocker, "w").close()
+        broken = DomainPackCache(cache_dir=os.path.join(blocker, "packs"))
+        broken.put("RAG", "1", "m", pack)
+        assert broken.get("RAG", "1", "m") is pack
+        assert not [n for n in os.listdir(cache_dir) if n.endswith(".tmp")]
+    
+    print("✅ 캐시 히트/미스, 디스크 복원, LRU, TTL, 디스크 오류 시 메모리 티어 확인")
+    return True
+
+
+def test_keyword_matcher():
+    """공유 키워드 매처가 부분 문자열 검사와 같은 결과를 내는지 테스트"""
+    print("\n" + "=" * 50)
+    print("키워드 매처 테스트")
+    print("=" * 50)
+    
+    from src.utils.keyword_patterns import PATTERN_TABLES
+    from src.utils.keyword_matcher import get_keyword_matcher
+    
+    matcher = get_keyword_matcher()
+    messages = [
+        "rag를 구축하려면 무엇을 해야 해?",
+        "golang으로 빠른 저렴한 serverless 검색 설계",
+        "kubernetes k8s 프로덕션 배포 최적화 vs 비교 what is bm25 hybrid",
+        "react native와 flutter 차이",
+        "",
+    ]
+    for message in messages:
+        hits = matcher.scan(message)
+        for table, labels in PATTERN_TABLES.items():
+            for label, keywords in labels.items():
+                expected = tuple(kw for kw in keywords if kw in message)
+                assert hits.keywords(table, label) == expected, (message, table, label)
+    
+    print(f"✅ {len(messages)}개 메시지에서 부분 문자열 매칭과 일치")
+    return True
+
+
+def test_domain_pack_index():
+    """DomainPack 인덱스 테스트"""
+    print("\n" + "=" * 50)
+    print("DomainPack 인덱스 테스트")
+    print("=" * 50)
+    
+    from src.state import DomainPack
+    from src.utils.domain_data import get_domain_pack
+    
+    pack = DomainPack(**get_domain_pack())
+    index = pack.index
+    assert pack.index is index, "인덱스는 한 번만 생성"
+    
+    assert index.concept("retrieval")["name"] == "검색 전략"
+    assert index.concept("missing") is None
+    assert index.concepts_for_term("BM25") == ("retrieval",)
+    assert index.prerequisites["retrieval"] == ("rag_basics", "indexing")
+    assert index.glossary_term("hybrid_search") == "Hybrid Search"
+    assert index.find_glossary_terms("rag에서 bm25와 hybrid search 차이") == ["RAG", "BM25", "Hybrid Search"]
+    assert "_index" not in pack.model_dump(), "인덱스는 직렬화되지 않음"
+    
+    print("✅ id/역색인/선수지식/용어 조회 확인")
+    return True
+
+
+def test_node_metrics():
+    """노드 메트릭 수집 및 Prometheus 텍스트 포맷 테스트"""
+    print("\n" + "=" * 50)
+    print("노드 메트릭 테스트")
+    print("=" * 50)
+    
+    from src.graph import run_rag_education_bot, NODE_CALLS, BRANCH_DECISIONS
+    from src.utils.metrics import REGISTRY
+    
+    calls_before = NODE_CALLS.value(node="deliver")
+    run_rag_education_bot("Kubernetes 배포 시작하는 방법")
+    assert NODE_CALLS.value(node="deliver") == calls_before + 1
+    assert BRANCH_DECISIONS.value(branch="should_use_tool_advisors", decision="tool_advisors") >= 1
+    
+    text = REGISTRY.render()
+    assert "# TYPE rag_edu_node_latency_seconds histogram" in text
+    assert 'rag_edu_node_latency_seconds_bucket{node="deliver",le="+Inf"}' in text
+    
+    print("✅ 호출 수/분기/히스토그램 노출 확인")
+    return True
+
+
+def test_llm_provider():
+    """LLM 제공자 클라이언트 재사용 및 로컬 대역 서버 교체 테스트"""
+    print("\n" + "=" * 50)
+    print("LLM 제공자 테스트")
+    print("=" * 50)
+    
+    from benchmarks.fake_llm import start_fake_openai_server
+    from src.nodes.dynamic_knowledge import DYNAMIC_PACK_VERSION, generate_knowledge_with_llm
+    from src.utils.llm_provider import PooledLLMProvider, set_llm_provider
+    
+    server = start_fake_openai_server()
+    provider = PooledLLMProvider(base_url=f"http://127.0.0.1:{server.server_port}/v1", api_key="test")
+    try:
+        assert provider.get("gpt-4o-mini", 0.7) is provider.get("gpt-4o-mini", 0.7)
+        assert provider.get("gpt-4o-mini", 0.7) is not provider.get("gpt-4o-mini", 0.0)
+        assert provider.get("gpt-4o-mini", 0.7).max_retries == 0, "재시도는 LLM 스케줄러가 담당"
+        
+        set_llm_provider(provider)
+        pack = generate_knowledge_with_llm("RAG")
+        assert pack.version == DYNAMIC_PACK_VERSION
+        assert len(pack.taxonomy) == 8 and len(pack.question_bank) == 5
+        assert server.calls == 4
+    finally:
+        set_llm_provider(None)
+        server.shutdown()
+    
+    print("✅ (모델, temperature)별 재사용 / 로컬 서버로 4개 섹션 생성 확인")
+    return True
+
+
+def test_memory_store():
+    """사용자 메모리 영속화 테스트 (SQLite WAL)"""
+    print("\n" + "=" * 50)
+    print("메모리 저장소 테스트")
+    print("=" * 50)
+    
+    import tempfile
+    from src.graph import run_rag_education_bot
+    from src.utils.memory_store import MemoryStore, get_memory_writer, set_memory_store
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(os.path.join(tmp, "memory.db"))
+        assert store.load("alice") is None
+        assert store.save_many([
+            ("alice", {"memory": {"seen_terms": ["RAG"]}, "mastery": {"levels": {"c1": 0.5}}}),
+            ("bob", {"memory": {}, "mastery": {}}),
+        ]) == 2
+        assert store.load("alice")["mastery"]["levels"] == {"c1": 0.5}
+        assert store.count() == 2
+        
+        # 짧은 스레드의 연결은 스레드가 끝나면 닫힘
+        import gc
+        import threading
+        threads = [threading.Thread(target=store.load, args=("alice",)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        gc.collect()
+        assert len(store._connections) == 1, len(store._connections)
+        
+        set_memory_store(store)
+        try:
+            state = create_initial_state("질문", user_id="alice")
+            assert state["user"].id == "alice"
+            assert state["memory"].seen_terms == {"RAG"}
+            
+            # 두 턴 실행 → 두 번째 턴은 첫 턴의 히스토리를 이어받음
+            run_rag_education_bot("RAG 시스템 구축하는 방법", user_id="carol")
+            run_rag_education_bot("벡터 검색 설명해줘", user_id="carol")
+            assert get_memory_writer().flush(timeout=5)
+            assert len(store.load("carol")["memory"]["history"]) == 2
+            
+            # 익명 사용자는 저장하지 않음
+            run_rag_education_bot("RAG 시스템 구축하는 방법")
+            assert store.load("default_user") is None
+        finally:
+            set_memory_store(None)
+            store.close()
+    
+    print("✅ 배치 저장 / 턴 간 메모리 유지 / 익명 사용자 제외 확인")
+    return True
+
+
+def test_session_graph():
+    """멀티턴 세션: 프로필/DomainPack 재사용 및 체크포인트 정리 테스트"""
+    print("\n" + "=" * 50)
+    print("세션 체크포인트 테스트")
+    print("=" * 50)
+    
+    import asyncio
+    from src.graph import run_rag_education_bot, arun_rag_education_bot, get_graph, NODE_CALLS
+    from src.utils.response_cache import get_response_cache
+    from src.utils.session_store import SessionSaver
+    
+    def calls(node):
+        return NODE_CALLS.value(node=node)
+    
+    # 앞선 테스트의 캐시된 응답이 세션 첫 턴을 대신하지 않도록
+    get_response_cache().clear()
+    infer_before = calls("infer_level")
+    run_rag_education_bot("RAG 벡터 검색 시스템 구축하는 방법", session_id="test-session")
+    assert calls("infer_level") == infer_before + 1
+    
+    # 같은 분야의 후속 턴은 콜드스타트/숙련도 추정/진단을 건너뜀
+    probe_before = calls("coldstart_probe") + calls("adaptive_diagnostic")
+    response = run_rag_education_bot("RAG 검색 임베딩 파이프라인 설명해줘", session_id="test-session")
+    asyncio.run(arun_rag_education_bot("RAG 벡터 검색 성능 최적화 방법", session_id="test-session"))
+    assert calls("infer_level") == infer_before + 1
+    assert calls("coldstart_probe") + calls("adaptive_diagnostic") == probe_before
+    assert "EXPLAIN" in response
+    
+    values = get_graph("session").get_state({"configurable": {"thread_id": "test-session"}}).values
+    assert len(values["memory"].history) == 3
+    assert values["domain_pack"].domain == "RAG"
+    assert values["profiled_at"] > 0
+    
+    # 세션마다 최신 체크포인트 1개, 상한을 넘으면 오래된 세션부터 제거
+    saver = SessionSaver(max_sessions=2)
+    app = create_graph(checkpointer=saver)
+    for thread_id in ["a", "b", "a", "c"]:
+        app.invoke(create_initial_state("RAG 구축 방법"), {"configurable": {"thread_id": thread_id}})
+    assert saver.has_session("a") and saver.has_session("c") and not saver.has_session("b")
+    assert all(len(checkpoints) == 1 for checkpoints in saver.storage["a"].values())
+    
+    # 실행 중(pin)인 세션은 다른 세션이 늘어도 제거되지 않음
+    assert saver.pin("a") and not saver.pin("d")
+    for thread_id in ["d", "e"]:
+        app.invoke(create_initial_state("RAG 구축 방법"), {"configurable": {"thread_id": thread_id}})
+    assert saver.has_session("a") and saver.has_session("d") and not saver.has_session("c")
+    assert saver.has_session("e") and saver.session_count() == 3, "모두 고정이면 잠시 상한 초과"
+    saver.unpin("a")
+    saver.unpin("d")
+    app.invoke(create_initial_state("RAG 구축 방법"), {"configurable": {"thread_id": "f"}})
+    assert saver.session_count() == 2 and not saver.has_session("a")
+    assert not get_graph("session").checkpointer._pins, "실행이 끝난 세션은 고정 해제"
+    
+    # 세션 준비(스레드) 중에 호출한 쪽이 취소돼도 스레드가 끝나면 고정 해제
+    import threading
+    import src.graph as graph_module
+    entered, release, prepared = threading.Event(), threading.Event(), threading.Event()
+    original_prepare = graph_module._prepare_run
+    
+    def slow_prepare(*args):
+        entered.set()
+        release.wait(5)
+        try:
+            return original_prepare(*args)
+        finally:
+            prepared.set()
+    
+    async def cancel_during_prepare():
+        task = asyncio.ensure_future(arun_rag_education_bot("RAG 검색 질문", session_id="cancel-session"))
+        while not entered.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+            raise AssertionError("취소돼야 함")
+        except asyncio.CancelledError:
+            pass
+        release.set()
+        for _ in range(500):
+            if prepared.is_set() and not get_graph("session").checkpointer._pins:
+                break
+            await asyncio.sleep(0.01)
+    
+    graph_module._prepare_run = slow_prepare
+    try:
+        get_response_cache().clear()
+        asyncio.run(cancel_during_prepare())
+    finally:
+        graph_module._prepare_run = original_prepare
+    assert not get_graph("session").checkpointer._pins, "취소된 실행의 세션 고정 해제"
+    
+    print("✅ 후속 턴 프로필 생략 / 세션 상태 복원 / LRU 정리 / 실행 중 세션 고정 확인")
+    return True
+
+
+def test_bounded_memory():
+    """메모리 상한: 최근 기록 버퍼 + 집계 압축, chat_history 상한 테스트"""
+    print("\n" + "=" * 50)
+    print("메모리 상한 테스트")
+    print("=" * 50)
+    
+    from src.graph import run_rag_education_bot, get_graph
+    from src.state import Memory, MEMORY_HISTORY_SIZE, MEMORY_QUIZ_SIZE, CHAT_HISTORY_SIZE
+    
+    memory = Memory()
+    for i in range(MEMORY_HISTORY_SIZE + 5):
+        memory.record_interaction({"intent": "explain", "confidence": 0.5})
+    memory.record_quiz([{"concept": "c1", "correct": i % 2 == 0} for i in range(MEMORY_QUIZ_SIZE + 4)])
+    assert len(memory.history) == MEMORY_HISTORY_SIZE
+    assert memory.stats.interactions == 5 and memory.stats.intent_counts == {"explain": 5}
+    assert len(memory.quiz_records) == MEMORY_QUIZ_SIZE
+    assert memory.stats.concept_quiz["c1"] == [4, 2]
+    
+    # 저장/복원 왕복 (set은 JSON 리스트로 저장)
+    memory.seen_terms.update(["RAG", "BM25"])
+    restored = Memory.model_validate(memory.model_dump(mode="json"))
+    assert restored.seen_terms == {"RAG", "BM25"} and restored.stats == memory.stats
+    
+    # 긴 세션에서도 chat_history/history 크기가 일정
+    for i in range(CHAT_HISTORY_SIZE // 2 + 3):
+        run_rag_education_bot(f"RAG 벡터 검색 질문 {i}", session_id="bounded-session")
+    values = get_graph("session").get_state({"configurable": {"thread_id": "bounded-session"}}).values
+    assert len(values["chat_history"]) == CHAT_HISTORY_SIZE
+    assert values["chat_history"][-2]["content"].endswith(str(CHAT_HISTORY_SIZE // 2 + 2))
+    
+    print("✅ 버퍼 상한 / 집계 압축 / 직렬화 왕복 / chat_history 상한 확인")
+    return True
+
+
+def test_write_behind():
+    """write-behind 큐: 병합/대기 중 읽기/가득 참 정책/flush 테스트"""
+    print("\n" + "=" * 50)
+    print("Write-behind 큐 테스트")
+    print("=" * 50)
+    
+    import threading
+    from src.utils.write_behind import WriteBehindQueue, QUEUE_COALESCED, QUEUE_DROPPED
+    
+    written = []
+    started = threading.Event()
+    release = threading.Event()
+    
+    def slow_write_many(batch):
+        started.set()
+        release.wait(5)
+        written.extend(batch)
+    
+    queue = WriteBehindQueue(slow_write_many, name="test", max_pending=2, policy="drop", linger=0)
+    try:
+        coalesced_before = QUEUE_COALESCED.value(queue="test")
+        dropped_before = QUEUE_DROPPED.value(queue="test")
+        
+        # 첫 배치는 쓰기 중에 멈춰 있음
+        assert queue.submit("u0", 0)
+        assert started.wait(5)
+        
+        assert queue.submit("u1", 1) and queue.submit("u1", 2) and queue.submit("u2", 1)
+        assert not queue.submit("u3", 1)  # 가득 참 → drop
+        assert queue.get("u1") == 2 and queue.get("u0") == 0
+        assert queue.depth() == 3
+        assert QUEUE_COALESCED.value(queue="test") == coalesced_before + 1
+        assert QUEUE_DROPPED.value(queue="test") == dropped_before + 1
+        
+        release.set()
+        assert queue.flush(timeout=5)
+        assert dict(written) == {"u0": 0, "u1": 2, "u2": 1}
+        assert queue.depth() == 0 and queue.get("u1") is None
+    finally:
+        release.set()
+        queue.close()
+    
+    # 쓰기 실패는 백오프 후 재시도, 재시도를 다 쓴 키만 버림
+    attempts = []
+    
+    def flaky_write_many(batch):
+        attempts.append(dict(batch))
+        if len(attempts) <= 2 or "bad" in dict(batch):
+            raise OSError("database is locked")
+        written.extend(batch)
+    
+    written.clear()
+    queue = WriteBehindQueue(flaky_write_many, name="test", linger=0, max_retries=2, retry_backoff=0.01)
+    try:
+        dropped_before = QUEUE_DROPPED.value(queue="test")
+        assert queue.submit("u1", 1)
+        assert queue.flush(timeout=5)
+        assert dict(written) == {"u1": 1} and len(attempts) == 3
+        
+        assert queue.submit("bad", 1)
+        assert queue.get("bad") == 1
+        assert queue.flush(timeout=5)
+        assert queue.get("bad") is None and "bad" not in dict(written)
+        assert QUEUE_DROPPED.value(queue="test") == dropped_before + 1
+    finally:
+        queue.close()
+    
+    print("✅ 같은 키 병합 / 쓰기 전 읽기 / drop 정책 / flush / 실패 재시도 확인")
+    return True
+
+
+def test_knowledge_tracing():
+    """베이지안 지식 추적 테스트"""
+    print("=" * 50)
+    print("지식 추적(BKT) 테스트")
+    print("=" * 50)
+    
+    import numpy as np
+    from src.utils.knowledge_tracing import OBSERVATION_PARAMS, KnowledgeTracer, bkt_update
+    
+    # 한 번 언급 시 P=0.4 → 약 0.55, 오답은 낮춤, 관찰 없는 개념은 그대로
+    tracer = KnowledgeTracer(["a", "b", "c"])
+    p = tracer.from_levels({"a": 0.4}, prior=0.4)
+    updated = tracer.observe(p, ["a", "b", "b"], "term")
+    assert abs(updated[0] - 0.5454) < 1e-3
+    assert updated[1] > updated[0] and updated[2] == p[2]
+    assert tracer.observe(p, ["c"], "quiz", correct=False)[2] < p[2]
+    
+    # 코호트 행렬을 한 번에 갱신한 결과가 사용자별 갱신과 같음
+    cohort = [{"a": 0.3}, {"b": 0.7, "c": 0.9}]
+    matrix = tracer.from_levels_batch(cohort, prior=0.5)
+    counts = np.array([[1, 0, 0], [0, 1, 1]])
+    batch = bkt_update(matrix, counts, OBSERVATION_PARAMS["quiz"])
+    for row, levels in enumerate(cohort):
+        single = tracer.observe(tracer.from_levels(levels, 0.5), [c for c, n in zip("abc", counts[row]) if n], "quiz")
+        assert np.allclose(batch[row], single)
+    
+    # taxonomy 변경: 공통 개념은 유지, 새 개념은 prior
+    remapped = tracer.remap(batch, KnowledgeTracer(["c", "d"]), prior=0.2)
+    assert np.allclose(remapped[:, 0], batch[:, 2]) and np.all(remapped[:, 1] == 0.2)
+    
+    print("✅ 관찰 갱신 / 코호트 일괄 갱신 / taxonomy 재매핑 확인")
+    return True
+
+
+def test_bm25_retrieval():
+    """DomainPack BM25 검색 테스트"""
+    print("\n" + "=" * 50)
+    print("BM25 검색 테스트")
+    print("=" * 50)
+    
+    from src.state import DomainPack, Gaps, Task
+    from src.nodes.compose_answer import collect_references
+    from src.utils.bm25 import tokenize
+    from src.utils.domain_data import get_domain_pack
+    
+    # 한글은 음절 bigram(질문형 어미 제외), 영문은 단어 단위
+    assert tokenize("청킹은 어떻게 Vector_DB") == ["청킹", "킹은", "vector", "db"]
+    
+    pack = DomainPack(**get_domain_pack())
+    results = pack.index.search("재랭킹이 필요한가요", k=3)
+    assert results[0][0].id == "concept:reranking"
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+    assert pack.index.search("zzz 없는단어", k=3) == []
+    
+    # 같은 내용의 팩은 다른 인스턴스여도 인덱스를 공유
+    assert DomainPack(**get_domain_pack()).index is pack.index
+    
+    references = collect_references(pack, Task(question="하이브리드 검색과 BM25 차이"), Gaps())
+    assert "glossary:BM25" in [passage.id for passage in references]
+    
+    print("✅ 한국어 토큰화 / 상위 k 검색 / 인덱스 공유 / 참고 자료 수집 확인")
+    return True
+
+
+def test_domain_embedding():
+    """의미 기반 분야 fallback 테스트"""
+    print("\n" + "=" * 50)
+    print("분야 임베딩 테스트")
+    print("=" * 50)
+    
+    from src.nodes.domain_detect import domain_detect_node
+    from src.utils.domain_embedding import SEMANTIC_DOMAIN_THRESHOLD, get_domain_embeddings
+    
+    index = get_domain_embeddings()
+    assert index.matrix.flags["C_CONTIGUOUS"] and index.matrix.shape[0] == len(index.domains)
+    
+    # 키워드는 없지만 한글 표기/활용형으로 가까운 분야를 찾음
+    messages = ["쿠버네티스 파드가 계속 재시작돼요", "판다스 데이터프레임 병합하는 법", "안녕하세요"]
+    nearest = index.nearest_batch(messages)
+    assert [domain for domain, _ in nearest[:2]] == ["DevOps", "Data Science"]
+    assert nearest[2][1] < SEMANTIC_DOMAIN_THRESHOLD
+    assert index.nearest("", SEMANTIC_DOMAIN_THRESHOLD) is None
+    
+    assert domain_detect_node({"user_message": messages[0]})["detected_domain"] == "DevOps"
+    assert domain_detect_node({"user_message": messages[2]})["detected_domain"] == "General"
+    
+    print("✅ 일괄 최근접 분야 / 임계값 미만은 General 유지 확인")
+    return True
+
+
+def test_hybrid_retriever():
+    """하이브리드 검색 색인 테스트"""
+    print("\n" + "=" * 50)
+    print("하이브리드 검색 테스트")
+    print("=" * 50)
+    
+    import tempfile
+    import numpy as np
+    from src.retrieval.embedding import HashingEmbedder
+    from src.retrieval.hybrid import HybridRetriever, new_segment_path, publish_segments, retrieve_context_docs, rrf_fuse
+    from src.retrieval.segment import SegmentWriter
+    from src.utils.domain_data import RAG_GLOSSARY
+    
+    # 두 목록에 모두 있는 항목이 한쪽 1위보다 앞섬
+    assert [key for key, _ in rrf_fuse([["a", "b"], ["c", "b"]])] == ["b", "a", "c"]
+    
+    with tempfile.TemporaryDirectory() as root:
+        embedder = HashingEmbedder(dim=64)
+        writer = SegmentWriter(embedder)
+        for term, definition in RAG_GLOSSARY.items():
+            writer.add({"id": term, "doc_id": "glossary", "title": term, "text": f"{term}: {definition}"})
+        publish_segments(root, [writer.write(new_segment_path(root))], embedder.config())
+        
+        retriever = HybridRetriever(root)
+        assert isinstance(retriever.segments[0].dense.vectors, np.memmap), "색인은 mmap으로 열림"
+        hits = retriever.search("재랭킹 모델", k=3)
+        assert retriever.record(hits[0])["id"] in ("Cross-encoder", "Reranking")
+        assert hits[0].sparse_rank and hits[0].dense_rank
+        
+        # 새 세그먼트를 공개하면 두 세그먼트를 함께 검색
+        writer = SegmentWriter(embedder)
+        writer.add({"id": "extra", "doc_id": "notes", "title": "메모", "text": "청킹 크기는 512 토큰으로 시작"})
+        publish_segments(root, [writer.write(new_segment_path(root))], embedder.config())
+        retriever.close()
+        retriever = HybridRetriever(root)
+        assert len(retriever) == len(RAG_GLOSSARY) + 1
+        assert retriever.record(retriever.search("청킹 크기", k=1)[0])["id"] == "extra"
+        retriever.close()
+        
+        os.environ["RETRIEVAL_INDEX_DIR"] = root
+        try:
+            docs = retrieve_context_docs("하이브리드 검색")
+            assert docs and set(docs[0]) == {"chunk_id", "doc_id", "title", "source", "score", "snippet"}
+            
+            # 손상된 색인은 대화를 막지 않고 빈 목록
+            broken = os.path.join(root, "broken")
+            os.makedirs(broken)
+            with open(os.path.join(broken, "manifest.json"), "w") as f:
+                f.write('{"segments": ["seg-missing"')
+            os.environ["RETRIEVAL_INDEX_DIR"] = broken
+            assert retrieve_context_docs("하이브리드 검색") == []
+        finally:
+            del os.environ["RETRIEVAL_INDEX_DIR"]
+    
+    print("✅ RRF / mmap 색인 / 세그먼트 추가 / context_docs_meta 확인")
+    return True
+
+
+def test_document_ingest():
+    """문서 수집 파이프라인 테스트"""
+    print("\n" + "=" * 50)
+    print("문서 수집 테스트")
+    print("=" * 50)
+    
+    import tempfile
+    from src.retrieval.chunking import CHUNKERS, create_chunker
+    from src.retrieval.hybrid import HybridRetriever, read_manifest
+    from src.retrieval.ingest import Ingestor, text_document
+    
+    sentence = "검색 증강 생성은 외부 문서를 찾아 답변 근거로 쓴다. "
+    text = "\n\n".join(sentence * (i % 5 + 1) + f"문단 {i % 20}번." for i in range(200))
+    blocks = [text[i:i + 333] for i in range(0, len(text), 333)]
+    for name in CHUNKERS:
+        chunker = create_chunker(name, size=200, overlap=40)
+        chunks = list(chunker.stream(blocks, window=800))
+        assert all(len(chunk) <= 200 for _, chunk in chunks), name
+        assert all(text[start:start + len(chunk)] == chunk for start, chunk in chunks), name
+        # 스트리밍해도 원문을 빠짐없이 덮음
+        covered = set()
+        for start, chunk in chunks:
+            covered.update(range(start, start + len(chunk)))
+        assert all(i in covered or text[i].isspace() for i in range(len(text))), name
+    assert create_chunker("fixed", 200, 40).split(text) == [chunk for _, chunk in create_chunker("fixed", 200, 40).stream(blocks)]
+    assert all(chunk.rstrip().endswith(".") for chunk in create_chunker("sentence", 200, 40).split(text))
+    
+    with tempfile.TemporaryDirectory() as root:
+        note = "리랭킹은 1차 검색 후보를 cross-encoder로 다시 정렬하는 단계다. " * 3
+        ingestor = Ingestor(root, create_chunker("sentence", 200, 40), workers=0, segment_chunks=8)
+        report = ingestor.ingest([text_document("rag", text, "RAG 개요"), text_document("note", note)])
+        assert report.chunks > 8 and report.segments == len(read_manifest(root)["segments"]) >= 2
+        assert report.duplicates > 0, "반복 문단 청크는 한 번만 색인"
+        assert report.mb_per_second > 0 and report.chunks_per_second > 0
+        
+        # 같은 문서를 다시 넣으면 모두 중복 (프로세스 풀 경로)
+        again = Ingestor(root, create_chunker("sentence", 200, 40), workers=1).ingest([text_document("note", note)])
+        assert again.chunks == 0 and again.segments == 0 and again.duplicates > 0
+        
+        retriever = HybridRetriever(root)
+        record = retriever.record(retriever.search("cross-encoder 리랭킹", k=1)[0])
+        assert record["doc_id"] == "note" and record["title"] == "note"
+        retriever.close()
+    
+    print(f"✅ 청킹 {len(CHUNKERS)}종 / 해시 중복 제거 / 세그먼트 분할 ({report.summary()})")
+    return True
+
+
+def test_response_cache():
+    """근사 중복 질문 응답 캐시 테스트 (MinHash/LSH, TTL, LRU, DomainPack 무효화)"""
+    print("\n" + "=" * 50)
+    print("응답 캐시 테스트")
+    print("=" * 50)
+    
+    import asyncio
+    import tempfile
+    from app import stream_chat_function
+    from benchmarks.fake_llm import FakeChatModel
+    from src.graph import run_rag_education_bot, get_graph, NODE_CALLS
+    from src.utils.domain_cache import DomainPackCache, set_domain_cache
+    from src.utils.llm_provider import StaticLLMProvider, set_llm_provider
+    from src.utils.memory_store import MemoryStore, set_memory_store
+    from src.utils.response_cache import ResponseCache, set_response_cache
+    
+    cache = ResponseCache(max_entries=2)
+    context = ("RAG", 1)
+    cache.put("RAG를 구축하려면 무엇을 해야 해?", context, "pack-1", "답변")
+    assert cache.get("RAG 구축하려면 무엇을 해야 하나요?", context, "pack-1") == "답변", "조사/어미만 다른 변형은 히트"
+    assert cache.get("RAG를 평가하려면 무엇을 해야 해?", context, "pack-1") is None, "핵심어가 다르면 미스"
+    assert cache.get("RAG를 구축하려면 무엇을 해야 해?", ("RAG", 3), "pack-1") is None, "경험 수준이 다르면 미스"
+    assert cache.get("RAG를 구축하려면 무엇을 해야 해?", context, "pack-2") is None, "팩이 바뀌면 무효"
+    assert cache.stats()["entries"] == 0
+    
+    # LRU: 한도(2) 초과 시 가장 오래 쓰지 않은 항목 제거
+    for i, question in enumerate(["벡터 검색 설명", "청킹 전략 비교", "리랭킹 모델 선택"]):
+        cache.put(question, context, "pack-1", str(i))
+    assert cache.get("벡터 검색 설명", context, "pack-1") is None
+    assert cache.get("리랭킹 모델 선택", context, "pack-1") == "2"
+    
+    # TTL 만료
+    expired = ResponseCache(ttl_seconds=1e-9)
+    expired.put("벡터 검색 설명", context, "pack-1", "답변")
+    assert expired.get("벡터 검색 설명", context, "pack-1") is None
+    
+    # 그래프 경로: 팩이 캐시된 뒤의 변형 질문은 노드를 실행하지 않고 같은 응답
+    tmp = tempfile.TemporaryDirectory()
+    store = MemoryStore(os.path.join(tmp.name, "memory.db"))
+    set_memory_store(store)
+    set_domain_cache(DomainPackCache(cache_dir=None))
+    set_response_cache(ResponseCache())
+    set_llm_provider(StaticLLMProvider(FakeChatModel()))
+    sessions = get_graph("session").checkpointer
+    try:
+        first = run_rag_education_bot("RAG를 구축하려면 무엇을 해야 해?")
+        calls_before = NODE_CALLS.value(node="deliver")
+        variant = "RAG 구축하려면 무엇을 해야 하나요??"
+        assert run_rag_education_bot(variant) == first.replace("RAG를 구축하려면 무엇을 해야 해?", variant), "응답 속 질문은 새 표현으로"
+        assert NODE_CALLS.value(node="deliver") == calls_before
+        # 저장된 사용자 요청은 캐시하지 않음
+        run_rag_education_bot("RAG 구축하려면 무엇을 해야 하나요", user_id="dave")
+        assert NODE_CALLS.value(node="deliver") == calls_before + 1
+        
+        # UI(스트리밍 + 탭별 세션)의 첫 턴도 캐시 히트, 세션은 이어지는 턴을 위해 기록됨
+        async def chat(message):
+            return [partial async for partial in stream_chat_function(message, [], "cache-tab")]
+        
+        variant = "RAG 구축하려면 뭘 해야 해?"
+        assert asyncio.run(chat(variant)) == [first.replace("RAG를 구축하려면 무엇을 해야 해?", variant)]
+        assert NODE_CALLS.value(node="deliver") == calls_before + 1
+        assert sessions.has_session("cache-tab")
+        # 두 번째 턴부터는 세션 상태를 이어받아 그래프 실행
+        asyncio.run(chat("RAG를 구축하려면 무엇을 해야 해?"))
+        assert NODE_CALLS.value(node="deliver") == calls_before + 2
+        history = get_graph("session").get_state({"configurable": {"thread_id": "cache-tab"}}).values["chat_history"]
+        assert [message["content"] for message in history[::2]] == [variant, "RAG를 구축하려면 무엇을 해야 해?"]
+    finally:
+        sessions.delete_thread("cache-tab")
+        set_llm_provider(None)
+        set_response_cache(None)
+        set_domain_cache(None)
+        set_memory_store(None)
+        store.close()
+        tmp.cleanup()
+    
+    print("✅ 근사 중복 히트 / 컨텍스트·팩 무효화 / LRU / TTL / 그래프 생략 / 세션 첫 턴 스트리밍 확인")
+    return True
+
+
+def test_domain_prewarm():
+    """인기 분야 DomainPack 사전 생성 테스트"""
+    print("\n" + "=" * 50)
+    print("DomainPack 사전 생성 테스트")
+    print("=" * 50)
+    
+    import tempfile
+    import time
+    from benchmarks.fake_llm import FakeChatModel
+    from src.graph import run_rag_education_bot
+    from src.nodes.dynamic_knowledge import refresh_domain_pack
+    from src.prewarm import DomainPrewarmer
+    from src.utils.domain_cache import DomainPackCache, set_domain_cache
+    from src.utils.domain_usage import DomainUsageTracker, set_domain_usage
+    from src.utils.llm_provider import StaticLLMProvider, set_llm_provider
+    from src.utils.memory_store import MemoryStore, set_memory_store
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "usage.json")
+        tracker = DomainUsageTracker(path, half_life=3600)
+        now = time.time()
+        for _ in range(3):
+            tracker.record("DevOps", now=now - 7200)
+        tracker.record("Frontend", now=now - 7200)
+        tracker.record("Frontend", now=now)
+        # 2시간(반감기 2회) 지나면 DevOps 3회 → 0.75점으로 Frontend 최근 요청보다 낮음
+        assert [domain for domain, _ in tracker.top(2, now=now)] == ["Frontend", "DevOps"]
+        tracker.save()
+        assert DomainUsageTracker(path, half_life=3600).top(1, now=now)[0][0] == "Frontend", "재시작 후 복원"
+        
+        # 파일 아래 경로처럼 쓸 수 없는 위치면 예외를 내고 변경은 dirty로 남아 다음 저장에서 재시도
+        broken = DomainUsageTracker(os.path.join(path, "usage.json"))
+        broken.record("Frontend")
+        try:
+            broken.save()
+            raise AssertionError("쓸 수 없는 경로에서 OSError가 나야 함")
+        except OSError:
+            pass
+        assert broken._dirty, "저장 실패 후에도 dirty 유지"
+        broken.path = os.path.join(tmp, "retry.json")
+        broken.save()
+        assert not broken._dirty and DomainUsageTracker(broken.path).top(1)[0][0] == "Frontend"
+        
+        fake_llm = FakeChatModel()
+        usage = DomainUsageTracker(None)
+        store = MemoryStore(os.path.join(tmp, "memory.db"))
+        set_memory_store(store)
+        set_domain_usage(usage)
+        set_domain_cache(DomainPackCache(cache_dir=None))
+        set_llm_provider(StaticLLMProvider(fake_llm))
+        previous_key = os.environ.get("OPENAI_API_KEY")
+        os.environ["OPENAI_API_KEY"] = "test-fake-key"
+        prewarmer = DomainPrewarmer(top_n=1, workers=2)
+        try:
+            # domain_detect 노드가 요청 빈도를 기록
+            run_rag_education_bot("Kubernetes 배포 시작하는 방법", user_id="erin")
+            run_rag_education_bot("Docker 컨테이너 배포 파이프라인", user_id="erin")
+            assert usage.top(1)[0][0] == "DevOps"
+            
+            set_domain_cache(DomainPackCache(cache_dir=None))  # 재시작 직후처럼 빈 캐시
+            assert prewarmer.prewarm_once() == {"DevOps": "generated"}
+            assert prewarmer.prewarm_once() == {"DevOps": "fresh"}
+            assert refresh_domain_pack("DevOps", max_age=1e-9) == "refreshed", "오래된 팩은 교체"
+            
+            # 미리 만든 팩 덕분에 첫 요청도 LLM 호출 없음
+            calls_before = fake_llm.calls
+            run_rag_education_bot("Kubernetes 배포 시작하는 방법", user_id="frank")
+            assert fake_llm.calls == calls_before
+        finally:
+            prewarmer.stop()
+            if previous_key is None:
+                del os.environ["OPENAI_API_KEY"]
+            else:
+                os.environ["OPENAI_API_KEY"] = previous_key
+            set_llm_provider(None)
+            set_domain_cache(None)
+            set_domain_usage(None)
+            set_memory_store(None)
+            store.close()
+    
+    print("✅ 감쇠 빈도 / 통계 저장 / 생성·유지·교체 / 첫 요청 LLM 생략 확인")
+    return True
+
+
+def test_batch_runner():
+    """JSONL 질문 일괄 처리 테스트"""
+    print("\n" + "=" * 50)
+    print("질문 일괄 처리 테스트")
+    print("=" * 50)
+    
+    import json
+    import tempfile
+    from src.batch import CHECKPOINT_SUFFIX, BatchRunner, _answer_batch
+    
+    questions = ["RAG가 뭐야?", "Hybrid Search 구현하고 싶어", "Kubernetes 배포 시작하는 방법", "React 상태 관리 추천"]
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "questions.jsonl")
+        output_path = os.path.join(tmp, "answers.jsonl")
+        with open(input_path, "w", encoding="utf-8") as f:
+            for i in range(10):
+                f.write(json.dumps({"id": i, "question": questions[i % 4]}, ensure_ascii=False) + "\n")
+            f.write("\n")
+            f.write('"Docker 컨테이너 배포 파이프라인"\n')
+            f.write("{잘못된 줄\n")
+        
+        runner = BatchRunner(workers=0, batch_size=3)
+        report = runner.run(input_path, output_path)
+        with open(output_path, encoding="utf-8") as f:
+            results = [json.loads(line) for line in f]
+        assert report.questions == 12 and report.errors == 1
+        assert [r["line"] for r in results] == [*range(1, 11), 12, 13], "입력 순서 유지, 빈 줄 건너뜀"
+        assert results[0]["id"] == 0 and "RAG" in results[0]["response"]
+        assert results[10]["question"] == "Docker 컨테이너 배포 파이프라인"
+        assert "error" in results[-1] and "response" not in results[-1]
+        assert not os.path.exists(output_path + CHECKPOINT_SUFFIX), "완료 후 체크포인트 삭제"
+        
+        # 6줄까지 처리하고 다음 배치를 쓰다 중단된 상황
+        with open(output_path, encoding="utf-8") as f:
+            lines = f.readlines()
+        kept = "".join(lines[:6]).encode("utf-8")
+        with open(output_path, "wb") as f:
+            f.write(kept + lines[6].encode("utf-8")[:20])
+        with open(output_path + CHECKPOINT_SUFFIX, "w") as f:
+            json.dump({"lines": 6, "offset": len(kept)}, f)
+        
+        report = runner.run(input_path, output_path)
+        with open(output_path, encoding="utf-8") as f:
+            resumed = [json.loads(line) for line in f]
+        assert report.resumed == 6 and report.questions == 6
+        assert [r["line"] for r in resumed] == [r["line"] for r in results]
+        assert [r.get("response") for r in resumed] == [r.get("response") for r in results]
+        
+        # 워커 프로세스로 처리해도 같은 결과
+        runner = BatchRunner(workers=1, batch_size=4)
+        report = runner.run(input_path, output_path, restart=True)
+        with open(output_path, encoding="utf-8") as f:
+            pooled = [json.loads(line) for line in f]
+        assert [r.get("response") for r in pooled] == [r.get("response") for r in results]
+        print(f"   {report.summary()}")
+        
+        # 여러 워커: 같은 사용자의 줄은 한 워커가 순서대로 처리해 메모리 갱신이 서로 덮어쓰지 않음
+        from src.batch import _shard
+        from src.utils.memory_store import MemoryStore, set_memory_store
+        users = ["alice", "bob", "carol"]
+        with open(input_path, "w", encoding="utf-8") as f:
+            for i in range(12):
+                f.write(json.dumps({"id": i, "question": f"RAG 임베딩 질문 {i}", "user_id": users[i % 3]}, ensure_ascii=False) + "\n")
+        with open(input_path, encoding="utf-8") as f:
+            lines = f.readlines()
+        for user in users:
+            assert len({_shard(n, line, 2) for n, line in enumerate(lines, 1) if f'"{user}"' in line}) == 1
+        assert {_shard(n, '{"question": "익명"}', 2) for n in range(4)} == {0, 1}, "익명 줄은 분산"
+        
+        memory_path = os.path.join(tmp, "batch-memory.db")
+        previous_path = os.environ.get("MEMORY_DB_PATH")
+        os.environ["MEMORY_DB_PATH"] = memory_path
+        set_memory_store(None)  # 워커 프로세스가 환경 변수 경로로 저장소를 새로 열게 함
+        try:
+            report = BatchRunner(workers=2, batch_size=3).run(input_path, output_path, restart=True)
+        finally:
+            if previous_path is None:
+                os.environ.pop("MEMORY_DB_PATH", None)
+            else:
+                os.environ["MEMORY_DB_PATH"] = previous_path
+            set_memory_store(None)
+        assert report.questions == 12 and report.errors == 0
+        with open(output_path, encoding="utf-8") as f:
+            assert [json.loads(line)["line"] for line in f] == list(range(1, 13)), "워커별 결과를 입력 순서로 합침"
+        store = MemoryStore(memory_path)
+        for user in users:
+            assert len(store.load(user)["memory"]["history"]) == 4, f"{user}의 4턴이 모두 남음"
+    
+    # 그래프 실행 실패는 오류 문구 응답이 아니라 error 레코드
+    from src import graph
+    
+    class BrokenGraph:
+        def invoke(self, *args, **kwargs):
+            raise RuntimeError("그래프 장애")
+    
+    original_get_graph = graph.get_graph
+    graph.get_graph = lambda name="default": BrokenGraph()
+    try:
+        [failed] = _answer_batch([(1, '{"question": "일괄 처리 장애 확인용 질문"}')])
+    finally:
+        graph.get_graph = original_get_graph
+    assert failed["error"] == "RuntimeError: 그래프 장애" and "response" not in failed
+    
+    print("✅ 입력 순서 출력 / 형식 오류 기록 / 체크포인트 재개 / 워커 프로세스 / 그래프 실패 기록 확인")
+    return True
+
+
+def test_api_server():
+    """HTTP JSON API (ASGI) 테스트"""
+    print("\n" + "=" * 50)
+    print("HTTP API 테스트")
+    print("=" * 50)
+    
+    import asyncio
+    import json
+    import httpx
+    from src import graph
+    from src.api import AdmissionGate, Overloaded, create_app
+    from src.utils.response_cache import get_response_cache
+    
+    class BrokenGraph:
+        async def ainvoke(self, *args, **kwargs):
+            raise RuntimeError("그래프 장애")
+        
+        async def astream(self, *args, **kwargs):
+            raise RuntimeError("그래프 장애")
+            yield
+    
+    async def scenario():
+        api = create_app(max_inflight=1, max_queue=1, queue_timeout=0.05, prewarm=False)
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            assert (await client.get("/healthz")).status_code == 200
+            assert (await client.get("/readyz")).status_code == 503, "시작 전에는 준비 안 됨"
+            await api.startup()
+            ready = await client.get("/readyz")
+            assert ready.status_code == 200 and all(ready.json()["graphs"].values())
+            assert "domain_cache" in ready.json() and "warm_domains" in ready.json()
+            
+            response = await client.post("/v1/chat", json={"message": "RAG가 뭐야?"})
+            assert response.status_code == 200 and "RAG" in response.json()["response"]
+            
+            # 노드별 이벤트를 보려고 캐시된 응답은 비움 (캐시 히트면 deliver 하나만 나감)
+            get_response_cache().clear()
+            response = await client.post("/v1/chat/stream", json={"message": "Kubernetes 배포 시작하는 방법"})
+            events = [json.loads(line) for line in response.text.splitlines()]
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            assert events[0] == {"node": "domain_detect"} and events[-1]["node"] == "deliver"
+            sections = [e for e in events if e["node"] == "compose_answer"]
+            assert len(sections) > 1 and all(e["content"] for e in sections), "개요 + 섹션별 이벤트"
+            
+            assert (await client.post("/v1/chat", content=b"{")).status_code == 400
+            assert (await client.post("/v1/chat", json={"message": " "})).status_code == 400
+            for bad in ({"user_id": 42}, {"user_id": ""}, {"session_id": ["s"]}, {"session_id": "s" * 1000}):
+                assert (await client.post("/v1/chat", json={"message": "RAG", **bad})).status_code == 400
+                assert (await client.post("/v1/chat/stream", json={"message": "RAG", **bad})).status_code == 400
+            assert (await client.get("/v1/chat")).status_code == 405
+            assert (await client.get("/nope")).status_code == 404
+            
+            # 슬롯 1개 점유 + 대기열 1개 → 두 번째는 대기 후 시간 초과, 세 번째는 즉시 거절
+            async with api.gate.slot():
+                waiting = asyncio.ensure_future(client.post("/v1/chat", json={"message": "RAG"}))
+                await asyncio.sleep(0.01)
+                assert api.gate.queued == 1
+                full = await client.post("/v1/chat", json={"message": "RAG"})
+                assert full.status_code == 503 and full.json()["reason"] == "queue_full"
+                assert full.headers["retry-after"] == "1"
+                timed_out = await waiting
+                assert timed_out.status_code == 503 and timed_out.json()["reason"] == "queue_timeout"
+            assert api.gate.inflight == 0 and api.gate.queued == 0
+            
+            # 그래프 실행 실패는 500, 스트리밍은 마지막 오류 이벤트
+            original_get_graph = graph.get_graph
+            graph.get_graph = lambda name="default": BrokenGraph()
+            try:
+                failed = await client.post("/v1/chat", json={"message": "API 장애 확인용 질문"})
+                assert failed.status_code == 500 and failed.json()["detail"] == "그래프 장애"
+                streamed = await client.post("/v1/chat/stream", json={"message": "API 장애 확인용 질문"})
+                events = [json.loads(line) for line in streamed.text.splitlines()]
+                assert events == [{"error": "응답을 생성하지 못했습니다", "detail": "그래프 장애"}]
+            finally:
+                graph.get_graph = original_get_graph
+            
+            metrics = (await client.get("/metrics")).text
+            assert 'rag_edu_api_requests_total{route="/v1/chat",status="500"}' in metrics
+            assert 'rag_edu_api_rejections_total{reason="queue_full"}' in metrics
+            assert 'rag_edu_api_requests_total{route="/v1/chat",status="200"}' in metrics
+        
+        # 슬롯이 비면 대기 중인 요청이 이어서 실행
+        gate = AdmissionGate(max_inflight=1, max_queue=1, queue_timeout=1.0)
+        order = []
+        
+        async def hold(name, seconds):
+            async with gate.slot():
+                order.append(name)
+                await asyncio.sleep(seconds)
+        
+        first = asyncio.ensure_future(hold("first", 0.05))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(hold("second", 0))
+        await asyncio.sleep(0)
+        try:
+            await hold("third", 0)
+            raise AssertionError("대기열이 가득 차면 거절해야 함")
+        except Overloaded as e:
+            assert e.reason == "queue_full"
+        await asyncio.gather(first, second)
+        assert order == ["first", "second"]
+    
+    asyncio.run(scenario())
+    
+    print("✅ 채팅 / NDJSON 스트리밍 / 입력 검증 / 대기열 거절·시간 초과 / health·ready·metrics 확인")
+    return True
+
+
+def test_singleflight_pack_generation():
+    """같은 분야 DomainPack 동시 생성 합치기 테스트"""
+    print("\n" + "=" * 50)
+    print("Single-flight 팩 생성 테스트")
+    print("=" * 50)
+    
+    import asyncio
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from benchmarks.fake_llm import FakeChatModel
+    from src.nodes import dynamic_knowledge
+    from src.utils.domain_cache import DomainPackCache, set_domain_cache
+    from src.utils.llm_provider import StaticLLMProvider, set_llm_provider
+    from src.utils.singleflight import SingleFlight
+    
+    # 스레드: 한 번만 실행, 모두 같은 결과 / 예외도 모두에게 전달 / 끝나면 다시 실행
+    flights = SingleFlight("test")
+    calls = []
+    start_gate = threading.Barrier(4)
+    
+    def slow(value):
+        calls.append(value)
+        time.sleep(0.1)
+        if value == "boom":
+            raise ValueError("생성 실패")
+        return value
+    
+    def call(value):
+        start_gate.wait()
+        try:
+            return flights.do("k", lambda: slow(value))
+        except ValueError as e:
+            return e
+    
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(call, ["a", "b", "c", "d"]))
+    assert len(calls) == 1 and len(set(results)) == 1 and results[0] == calls[0]
+    assert not flights.in_flight("k")
+    
+    calls.clear()
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(call, ["boom"] * 4))
+    assert len(calls) == 1 and all(isinstance(r, ValueError) for r in results)
+    assert flights.do("k", lambda: "again") == "again", "끝난 키는 새로 실행"
+    
+    # 비동기: 리더가 취소돼도 팔로워는 결과를 받음
+    async def async_scenario():
+        async def work():
+            calls.append("async")
+            await asyncio.sleep(0.05)
+            return "done"
+        
+        leader = asyncio.ensure_future(flights.ado("a", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.ado("a", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+    
+    calls.clear()
+    assert asyncio.run(async_scenario()) == "done" and calls == ["async"]
+    
+    # 노드: 같은 새 분야를 동시에 요청해도 LLM 생성(섹션 4개 호출)은 한 번
+    fake_llm = FakeChatModel(latency=0.1)
+    set_llm_provider(StaticLLMProvider(fake_llm))
+    set_domain_cache(DomainPackCache(cache_dir=None))
+    previous_key = os.environ.get("OPENAI_API_KEY")
+    os.environ["OPENAI_API_KEY"] = "test-fake-key"
+    original_generate = dynamic_knowledge.generate_knowledge_with_llm
+    try:
+        state = {"detected_domain": "DevOps"}
+        with ThreadPoolExecutor(4) as pool:
+            packs = list(pool.map(lambda _: dynamic_knowledge.generate_domain_knowledge_node(state)["domain_pack"], range(4)))
+        assert fake_llm.calls == 4, f"섹션 4개 × 1회여야 함: {fake_llm.calls}"
+        assert all(pack is packs[0] for pack in packs)
+        
+        async def concurrent_async():
+            state = {"detected_domain": "Frontend"}
+            return await asyncio.gather(*(dynamic_knowledge.agenerate_domain_knowledge_node(state) for _ in range(4)))
+        
+        outputs = asyncio.run(concurrent_async())
+        assert fake_llm.calls == 8 and len({id(o["domain_pack"]) for o in outputs}) == 1
+        
+        # 생성이 예외로 끝나면 기다리던 요청 모두 템플릿 팩
+        failures = []
+        
+        def failing(domain, ticket=None):
+            failures.append(domain)
+            time.sleep(0.1)
+            raise RuntimeError("LLM 장애")
+        
+        dynamic_knowledge.generate_knowledge_with_llm = failing
+        state = {"detected_domain": "Backend"}
+        with ThreadPoolExecutor(3) as pool:
+            packs = list(pool.map(lambda _: dynamic_knowledge.generate_domain_knowledge_node(state)["domain_pack"], range(3)))
+        assert failures == ["Backend"] and all(pack.version == "1.0-template" for pack in packs)
+    finally:
+        dynamic_knowledge.generate_knowledge_with_llm = original_generate
+        if previous_key is None:
+            del os.environ["OPENAI_API_KEY"]
+        else:
+            os.environ["OPENAI_API_KEY"] = previous_key
+        set_llm_provider(None)
+        set_domain_cache(None)
+    
+    print("✅ 동시 호출 1회 실행 / 예외 전파 / 리더 취소 / 노드 LLM 호출 1회 / 실패 시 템플릿 확인")
+    return True
+
+
+def test_llm_scheduler():
+    """LLM 호출 스케줄러 테스트 (한도 대기열 우선순위 / 마감 / 429 재시도 / 사용량 정산)"""
+    print("=" * 50)
+    print("LLM 호출 스케줄러 테스트")
+    print("=" * 50)
+    
+    import asyncio
+    import threading
+    import time
+    from types import SimpleNamespace
+    from src.nodes import dynamic_knowledge
+    from src.utils.llm_scheduler import (
+        LLM_CALLS, LLM_EXPECTED_OUTPUT_TOKENS, LLM_QUEUE_WAIT, LLMScheduler, PriorityTicket, RateLimitTimeout,
+        estimate_tokens, llm_priority,
+    )
+    
+    def drained(rpm: int) -> LLMScheduler:
+        scheduler = LLMScheduler(rpm=rpm)
+        for _ in range(rpm):
+            scheduler.acquire(1)
+        return scheduler
+    
+    def wait_depth(scheduler, priority, n=1):
+        while scheduler.depth(priority) < n:
+            time.sleep(0.005)
+    
+    response = SimpleNamespace(content="{}", usage_metadata={"total_tokens": 10})
+    
+    # 분당 600회(0.1초당 1회) 한도를 다 쓴 뒤: 늦게 온 interactive가 background보다 먼저
+    scheduler = drained(600)
+    order = []
+    waits_before = LLM_QUEUE_WAIT.count(priority="background")
+    
+    def call(name, ticket=None):
+        with llm_priority(name):
+            scheduler.call(lambda: order.append(name) or response, "prompt", ticket)
+    
+    threads = [threading.Thread(target=call, args=("background",))]
+    threads[0].start()
+    wait_depth(scheduler, "background")
+    threads.append(threading.Thread(target=call, args=("interactive",)))
+    threads[1].start()
+    wait_depth(scheduler, "interactive")
+    for thread in threads:
+        thread.join()
+    assert order == ["interactive", "background"], order
+    assert LLM_QUEUE_WAIT.count(priority="background") == waits_before + 1
+    
+    # 대기 중인 티켓의 우선순위를 올리면 먼저 나감
+    order.clear()
+    ticket = PriorityTicket("background")
+    threads = [threading.Thread(target=call, args=("background", ticket))]
+    threads[0].start()
+    wait_depth(scheduler, "background")
+    threads.append(threading.Thread(target=call, args=("batch",)))
+    threads[1].start()
+    wait_depth(scheduler, "batch")
+    ticket.raise_to("interactive")
+    ticket.raise_to("background")  # 내리지는 않음
+    for thread in threads:
+        thread.join()
+    assert order == ["background", "batch"] and ticket.name == "interactive", order
+    
+    # 마감까지 슬롯을 못 받으면 RateLimitTimeout, 대기열에서도 빠짐
+    slow = drained(6)
+    timeouts_before = LLM_CALLS.value(priority="interactive", result="queue_timeout")
+    try:
+        slow.call(lambda: response, "prompt", deadline=time.monotonic() + 0.05)
+        assert False, "RateLimitTimeout이어야 함"
+    except RateLimitTimeout:
+        pass
+    assert slow.depth() == 0
+    assert LLM_CALLS.value(priority="interactive", result="queue_timeout") == timeouts_before + 1
+    
+    # 비동기 대기는 취소되면 대기열에서 빠짐
+    async def cancelled():
+        try:
+            await asyncio.wait_for(slow.acall(lambda: asyncio.sleep(0, response), "prompt"), 0.05)
+            return False
+        except asyncio.TimeoutError:
+            return True
+    
+    assert asyncio.run(cancelled()) and slow.depth() == 0
+    
+    # 429는 Retry-After만큼 발송을 멈췄다가 재시도 (한도가 없어도)
+    unlimited = LLMScheduler()
+    attempts = []
+    
+    class RateLimited(Exception):
+        status_code = 429
+        response = SimpleNamespace(headers={"retry-after": "0.1"})
+    
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise RateLimited()
+        return response
+    
+    limited_before = LLM_CALLS.value(priority="interactive", result="rate_limited")
+    assert unlimited.call(flaky, "prompt") is response
+    assert len(attempts) == 2 and attempts[1] - attempts[0] >= 0.09
+    assert LLM_CALLS.value(priority="interactive", result="rate_limited") == limited_before + 1
+    
+    async def aflaky():
+        return flaky()
+    
+    attempts.clear()
+    assert asyncio.run(unlimited.acall(aflaky, "prompt")) is response and len(attempts) == 2
+    
+    # 실패한 시도가 미리 차감한 토큰은 돌려받음 (재시도마다 이중 차감하지 않음), 5xx도 재시도
+    class Unavailable(Exception):
+        status_code = 503
+    
+    def unavailable_once():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise Unavailable()
+        return SimpleNamespace(content="{}", usage_metadata=None)
+    
+    attempts.clear()
+    budget = LLMScheduler(tpm=6000)
+    estimated = estimate_tokens("prompt") + LLM_EXPECTED_OUTPUT_TOKENS
+    budget.call(unavailable_once, "prompt")
+    assert len(attempts) == 2 and budget._tokens.level >= 6000 - estimated - 1, budget._tokens.level
+    
+    # 토큰 한도: 추정치를 먼저 차감하고 응답 usage(10토큰)로 정산
+    tokens = LLMScheduler(tpm=6000)
+    tokens.call(lambda: response, "prompt")
+    assert tokens._tokens.level >= 6000 - 10 - 1, tokens._tokens.level
+    
+    # 같은 분야 생성에 사용자 요청이 합류하면 티켓 우선순위가 올라감
+    # (티켓은 생성을 맡은 리더만 만들고 해제, 진행 중인 생성이 없으면 합류 쪽은 아무것도 남기지 않음)
+    key = dynamic_knowledge._flight_key("Frontend")
+    dynamic_knowledge._raise_ticket(key)
+    assert key not in dynamic_knowledge._FLIGHT_TICKETS
+    with llm_priority("background"):
+        flight_ticket = dynamic_knowledge._open_ticket(key)
+    assert flight_ticket.name == "background"
+    dynamic_knowledge._raise_ticket(key)
+    assert dynamic_knowledge._FLIGHT_TICKETS[key] is flight_ticket and flight_ticket.name == "interactive"
+    dynamic_knowledge._release_ticket(key, flight_ticket)
+    assert key not in dynamic_knowledge._FLIGHT_TICKETS
+    
+    print("✅ 우선순위 순서 / 티켓 승격 / 대기 마감 / 취소 / 429 재시도 / 사용량 정산 확인")
+    return True
+
+
 if __name__ == "__main__":
     print("\n🧪 RAG 교육 챗봇 시스템 테스트\n")
     
     # 테스트 실행
     results = []
     results.append(("그래프 구조", test_graph_structure()))
+    results.append(("그래프 레지스트리", test_graph_registry()))
+    results.append(("비동기 그래프", test_async_graph()))
     results.append(("상태 생성", test_state_creation()))
     results.append(("도메인 데이터", test_domain_data()))
-    
+    results.append(("DomainPack 캐시", test_domain_cache()))
+    results.append(("키워드 매처", test_keyword_matcher()))
+    results.append(("DomainPack 인덱스", test_domain_pack_index()))
+    results.append(("노드 메트릭", test_node_metrics()))
+
+    results.append(("LLM 제공자", test_llm_provider()))
+    results.append(("메모리 저장소", test_memory_store()))
+    results.append(("세션 체크포인트", test_session_graph()))
+    results.append(("메모리 상한", test_bounded_memory()))
+    results.append(("Write-behind 큐", test_write_behind()))
+    results.append(("지식 추적", test_knowledge_tracing()))
+    results.append(("BM25 검색", test_bm25_retrieval()))
+    results.append(("분야 임베딩", test_domain_embedding()))
+    results.append(("하이브리드 검색", test_hybrid_retriever()))
+    results.append(("문서 수집", test_document_ingest()))
+    results.append(("응답 캐시", test_response_cache()))
+    results.append(("DomainPack 사전 생성", test_domain_prewarm()))
+    results.append(("질문 일괄 처리", test_batch_runner()))
+    results.append(("HTTP API", test_api_server()))
+    results.append(("Single-flight 팩 생성", test_singleflight_pack_generation()))
+    results.append(("LLM 호출 스케줄러", test_llm_scheduler()))    
     # 결과 요약
     print("\n" + "=" * 50)
     print("테스트 결과 요약")